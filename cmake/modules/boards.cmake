@@ -154,7 +154,7 @@ list(TRANSFORM BOARD_ROOT PREPEND "--board-root=" OUTPUT_VARIABLE board_root_arg
 list(TRANSFORM SOC_ROOT PREPEND "--soc-root=" OUTPUT_VARIABLE soc_root_args)
 
 set(list_boards_commands
-    COMMAND ${PYTHON_EXECUTABLE} ${ZEPHYR_BASE}/scripts/list_boards.py
+    COMMAND ${PYTHON_CONFIGURE_COMMAND} ${ZEPHYR_BASE}/scripts/list_boards.py
             ${arch_root_args} ${board_root_args} --arch-root=${ZEPHYR_BASE}
             ${soc_root_args} --soc-root=${ZEPHYR_BASE}
 )
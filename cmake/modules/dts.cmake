@@ -293,13 +293,20 @@ else()
 endif()
 
 string(REPLACE ";" " " EXTRA_DTC_FLAGS_RAW "${EXTRA_DTC_FLAGS}")
-set(CMD_GEN_EDT ${PYTHON_EXECUTABLE} ${GEN_EDT_SCRIPT}
+
+# Compatibles of the bindings, cached across builds using the same bindings
+# directories so that only the bindings needed by the devicetree are read.
+string(MD5 dts_bindings_id "${DTS_ROOT_BINDINGS}")
+set(DTS_BINDING_INDEX ${USER_CACHE_DIR}/dts/binding_index_${dts_bindings_id}.pickle)
+
+set(CMD_GEN_EDT ${PYTHON_CONFIGURE_COMMAND} ${GEN_EDT_SCRIPT}
 --dts ${DTS_POST_CPP}
 --dtc-flags '${EXTRA_DTC_FLAGS_RAW}'
 --bindings-dirs ${DTS_ROOT_BINDINGS}
 --workspace-dir ${GEN_EDT_WORKSPACE_DIR}
 --dts-out ${ZEPHYR_DTS}.new # for debugging and dtc
 --edt-pickle-out ${EDT_PICKLE}.new
+--binding-index ${DTS_BINDING_INDEX}
 ${EXTRA_GEN_EDT_ARGS}
 )
 
@@ -318,7 +325,7 @@ message(STATUS "Generated pickled edt: ${EDT_PICKLE}")
 # Run GEN_DEFINES_SCRIPT.
 #
 
-set(CMD_GEN_DEFINES ${PYTHON_EXECUTABLE} ${GEN_DEFINES_SCRIPT}
+set(CMD_GEN_DEFINES ${PYTHON_CONFIGURE_COMMAND} ${GEN_DEFINES_SCRIPT}
 --header-out ${DEVICETREE_GENERATED_H}.new
 --edt-pickle ${EDT_PICKLE}
 ${EXTRA_GEN_DEFINES_ARGS}
@@ -338,7 +345,7 @@ message(STATUS "Generated devicetree_generated.h: ${DEVICETREE_GENERATED_H}")
 #
 
 execute_process(
-  COMMAND ${PYTHON_EXECUTABLE} ${GEN_DRIVER_KCONFIG_SCRIPT}
+  COMMAND ${PYTHON_CONFIGURE_COMMAND} ${GEN_DRIVER_KCONFIG_SCRIPT}
   --kconfig-out ${DTS_KCONFIG}
   --bindings-dirs ${DTS_ROOT_BINDINGS}
   WORKING_DIRECTORY ${PROJECT_BINARY_DIR}
@@ -4709,7 +4709,7 @@ function(zephyr_dt_import)
      (${gen_dts_cmake_script} IS_NEWER_THAN ${gen_dts_cmake_output})
   )
     execute_process(
-      COMMAND ${PYTHON_EXECUTABLE} ${gen_dts_cmake_script}
+      COMMAND ${PYTHON_CONFIGURE_COMMAND} ${gen_dts_cmake_script}
       --edt-pickle ${arg_EDT_PICKLE_FILE}
       --cmake-out ${gen_dts_cmake_temp}
       WORKING_DIRECTORY ${PROJECT_BINARY_DIR}
@@ -78,6 +78,7 @@ endif()
 
 set(DOTCONFIG                  ${PROJECT_BINARY_DIR}/.config)
 set(PARSED_KCONFIG_SOURCES_TXT ${PROJECT_BINARY_DIR}/kconfig/sources.txt)
+set(MERGED_CONFIG_INPUTS_TXT   ${PROJECT_BINARY_DIR}/kconfig/inputs.txt)
 
 if(CONF_FILE)
   string(CONFIGURE "${CONF_FILE}" CONF_FILE_EXPANDED)
@@ -158,6 +159,8 @@ set(COMMON_KCONFIG_ENV_SETTINGS
   TOOLCHAIN_HAS_NEWLIB=${_local_TOOLCHAIN_HAS_NEWLIB}
   TOOLCHAIN_HAS_PICOLIBC=${_local_TOOLCHAIN_HAS_PICOLIBC}
   EDT_PICKLE=${EDT_PICKLE}
+  # Parsed Kconfig tree, reused while the Kconfig files are unchanged
+  KCONFIG_CACHE=${KCONFIG_BINARY_DIR}/kconfig_tree.pickle
   # Export all Zephyr modules to Kconfig
   ${ZEPHYR_KCONFIG_MODULES_DIR}
 )
@@ -313,6 +316,11 @@ foreach(f ${merge_config_files})
   endif()
 endforeach()
 
+# Record the configuration files merged into .config, board and shield
+# fragments included, for tools checking whether it is up to date
+list(JOIN merge_config_files "\n" merged_config_inputs)
+file(WRITE ${MERGED_CONFIG_INPUTS_TXT} "${merged_config_inputs}\n")
+
 # Calculate a checksum of merge_config_files to determine if we need
 # to re-generate .config
 set(merge_config_files_checksum "")
@@ -371,14 +379,28 @@ if(NOT EXISTS ${autoconf_h_path})
   file(MAKE_DIRECTORY ${autoconf_h_path})
 endif()
 
+# With KCONFIG_FIXDEP enabled, objects only depend on the Kconfig symbols
+# their sources use instead of on autoconf.h, so that changing a symbol only
+# rebuilds the objects using it. kconfig.py keeps a stamp file per symbol in
+# KCONFIG_DEPS_DIR, and the dependency files of the compiler are rewritten to
+# use them by scripts/build/fixdep.py.
+zephyr_get(KCONFIG_FIXDEP)
+if(KCONFIG_FIXDEP)
+  set(KCONFIG_DEPS_DIR ${PROJECT_BINARY_DIR}/kconfig/deps)
+  cmake_path(GET KCONFIG_DEPS_DIR PARENT_PATH kconfig_deps_parent_path)
+  file(MAKE_DIRECTORY ${kconfig_deps_parent_path})
+  set(kconfig_deps_flags --sync-deps ${KCONFIG_DEPS_DIR})
+endif()
+
 execute_process(
   COMMAND ${CMAKE_COMMAND} -E env
   ${COMMON_KCONFIG_ENV_SETTINGS}
   SHIELD_AS_LIST=${SHIELD_AS_LIST_ESCAPED_COMMAND}
-  ${PYTHON_EXECUTABLE}
+  ${PYTHON_CONFIGURE_COMMAND}
   ${ZEPHYR_BASE}/scripts/kconfig/kconfig.py
   --zephyr-base=${ZEPHYR_BASE}
   ${input_configs_flags}
+  ${kconfig_deps_flags}
   ${KCONFIG_ROOT}
   ${DOTCONFIG}
   ${AUTOCONF_H}
@@ -423,6 +445,16 @@ endif()
 
 add_custom_target(config-twister DEPENDS ${DOTCONFIG})
 
+if(KCONFIG_FIXDEP)
+  # Run before any other compiler launcher, e.g. ccache
+  get_property(rule_launch_compile GLOBAL PROPERTY RULE_LAUNCH_COMPILE)
+  set_property(GLOBAL PROPERTY RULE_LAUNCH_COMPILE
+    "${PYTHON_EXECUTABLE} ${ZEPHYR_BASE}/scripts/build/fixdep.py \
+--autoconf ${AUTOCONF_H} --deps-dir ${KCONFIG_DEPS_DIR} \
+--prefix ${KCONFIG_NAMESPACE}_ -- ${rule_launch_compile}"
+  )
+endif()
+
 # Remove the CLI Kconfig symbols from the namespace and
 # CMakeCache.txt. If the symbols end up in DOTCONFIG they will be
 # re-introduced to the namespace through 'import_kconfig'.
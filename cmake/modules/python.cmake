@@ -42,3 +42,18 @@ find_package(Python3 ${PYTHON_MINIMUM_REQUIRED} REQUIRED)
 
 # Zephyr internally used Python variable.
 set(PYTHON_EXECUTABLE ${Python3_EXECUTABLE})
+
+# Command used to run the Python scripts of the configure stage, which may
+# be served by a persistent process to save the interpreter startup and
+# module imports of each script, see scripts/build/configure_server.py.
+# Enabled by setting ZEPHYR_CONFIGURE_SERVER, in CMake or the environment.
+if(NOT DEFINED ZEPHYR_CONFIGURE_SERVER AND DEFINED ENV{ZEPHYR_CONFIGURE_SERVER})
+  set(ZEPHYR_CONFIGURE_SERVER $ENV{ZEPHYR_CONFIGURE_SERVER})
+endif()
+if(ZEPHYR_CONFIGURE_SERVER AND NOT WIN32)
+  set(PYTHON_CONFIGURE_COMMAND ${PYTHON_EXECUTABLE}
+      ${ZEPHYR_BASE}/scripts/build/configure_server.py run
+  )
+else()
+  set(PYTHON_CONFIGURE_COMMAND ${PYTHON_EXECUTABLE})
+endif()
@@ -84,7 +84,7 @@ function(zephyr_process_snippets)
   foreach(snippet_name ${SNIPPET_AS_LIST})
     list(APPEND requested_snippet_args --snippet "${snippet_name}")
   endforeach()
-  execute_process(COMMAND ${PYTHON_EXECUTABLE}
+  execute_process(COMMAND ${PYTHON_CONFIGURE_COMMAND}
     ${snippets_py}
     ${snippet_root_args}
     ${requested_snippet_args}
@@ -53,7 +53,7 @@ if(WEST OR ZEPHYR_MODULES)
   # ZEPHYR_MODULES was provided as argument to CMake.
   execute_process(
     COMMAND
-    ${PYTHON_EXECUTABLE} ${ZEPHYR_BASE}/scripts/zephyr_module.py
+    ${PYTHON_CONFIGURE_COMMAND} ${ZEPHYR_BASE}/scripts/zephyr_module.py
     --zephyr-base=${ZEPHYR_BASE}
     ${ZEPHYR_MODULES_ARG}
     ${EXTRA_ZEPHYR_MODULES_ARG}
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+
+# Copyright The Zephyr Project Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Runs the Python scripts of the CMake configure stage from a persistent server
+
+A configure runs list_boards.py, list_hardware.py, zephyr_module.py,
+snippets.py, the devicetree scripts and kconfig.py, each in a new Python
+interpreter which imports PyYAML, jsonschema, edtlib or kconfiglib again
+before doing any work. When ZEPHYR_CONFIGURE_SERVER is enabled, CMake runs
+them with:
+
+    configure_server.py run <script> [<args>...]
+
+instead, which behaves like 'python <script> <args>...': it connects to a
+server process over a Unix socket, starting the server if needed. The server
+has these modules imported already, and forks a child for each request which
+runs the script with the command line, working directory, environment and
+standard streams of the client, and reports back its exit status. Running
+from a forked child keeps the scripts isolated from each other, while they
+share the warm server state and the on-disk caches (e.g. the devicetree
+binding index) of the libraries.
+
+The server exits after being idle for a while, or when the Python modules it
+loaded change. If the server can't be used, for example on Windows, the
+script is run by the client process itself.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import socket
+import stat
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+
+ZEPHYR_BASE = os.path.realpath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Modules imported by the server before serving requests, with the
+# directories they are found in, relative to ZEPHYR_BASE. Only modules
+# without import-time state depending on the build are listed here.
+PRELOAD_PATHS = [
+    'scripts',
+    'scripts/kconfig',
+    'scripts/dts/python-devicetree/src',
+]
+PRELOAD_MODULES = [
+    'yaml',
+    'jsonschema',
+    'pykwalify.core',
+    'devicetree.edtlib',
+    'kconfiglib',
+    'list_hardware',
+]
+
+# Seconds without requests after which the server exits
+IDLE_TIMEOUT = 600
+
+# Seconds a client waits for a server it started to accept connections
+START_TIMEOUT = 10
+
+# Replies of the server: first whether it runs the script or asks for a new
+# server to be started, then the exit status of the script
+_STATUS = struct.Struct('!i')
+_ACCEPTED = -0x10000
+_RESTART = -0x10001
+
+
+def socket_path():
+    """Return the path of the server socket for this Python interpreter and
+    Zephyr tree."""
+    key = f'{sys.executable}\0{ZEPHYR_BASE}'.encode()
+    name = hashlib.sha256(key).hexdigest()[:16]
+    return os.path.join(_socket_dir(), f'{name}.sock')
+
+
+def _socket_dir():
+    # In the runtime directory of the user if there is one, else in the
+    # temporary directory, as socket paths are limited to around 100
+    # characters
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, 'zephyr-configure')
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join(tempfile.gettempdir(), f'zephyr-configure-{uid}')
+
+
+def _private_dir(path):
+    # Creates the directory 'path' if needed, and returns whether only the
+    # current user can use it. In a shared directory, another user could
+    # create it first and listen on the socket, receiving the environment
+    # and standard streams of the clients and replying with any status.
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return (
+        stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and stat.S_IMODE(st.st_mode) == 0o700
+    )
+
+
+def run(script, args):
+    """Run a script as 'python <script> <args>...' would, through the server
+    when possible. Return its exit status."""
+    if hasattr(socket, 'AF_UNIX') and hasattr(socket, 'send_fds'):
+        path = socket_path()
+        if not _private_dir(os.path.dirname(path)):
+            print(
+                f"configure_server.py: not using {os.path.dirname(path)}, "
+                "which is not a directory private to the current user",
+                file=sys.stderr,
+            )
+            return _run_script(script, args)
+        for _ in range(2):
+            sock = _connect(path) or _start_server(path)
+            if sock is None:
+                break
+            with sock:
+                status = _request(sock, script, args)
+            if status != _RESTART:
+                return status
+
+    return _run_script(script, args)
+
+
+def serve(path, idle_timeout=IDLE_TIMEOUT):
+    """Serve the requests of the clients on the Unix socket 'path'."""
+    import fcntl
+    import signal
+
+    if not _private_dir(os.path.dirname(path)):
+        print(
+            f"configure_server.py: {os.path.dirname(path)} is not a directory "
+            "private to the current user",
+            file=sys.stderr,
+        )
+        return
+    # Held as long as the server runs, so that only one server is started
+    # for clients which can't connect at the same time
+    lock = open(path + '.lock', 'w')  # noqa: SIM115
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return
+
+    base_path = list(sys.path)
+    sys.path[:0] = [os.path.join(ZEPHYR_BASE, p) for p in PRELOAD_PATHS]
+    for module in PRELOAD_MODULES:
+        # On errors, the scripts importing the module report them
+        with contextlib.suppress(Exception):
+            __import__(module)
+    sys.path[:] = base_path
+    stamps = _module_stamps()
+
+    # Children are reaped automatically
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    if os.path.exists(path):
+        os.unlink(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(64)
+    server.settimeout(idle_timeout)
+
+    with server, lock:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except TimeoutError:
+                break
+
+            with conn:
+                conn.settimeout(None)
+                try:
+                    request, fds = _receive_request(conn)
+                except (OSError, ValueError):
+                    continue
+
+                if _module_stamps() != stamps:
+                    # Let the client start a server with the new modules
+                    for fd in fds:
+                        os.close(fd)
+                    conn.sendall(_STATUS.pack(_RESTART))
+                    break
+
+                try:
+                    conn.sendall(_STATUS.pack(_ACCEPTED))
+                except OSError:
+                    for fd in fds:
+                        os.close(fd)
+                    continue
+
+                sys.stdout.flush()
+                sys.stderr.flush()
+                if os.fork() == 0:
+                    try:
+                        server.close()
+                        lock.close()
+                        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                        status = _run_request(request, fds)
+                        conn.sendall(_STATUS.pack(status))
+                    finally:
+                        os._exit(0)
+                for fd in fds:
+                    os.close(fd)
+
+        os.unlink(path)
+
+
+def _connect(path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _start_server(path):
+    # Starts a server in its own session and waits for it to accept
+    # connections. Returns the connected socket, or None if it did not start.
+    with open(os.devnull, 'r+b') as devnull:
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), 'serve', '--socket', path],
+            stdin=devnull,
+            stdout=devnull,
+            stderr=devnull,
+            cwd='/',
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        sock = _connect(path)
+        if sock is not None:
+            return sock
+        time.sleep(0.02)
+    return None
+
+
+def _request(sock, script, args):
+    # Sends the request and the standard streams of the client, and waits
+    # for the exit status of the script. Returns _RESTART if the server
+    # did not accept to run it, so that it can be run in another way
+    # without running it twice.
+    request = json.dumps(
+        {
+            'argv': [os.path.abspath(script)] + args,
+            'cwd': os.getcwd(),
+            'env': dict(os.environ),
+            'umask': _get_umask(),
+        }
+    ).encode()
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        socket.send_fds(sock, [b'R'], [0, 1, 2])
+        sock.sendall(_STATUS.pack(len(request)) + request)
+        if _STATUS.unpack(_receive_exactly(sock, _STATUS.size))[0] != _ACCEPTED:
+            return _RESTART
+    except (OSError, ValueError):
+        return _RESTART
+
+    try:
+        return _STATUS.unpack(_receive_exactly(sock, _STATUS.size))[0]
+    except (OSError, ValueError):
+        print(f"configure_server.py: lost the server while running {script}", file=sys.stderr)
+        return 1
+
+
+def _receive_request(conn):
+    _, fds, _, _ = socket.recv_fds(conn, 1, 3)
+    if len(fds) != 3:
+        for fd in fds:
+            os.close(fd)
+        raise ValueError('expected the standard streams of the client')
+    size = _STATUS.unpack(_receive_exactly(conn, _STATUS.size))[0]
+    return json.loads(_receive_exactly(conn, size)), fds
+
+
+def _receive_exactly(conn, size):
+    data = b''
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            raise ValueError('connection closed')
+        data += chunk
+    return data
+
+
+def _run_request(request, fds):
+    # Runs in the forked child: takes over the client's context and runs
+    # the script
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+        os.close(fd)
+    try:
+        os.chdir(request['cwd'])
+    except OSError as e:
+        print(f"configure_server.py: {e}", file=sys.stderr)
+        return 1
+    os.environ.clear()
+    os.environ.update(request['env'])
+    os.umask(request['umask'])
+    argv = request['argv']
+    return _run_script(argv[0], argv[1:])
+
+
+def _run_script(script, args):
+    # Runs 'script' like the interpreter does, and returns its exit status
+    import runpy
+    import traceback
+
+    sys.argv = [script] + args
+    sys.path[0] = os.path.dirname(os.path.abspath(script))
+    try:
+        runpy.run_path(script, run_name='__main__')
+        status = 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            status = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            status = 1
+    except BaseException:
+        traceback.print_exc()
+        status = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    return status
+
+
+def _get_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def _module_stamps():
+    # Modification times of the source files of the loaded modules
+    stamps = {}
+    for module in list(sys.modules.values()):
+        path = getattr(module, '__file__', None)
+        if path:
+            try:
+                stamps[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                stamps[path] = None
+    return stamps
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0], allow_abbrev=False)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='run a script, through the server when possible')
+    run_parser.add_argument('script', help='Python script to run')
+    run_parser.add_argument('args', nargs=argparse.REMAINDER, help='arguments of the script')
+
+    serve_parser = subparsers.add_parser('serve', help='run the server')
+    serve_parser.add_argument('--socket', default=None, help='path of the Unix socket to listen on')
+    serve_parser.add_argument(
+        '--idle-timeout',
+        type=float,
+        default=IDLE_TIMEOUT,
+        help='seconds without requests after which the server exits',
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.command == 'run':
+        sys.exit(run(args.script, args.args))
+    serve(args.socket or socket_path(), args.idle_timeout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+# Copyright The Zephyr Project Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compiler launcher that makes objects depend on the Kconfig symbols they use
+
+Every source file is compiled with autoconf.h, so a change to any Kconfig
+symbol normally rebuilds every object. kconfig.py can keep one stamp file per
+symbol with Kconfig.sync_deps(), touched only when the value of the symbol
+changes. This launcher runs the compiler, and then rewrites the dependency
+file it generated (-MF), like scripts/basic/fixdep.c in Linux does:
+
+  - the dependency on autoconf.h is removed
+
+  - for each CONFIG_<NAME> appearing in the source file or in the headers it
+    includes, a dependency on the stamp file of the symbol is added
+
+Missing stamp files are created with the oldest possible modification time,
+as the symbol did not change since the last configuration.
+
+References to symbols which don't appear literally in the files, e.g. built
+by token pasting, are not detected, so changing such symbols doesn't rebuild
+the objects using them.
+
+The tool is meant to be configured as a RULE_LAUNCH_COMPILE prefix:
+
+  ./scripts/build/fixdep.py --autoconf <autoconf.h> --deps-dir <dir> \\
+    -- <compiler> <args...>
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+
+def parse_depfile(text):
+    """Parse the first rule of a Makefile-syntax dependency file, as written
+    by GCC-compatible compilers. Returns a (<targets>, <prerequisites>) tuple
+    of lists, with the escaping of the file names removed."""
+    tokens = []
+    token = ''
+    escaped = False
+    for c in text.replace('\\\r\n', ' ').replace('\\\n', ' ').replace('$$', '$'):
+        if escaped:
+            # Only spaces and '#' are escaped by the compilers, a backslash
+            # before anything else is part of the name (e.g. on Windows)
+            token += c if c in ' #' else '\\' + c
+            escaped = False
+        elif c == '\\':
+            escaped = True
+        elif c.isspace():
+            if token:
+                tokens.append(token)
+                token = ''
+            if c == '\n' and any(t.endswith(':') for t in tokens):
+                break
+        else:
+            token += c
+    if token:
+        tokens.append(token)
+
+    for i, t in enumerate(tokens):
+        if t.endswith(':'):
+            return tokens[:i] + [t[:-1]], tokens[i + 1 :]
+    return tokens, []
+
+
+def format_depfile(targets, prereqs):
+    """Return a dependency file with a single rule, the inverse of
+    parse_depfile()."""
+
+    def escape(name):
+        return name.replace('$', '$$').replace('#', '\\#').replace(' ', '\\ ')
+
+    return (
+        ' '.join(escape(t) for t in targets)
+        + ':'
+        + ''.join(f' \\\n {escape(p)}' for p in prereqs)
+        + '\n'
+    )
+
+
+def symbols_used(paths, prefix):
+    """Return the names of the Kconfig symbols referenced by the files at
+    'paths', without 'prefix'."""
+    search = re.compile(
+        rb'(?<![A-Za-z0-9_])' + re.escape(prefix.encode()) + rb'([A-Za-z0-9_]+)'
+    ).findall
+    names = set()
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                names.update(search(f.read()))
+        except OSError:
+            continue
+    return {name.decode() for name in names}
+
+
+def stamp_path(deps_dir, name):
+    """Return the path of the stamp file of the symbol 'name', as written by
+    Kconfig.sync_deps()."""
+    return os.path.join(deps_dir, name.lower().replace('_', os.sep) + '.h')
+
+
+def fix_depfile(depfile, autoconf, deps_dir, prefix):
+    """Rewrite the dependency file 'depfile' to depend on the stamp files of
+    the used Kconfig symbols instead of on 'autoconf'."""
+    with open(depfile, encoding='utf-8', errors='surrogateescape') as f:
+        targets, prereqs = parse_depfile(f.read())
+
+    autoconf = os.path.normcase(os.path.abspath(autoconf))
+    prereqs = [p for p in prereqs if os.path.normcase(os.path.abspath(p)) != autoconf]
+
+    stamps = []
+    for name in sorted(symbols_used(prereqs, prefix)):
+        path = stamp_path(deps_dir, name)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'a'):
+                pass
+            # Older than any object, as the symbol did not change
+            os.utime(path, (0, 0))
+        stamps.append(path)
+
+    tmp = depfile + '.tmp'
+    with open(tmp, 'w', encoding='utf-8', errors='surrogateescape') as f:
+        f.write(format_depfile(targets, prereqs + stamps))
+    os.replace(tmp, depfile)
+
+
+def find_depfile(cmd):
+    """Return the dependency file of the compiler command line 'cmd', or None
+    if it doesn't write one."""
+    for i, arg in enumerate(cmd):
+        if arg == '-MF' and i + 1 < len(cmd):
+            return cmd[i + 1]
+        if arg.startswith('-MF') and len(arg) > 3:
+            return arg[3:]
+    return None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        allow_abbrev=False,
+    )
+    parser.add_argument('--autoconf', required=True, help='path to autoconf.h')
+    parser.add_argument(
+        '--deps-dir',
+        required=True,
+        help='directory with the stamp files of the symbols, as given to Kconfig.sync_deps()',
+    )
+    parser.add_argument(
+        '--prefix', default='CONFIG_', help='prefix of the Kconfig symbols (default: CONFIG_)'
+    )
+    parser.add_argument('cmd', nargs=argparse.REMAINDER, help='compiler command line, after --')
+
+    args = parser.parse_args()
+    if args.cmd[:1] == ['--']:
+        args.cmd = args.cmd[1:]
+    if not args.cmd:
+        parser.error('missing compiler command line')
+    return args
+
+
+def main():
+    args = parse_args()
+
+    ret = subprocess.run(args.cmd).returncode
+    depfile = find_depfile(args.cmd)
+    if ret == 0 and depfile and os.path.exists(depfile):
+        fix_depfile(depfile, args.autoconf, args.deps_dir, args.prefix)
+    return ret
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -26,7 +26,7 @@ class FakeSocket:
         self.out_stream = sys.stdout.buffer
 
     def recv(self, bufsize):
-        return self.in_stream.read(bufsize)
+        return self.in_stream.read1(bufsize)
 
     def send(self, data):
         n = self.out_stream.write(data)
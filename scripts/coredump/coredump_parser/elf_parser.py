@@ -4,7 +4,9 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import contextlib
 import logging
+import mmap
 import struct
 from enum import IntEnum
 
@@ -15,6 +17,7 @@ from elftools.elf.elffile import ELFFile
 SHF_WRITE = 0x1
 SHF_ALLOC = 0x2
 SHF_EXEC = 0x4
+SHF_COMPRESSED = 0x800
 SHF_WRITE_ALLOC = SHF_WRITE | SHF_ALLOC
 SHF_ALLOC_EXEC = SHF_ALLOC | SHF_EXEC
 
@@ -50,11 +53,16 @@ class CoredumpElfFile:
     There are read-only sections (e.g. text and rodata) where
     the memory content does not need to be dumped via coredump
     and can be retrieved from the ELF file.
+
+    The ELF file is memory-mapped, and the memory regions refer
+    to the content of their sections in the mapping, which is
+    only read when accessed.
     """
 
     def __init__(self, elffile):
         self.elffile = elffile
         self.fd = None
+        self.data = None
         self.elf = None
         self.memory_regions = list()
         self.kernel_thread_info_offsets = None
@@ -63,11 +71,24 @@ class CoredumpElfFile:
 
     def open(self):
         self.fd = open(self.elffile, "rb")
+        self.data = mmap.mmap(self.fd.fileno(), 0, access=mmap.ACCESS_READ)
         self.elf = ELFFile(self.fd)
 
     def close(self):
+        # If the memory regions are still in use, the file is
+        # unmapped once they are released
+        with contextlib.suppress(BufferError):
+            self.data.close()
+        self.data = None
         self.fd.close()
 
+    def get_section_data(self, section):
+        if section['sh_flags'] & SHF_COMPRESSED:
+            return section.data()
+
+        offset = section['sh_offset']
+        return memoryview(self.data)[offset : offset + section['sh_size']]
+
     def get_memory_regions(self):
         return self.memory_regions
 
@@ -141,10 +162,15 @@ class CoredumpElfFile:
                     sect_desc = "read-only data"
 
             if store:
-                mem_region = {"start": sec_start, "end": sec_end, "data": section.data()}
+                mem_region = {
+                    "start": sec_start,
+                    "end": sec_end,
+                    "offset": section['sh_offset'],
+                    "data": self.get_section_data(section),
+                }
                 logger.info(
                     f'ELF Section: 0x{mem_region["start"]:x} to 0x{mem_region["end"]:x} '
-                    f'of size {mem_region["data"]:d} ({sect_desc:s})'
+                    f'of size {size:d} ({sect_desc:s})'
                 )
 
                 self.memory_regions.append(mem_region)
@@ -4,8 +4,12 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import binascii
+import contextlib
 import logging
+import mmap
 import struct
+import tempfile
 
 # Note: keep sync with C code
 COREDUMP_HDR_ID = b'ZE'
@@ -26,6 +30,14 @@ COREDUMP_MEM_HDR_VER = 1
 LOG_MEM_HDR_STRUCT = "<cH"
 LOG_MEM_HDR_SIZE = struct.calcsize(LOG_MEM_HDR_STRUCT)
 
+# Markers of the coredump in serial logs, keep sync with
+# the logging backend
+COREDUMP_PREFIX_STR = b"#CD:"
+
+COREDUMP_BEGIN_STR = COREDUMP_PREFIX_STR + b"BEGIN#"
+COREDUMP_END_STR = COREDUMP_PREFIX_STR + b"END#"
+COREDUMP_ERROR_STR = COREDUMP_PREFIX_STR + b"ERROR CANNOT DUMP#"
+
 
 logger = logging.getLogger("parser")
 
@@ -48,15 +60,68 @@ def reason_string(reason):
     return ret
 
 
+def convert_serial_log(infile, outfile):
+    """
+    Convert the coredump in a serial log, read line by line from
+    the binary stream infile, into the binary coredump written to
+    the binary stream outfile. Returns a dict with the status of
+    the conversion.
+    """
+    status = {"has_begin": False, "has_end": False, "has_error": False, "bytes_written": 0}
+
+    go_parse_line = False
+    for line in infile:
+        if line.find(COREDUMP_BEGIN_STR) >= 0:
+            # Found "BEGIN#" - beginning of log
+            status["has_begin"] = True
+            go_parse_line = True
+            continue
+
+        if line.find(COREDUMP_END_STR) >= 0:
+            # Found "END#" - end of log
+            status["has_end"] = True
+            break
+
+        if line.find(COREDUMP_ERROR_STR) >= 0:
+            # Error was encountered during dumping:
+            # log is not usable
+            status["has_error"] = True
+            break
+
+        if not go_parse_line:
+            continue
+
+        prefix_idx = line.find(COREDUMP_PREFIX_STR)
+
+        if prefix_idx < 0:
+            continue
+
+        prefix_idx += len(COREDUMP_PREFIX_STR)
+        hex_str = line[prefix_idx:].strip()
+
+        binary_data = binascii.unhexlify(hex_str)
+        outfile.write(binary_data)
+        status["bytes_written"] += len(binary_data)
+
+    return status
+
+
 class CoredumpLogFile:
     """
     Process the binary coredump file for register block
     and memory blocks.
+
+    The file is memory-mapped, and the memory regions refer to
+    their data in the mapping, so that the content of the memory
+    blocks is only read when accessed. A serial log with the
+    coredump is converted into a temporary binary file first.
     """
 
     def __init__(self, logfile):
         self.logfile = logfile
         self.fd = None
+        self.data = None
+        self.offset = 0
 
         self.log_hdr = None
         self.arch_data = list()
@@ -66,9 +131,58 @@ class CoredumpLogFile:
     def open(self):
         self.fd = open(self.logfile, "rb")
 
+        if self.fd.read(len(COREDUMP_HDR_ID)) != COREDUMP_HDR_ID:
+            self.open_serial_log()
+
+        try:
+            self.data = mmap.mmap(self.fd.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self.data = b''
+        self.offset = 0
+
+    def open_serial_log(self):
+        # Convert the coredump in a serial log into a temporary file,
+        # which is used in place of the log
+        self.fd.seek(0)
+        binfile = tempfile.TemporaryFile()
+        status = convert_serial_log(self.fd, binfile)
+        binfile.flush()
+
+        if not status["has_begin"]:
+            # Not a serial log either, let parse() report it
+            binfile.close()
+            return
+
+        logger.info(f"Converted serial log: {status['bytes_written']:d} bytes")
+        if status["has_error"]:
+            logger.error("Serial log has error.")
+        elif not status["has_end"]:
+            logger.warning("End of log not found in serial log! Is log complete?")
+
+        self.fd.close()
+        self.fd = binfile
+
     def close(self):
+        if isinstance(self.data, mmap.mmap):
+            # If the memory regions are still in use, the file is
+            # unmapped once they are released
+            with contextlib.suppress(BufferError):
+                self.data.close()
+        self.data = None
         self.fd.close()
 
+    def read(self, size):
+        data = self.data[self.offset : self.offset + size]
+        self.offset += len(data)
+        return data
+
+    def read_view(self, size):
+        # Like read(), without copying the data out of the mapping
+        data = memoryview(self.data)[self.offset : self.offset + size]
+        self.offset += len(data)
+        return data
+
     def get_arch_data(self):
         return self.arch_data
 
@@ -79,27 +193,27 @@ class CoredumpLogFile:
         return self.threads_metadata
 
     def parse_arch_section(self):
-        hdr = self.fd.read(LOG_ARCH_HDR_SIZE)
+        hdr = self.read(LOG_ARCH_HDR_SIZE)
         _, hdr_ver, num_bytes = struct.unpack(LOG_ARCH_HDR_STRUCT, hdr)
 
-        arch_data = self.fd.read(num_bytes)
+        arch_data = self.read(num_bytes)
 
         self.arch_data = {"hdr_ver": hdr_ver, "data": arch_data}
 
         return True
 
     def parse_threads_metadata_section(self):
-        hdr = self.fd.read(LOG_THREADS_META_HDR_SIZE)
+        hdr = self.read(LOG_THREADS_META_HDR_SIZE)
         _, hdr_ver, num_bytes = struct.unpack(LOG_THREADS_META_HDR_STRUCT, hdr)
 
-        data = self.fd.read(num_bytes)
+        data = self.read(num_bytes)
 
         self.threads_metadata = {"hdr_ver": hdr_ver, "data": data}
 
         return True
 
     def parse_memory_section(self):
-        hdr = self.fd.read(LOG_MEM_HDR_SIZE)
+        hdr = self.read(LOG_MEM_HDR_SIZE)
         _, hdr_ver = struct.unpack(LOG_MEM_HDR_STRUCT, hdr)
 
         if hdr_ver != COREDUMP_MEM_HDR_VER:
@@ -115,14 +229,15 @@ class CoredumpLogFile:
         else:
             return False
 
-        data = self.fd.read(struct.calcsize(ptr_fmt))
+        data = self.read(struct.calcsize(ptr_fmt))
         saddr, eaddr = struct.unpack(ptr_fmt, data)
 
         size = eaddr - saddr
 
-        data = self.fd.read(size)
+        offset = self.offset
+        data = self.read_view(size)
 
-        mem = {"start": saddr, "end": eaddr, "data": data}
+        mem = {"start": saddr, "end": eaddr, "offset": offset, "data": data}
         self.memory_regions.append(mem)
 
         logger.info(f"Memory: 0x{saddr:x} to 0x{eaddr:x} of size {size:d}")
@@ -130,10 +245,14 @@ class CoredumpLogFile:
         return True
 
     def parse(self):
-        if self.fd is None:
+        if self.data is None:
             self.open()
 
-        hdr = self.fd.read(LOG_HDR_SIZE)
+        hdr = self.read(LOG_HDR_SIZE)
+        if len(hdr) < LOG_HDR_SIZE:
+            logger.error("Log header not found...")
+            return False
+
         id1, id2, hdr_ver, tgt_code, ptr_size, flags, reason = struct.unpack(LOG_HDR_STRUCT, hdr)
 
         if (id1 + id2) != COREDUMP_HDR_ID:
@@ -161,12 +280,12 @@ class CoredumpLogFile:
         del id1, id2, hdr_ver, tgt_code, ptr_size, flags, reason
 
         while True:
-            section_id = self.fd.read(1)
+            section_id = self.read(1)
             if not section_id:
                 # no more data to read
                 break
 
-            self.fd.seek(-1, 1)  # go back 1 byte
+            self.offset -= 1  # go back 1 byte
             if section_id == COREDUMP_ARCH_HDR_ID:
                 if not self.parse_arch_section():
                     logger.error("Cannot parse architecture section")
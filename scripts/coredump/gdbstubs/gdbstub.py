@@ -6,12 +6,30 @@
 
 import abc
 import binascii
+import bisect
+import itertools
 import logging
+import re
 
 from coredump_parser.elf_parser import ThreadInfoOffset
 
 logger = logging.getLogger("gdbstub")
 
+# Maximum size of the packets sent to or received from GDB,
+# reported in the reply to qSupported
+GDB_PACKET_SIZE = 0x4000
+
+# Size of the socket reads
+GDB_RECV_SIZE = 4096
+
+# Characters escaped in binary data, with '}' followed by the
+# character XOR 0x20
+GDB_BINARY_ESCAPE_RE = re.compile(rb'[#$}*]')
+
+
+def escape_binary(data):
+    return GDB_BINARY_ESCAPE_RE.sub(lambda m: b'}' + bytes((m[0][0] ^ 0x20,)), data)
+
 
 class GdbStub(abc.ABC):
     def __init__(self, logfile, elffile):
@@ -22,6 +40,11 @@ class GdbStub(abc.ABC):
         self.thread_ptrs = list()
         self.selected_thread = 0
 
+        self.rx_buf = bytearray()
+        self.tx_buf = bytearray()
+        self.last_pkt = b''
+        self.no_ack_mode = False
+
         mem_regions = list()
 
         for r in logfile.get_memory_regions():
@@ -32,45 +55,123 @@ class GdbStub(abc.ABC):
 
         self.mem_regions = mem_regions
 
+        # Sorted, non-overlapping (start, end, memoryview) spans of the
+        # memory regions, and their start addresses for bisecting
+        self.mem_spans = self.build_mem_spans(mem_regions)
+        self.mem_starts = [s[0] for s in self.mem_spans]
+
+    @staticmethod
+    def build_mem_spans(mem_regions):
+        # Where regions overlap, the first one in the list wins: the memory
+        # from the coredump takes precedence over the sections of the ELF
+        # file. The end of a span is given by the data of its region.
+        spans = list()
+
+        for r in mem_regions:
+            start = r['start']
+            data = memoryview(r['data']).cast('B')
+            pieces = [(start, start + len(data))]
+
+            for s_start, s_end, _ in spans:
+                clipped = list()
+                for p_start, p_end in pieces:
+                    if s_end <= p_start or p_end <= s_start:
+                        clipped.append((p_start, p_end))
+                        continue
+
+                    if p_start < s_start:
+                        clipped.append((p_start, s_start))
+                    if s_end < p_end:
+                        clipped.append((s_end, p_end))
+                pieces = clipped
+
+            for p_start, p_end in pieces:
+                if p_start < p_end:
+                    spans.append((p_start, p_end, data[p_start - start : p_end - start]))
+
+        spans.sort(key=lambda s: s[0])
+
+        return spans
+
+    def recv_more(self):
+        # Read whatever is available from the socket into the receive
+        # buffer. Raises EOFError if GDB went away.
+        data = self.socket.recv(GDB_RECV_SIZE)
+        if not data:
+            raise EOFError("GDB connection closed")
+
+        self.rx_buf += data
+
+    def send_all(self, data):
+        data = memoryview(data)
+        while data:
+            sent = self.socket.send(data)
+            if sent is None:
+                # File-like objects write everything
+                break
+            data = data[sent:]
+
+    def flush_gdb_packets(self):
+        if self.tx_buf:
+            self.send_all(self.tx_buf)
+            self.tx_buf.clear()
+
     def get_gdb_packet(self):
         socket = self.socket
         if socket is None:
             return None
 
-        data = b''
-        checksum = 0
-        # Wait for '$'
+        rx_buf = self.rx_buf
+
+        # Wait for '$', handling the acknowledgments of GDB on the way
         while True:
-            ch = socket.recv(1)
-            if ch == b'$':
+            start = rx_buf.find(b'$')
+            acks = rx_buf if start < 0 else rx_buf[:start]
+            if b'-' in acks and self.last_pkt:
+                # NACK of our last packet, send it again
+                logger.debug("Retransmitting last packet")
+                self.send_all(self.last_pkt)
+
+            if start >= 0:
+                del rx_buf[:start]
                 break
 
-        # Get a full packet
+            rx_buf.clear()
+            self.recv_more()
+
+        # Get a full packet, and its checksum (2-bytes)
         while True:
-            ch = socket.recv(1)
-            if ch == b'#':
-                # End of packet
+            end = rx_buf.find(b'#')
+            if end >= 0 and end + 3 <= len(rx_buf):
                 break
 
-            checksum += ord(ch)
-            data += ch
+            self.recv_more()
 
-        # Get checksum (2-bytes)
-        ch = socket.recv(2)
-        in_chksum = ord(binascii.unhexlify(ch))
+        data = bytes(rx_buf[1:end])
+        in_chksum_hex = bytes(rx_buf[end + 1 : end + 3])
+        del rx_buf[: end + 3]
 
         logger.debug(f"Received GDB packet: {data}")
 
-        if (checksum % 256) == in_chksum:
-            # ACK
+        if self.no_ack_mode:
+            return data
+
+        checksum = sum(data) % 256
+        try:
+            in_chksum = int(in_chksum_hex, 16)
+        except ValueError:
+            in_chksum = None
+
+        if checksum == in_chksum:
+            # ACK, sent along with the reply
             logger.debug("ACK")
-            socket.send(b'+')
+            self.tx_buf += b'+'
 
             return data
         else:
             # NACK
             logger.debug(f"NACK (checksum {in_chksum} != {checksum}")
-            socket.send(b'-')
+            self.send_all(b'-')
 
             return None
 
@@ -79,48 +180,82 @@ class GdbStub(abc.ABC):
         if socket is None:
             return
 
-        checksum = 0
-        for d in data:
-            checksum += d
-
-        pkt = b'$' + data + b'#'
+        checksum = sum(data) % 256
 
-        checksum = checksum % 256
-        pkt += format(checksum, "02X").encode()
+        pkt = b'$' + data + b'#' + format(checksum, "02X").encode()
 
         logger.debug(f"Sending GDB packet: {pkt}")
 
-        socket.send(pkt)
+        self.last_pkt = pkt
+        self.tx_buf += pkt
+        self.flush_gdb_packets()
 
-    def get_memory(self, start_address, length):
-        def get_mem_region(addr):
-            for r in self.mem_regions:
-                if r['start'] <= addr < r['end']:
-                    return r
+    def put_gdb_binary_packet(self, prefix, data):
+        # Send a reply with binary data, escaping the characters
+        # with a special meaning in packets
+        self.put_gdb_packet(prefix + escape_binary(data))
 
-            return None
+    def get_mem_spans(self, start_address, length):
+        # Generate the memoryviews of the memory from start_address,
+        # until length bytes or the first unmapped address
+        idx = bisect.bisect_right(self.mem_starts, start_address) - 1
+        if idx < 0:
+            return
 
-        # FIXME: Need more efficient way of extracting memory content
-        remaining = length
         addr = start_address
-        barray = b''
-        r = get_mem_region(addr)
-        while remaining > 0:
-            if r is None:
-                barray = None
+        end_address = start_address + length
+        for start, end, data in itertools.islice(self.mem_spans, idx, None):
+            if addr >= end_address or not start <= addr < end:
                 break
 
-            if addr > r['end']:
-                r = get_mem_region(addr)
-                continue
+            chunk = data[addr - start : min(end, end_address) - start]
+            yield chunk
+            addr += len(chunk)
 
-            offset = addr - r['start']
-            barray += r['data'][offset : offset + 1]
+    def get_memory(self, start_address, length):
+        chunks = list(self.get_mem_spans(start_address, length))
+        if sum(len(c) for c in chunks) != length:
+            return None
+
+        if len(chunks) == 1:
+            return chunks[0].tobytes()
+
+        return b''.join(chunks)
+
+    def get_memory_string(self, start_address, max_length):
+        # Read a NUL-terminated string of at most max_length bytes,
+        # stopping at the first unmapped address
+        string = b''
+        for chunk in self.get_mem_spans(start_address, max_length):
+            chunk = chunk.tobytes()
+            nul = chunk.find(b'\x00')
+            if nul >= 0:
+                return string + chunk[:nul]
+            string += chunk
+
+        return string
+
+    def get_memory_map(self):
+        # Memory map for qXfer:memory-map:read, with the adjacent
+        # spans merged together
+        ranges = list()
+        for start, end, _ in self.mem_spans:
+            if ranges and ranges[-1][1] == start:
+                ranges[-1][1] = end
+            else:
+                ranges.append([start, end])
 
-            addr += 1
-            remaining -= 1
+        xml = (
+            '<?xml version="1.0"?>\n'
+            '<!DOCTYPE memory-map PUBLIC "+//IDN gnu.org//DTD GDB Memory Map V1.0//EN" '
+            '"http://sourceware.org/gdb/gdb-memory-map.dtd">\n'
+            '<memory-map>\n'
+        )
+        for start, end in ranges:
+            xml += f'  <memory type="ram" start="0x{start:x}" length="0x{end - start:x}"/>\n'
+        xml += '</memory-map>\n'
 
-        return barray
+        return xml.encode()
 
     def handle_signal_query_packet(self):
         # the '?' packet
@@ -167,13 +302,71 @@ class GdbStub(abc.ABC):
         else:
             self.put_gdb_packet(b"E01")
 
+    def handle_binary_memory_read_packet(self, pkt):
+        # the 'x' packet for reading memory as binary data: x<addr>,<len>
+        str_addr, str_length = pkt[1:].split(b',')
+        s_addr = int(b'0x' + str_addr, 16)
+        length = int(b'0x' + str_length, 16)
+
+        barray = self.get_memory(s_addr, length)
+
+        if barray is not None:
+            self.put_gdb_binary_packet(b'b', barray)
+        else:
+            self.put_gdb_packet(b"E01")
+
     def handle_memory_write_packet(self, pkt):
         # the 'M' packet for writing to memory
         #
         # We don't support writing so return error
         self.put_gdb_packet(b"E02")
 
+    def handle_binary_memory_write_packet(self, pkt):
+        # the 'X' packet for writing binary data to memory:
+        # X<addr>,<len>:<data>
+        #
+        # We don't support writing so return error, without decoding
+        # the data
+        self.put_gdb_packet(b"E02")
+
+    def handle_supported_query_packet(self, pkt):
+        # the 'qSupported' packet, for the features of the stub
+        self.put_gdb_packet(
+            b"PacketSize="
+            + format(GDB_PACKET_SIZE, "X").encode()
+            + b";QStartNoAckMode+;qXfer:memory-map:read+;binary-upload+"
+        )
+
+    def handle_xfer_query_packet(self, pkt):
+        # the 'qXfer' packet for reading objects: qXfer:<object>:read:<annex>:<offset>,<len>
+        try:
+            obj, op, annex, str_range = pkt[6:].split(b':', 3)
+            str_offset, str_length = str_range.split(b',')
+            offset = int(b'0x' + str_offset, 16)
+            length = int(b'0x' + str_length, 16)
+        except ValueError:
+            self.put_gdb_packet(b"E00")
+            return
+
+        if obj != b"memory-map" or op != b"read" or annex:
+            # Unsupported object
+            self.put_gdb_packet(b'')
+            return
+
+        data = self.get_memory_map()
+        chunk = data[offset : offset + length]
+        prefix = b'l' if offset + length >= len(data) else b'm'
+        self.put_gdb_binary_packet(prefix, chunk)
+
     def handle_general_query_packet(self, pkt):
+        if pkt[0:10] == b"qSupported":
+            self.handle_supported_query_packet(pkt)
+            return
+
+        if pkt[0:6] == b"qXfer:":
+            self.handle_xfer_query_packet(pkt)
+            return
+
         if self.arch_supports_thread_operations() and self.elffile.has_kernel_thread_info():
             # For packets qfThreadInfo/qsThreadInfo, obtain a list of all active thread IDs
             if pkt[0:12] == b"qfThreadInfo":
@@ -256,17 +449,9 @@ class GdbStub(abc.ABC):
                         ThreadInfoOffset.THREAD_INFO_OFFSET_T_NAME
                     )
 
-                    thread_name_next_byte = self.get_memory(thread_ptr + t_name_offset, 1)
-                    index = 0
-                    while (thread_name_next_byte is not None) and (
-                        thread_name_next_byte != b'\x00'
-                    ):
-                        thread_info_bytes += thread_name_next_byte
-
-                        index += 1
-                        thread_name_next_byte = self.get_memory(
-                            thread_ptr + t_name_offset + index, 1
-                        )
+                    thread_info_bytes += self.get_memory_string(
+                        thread_ptr + t_name_offset, GDB_PACKET_SIZE
+                    )
 
                     t_state_offset = self.elffile.get_kernel_thread_info_offset(
                         ThreadInfoOffset.THREAD_INFO_OFFSET_T_STATE
@@ -341,7 +526,12 @@ class GdbStub(abc.ABC):
         self.socket = socket
 
         while True:
-            pkt = self.get_gdb_packet()
+            try:
+                pkt = self.get_gdb_packet()
+            except EOFError:
+                logger.info("GDB connection closed")
+                break
+
             if pkt is None:
                 continue
 
@@ -364,16 +554,25 @@ class GdbStub(abc.ABC):
                 self.handle_register_single_write_packet(pkt)
             elif pkt_type == b'm':
                 self.handle_memory_read_packet(pkt)
+            elif pkt_type == b'x':
+                self.handle_binary_memory_read_packet(pkt)
             elif pkt_type == b'M':
                 self.handle_memory_write_packet(pkt)
+            elif pkt_type == b'X':
+                self.handle_binary_memory_write_packet(pkt)
             elif pkt_type == b'q':
                 self.handle_general_query_packet(pkt)
+            elif pkt == b'QStartNoAckMode':
+                # Reply OK, still acknowledged, then stop acknowledging
+                self.put_gdb_packet(b'OK')
+                self.no_ack_mode = True
             elif pkt_type == b'T':
                 self.handle_thread_alive_packet(pkt)
             elif pkt_type == b'H':
                 self.handle_thread_op_packet(pkt)
             elif pkt_type == b'k':
                 # GDB quits
+                self.flush_gdb_packets()
                 break
             else:
                 self.put_gdb_packet(b'')
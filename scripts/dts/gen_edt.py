@@ -52,7 +52,8 @@ def main():
                          infer_binding_for_paths=["/zephyr,user", "/cpus"],
                          werror=args.edtlib_Werror,
                          vendor_prefixes=vendor_prefixes,
-                         warn_bus_mismatch=args.warn_bus_mismatch)
+                         warn_bus_mismatch=args.warn_bus_mismatch,
+                         binding_index=args.binding_index)
     except edtlib.EDTError as e:
         sys.exit(f"devicetree error: {e}")
 
@@ -92,12 +93,18 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--warn-bus-mismatch", action="store_true",
                         help="warn when devicetree nodes are on buses that "
                              "don't match available binding expectations")
+    parser.add_argument("--binding-index",
+                        help="path to a file caching the compatibles and "
+                             "parsed contents of the bindings between runs, "
+                             "so that only the needed bindings are loaded")
 
     return parser.parse_args()
 
 
 def write_pickled_edt(edt: edtlib.EDT, out_file: str) -> None:
-    # Writes the edt object in pickle format to out_file.
+    # Writes the edt object in pickle format to out_file, followed by the
+    # lookup tables which let edtlib.EDTSnapshot answer the most common
+    # queries without unpickling it.
 
     with open(out_file, 'wb') as f:
         # Pickle protocol version 4 is the default as of Python 3.8
@@ -109,6 +116,7 @@ def write_pickled_edt(edt: edtlib.EDT, out_file: str) -> None:
         # Using a common protocol version here will hopefully avoid
         # reproducibility issues in different Python installations.
         pickle.dump(edt, f, protocol=4)
+        edtlib.write_snapshot_tables(edt, f)
 
 
 def err(s: str) -> NoReturn:
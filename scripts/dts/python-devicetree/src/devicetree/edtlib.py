@@ -71,13 +71,17 @@ bindings_from_paths() helper function.
 import base64
 import hashlib
 import logging
+import mmap
 import os
+import pickle
 import re
+import struct
+import tempfile
 from collections import defaultdict
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Iterator, Mapping
 from copy import deepcopy
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, NoReturn, Optional, Union
+from typing import IO, TYPE_CHECKING, Any, NoReturn, Optional, Union
 
 import yaml
 
@@ -239,8 +243,7 @@ class Binding:
         if raw is None:
             if path is None:
                 _err("you must provide either a 'path' or a 'raw' argument")
-            with open(path, encoding="utf-8") as f:
-                raw = yaml.load(f, Loader=_BindingLoader)
+            raw = _load_binding_raw(path)
 
         # Merge any included files into self.raw. This also pulls in
         # inherited child binding definitions, so it has to be done
@@ -398,10 +401,9 @@ class Binding:
         if not path:
             _err(f"'{fname}' not found")
 
-        with open(path, encoding="utf-8") as f:
-            contents = yaml.load(f, Loader=_BindingLoader)
-            if not isinstance(contents, dict):
-                _err(f'{path}: invalid contents, expected a mapping')
+        contents = _load_binding_raw(path)
+        if not isinstance(contents, dict):
+            _err(f'{path}: invalid contents, expected a mapping')
 
         return self._merge_includes(contents, path)
 
@@ -2042,7 +2044,8 @@ class EDT:
                  infer_binding_for_paths: Optional[Iterable[str]] = None,
                  vendor_prefixes: Optional[dict[str, str]] = None,
                  werror: bool = False,
-                 warn_bus_mismatch: bool = False):
+                 warn_bus_mismatch: bool = False,
+                 binding_index: Optional[str] = None):
         """EDT constructor.
 
         dts:
@@ -2090,6 +2093,14 @@ class EDT:
         warn_bus_mismatch (default: False):
           If True, a warning is logged if a node's actual bus does not match
             the bus specified in its binding.
+
+        binding_index (default: None):
+          Path to a file where the 'compatible' and the parsed contents of
+          each binding found in 'bindings_dirs' are cached between runs. If
+          given, only the bindings with a 'compatible' that appears in the
+          devicetree are used, instead of reading all of them, and they are
+          not parsed again. The file is created if it doesn't exist, and its
+          entries are refreshed for the bindings which changed since.
         """
         # All instance attributes should be initialized here.
         # This makes it easy to keep track of them, which makes
@@ -2117,6 +2128,7 @@ class EDT:
         self._vendor_prefixes: dict[str, str] = vendor_prefixes or {}
         self._werror: bool = bool(werror)
         self._warn_bus_mismatch: bool = warn_bus_mismatch
+        self._binding_index: Optional[str] = binding_index
 
         # Other internal state
         self._compat2binding: dict[tuple[str, Optional[str]], Binding] = {}
@@ -2206,7 +2218,8 @@ class EDT:
             support_fixed_partitions_on_any_bus=self._fixed_partitions_no_bus,
             infer_binding_for_paths=set(self._infer_binding_for_paths),
             vendor_prefixes=dict(self._vendor_prefixes),
-            werror=self._werror
+            werror=self._werror,
+            binding_index=self._binding_index
         )
         ret.dts_path = self.dts_path
         ret._dt = deepcopy(self._dt, memo)
@@ -2313,7 +2326,19 @@ class EDT:
             "|".join(re.escape(compat) for compat in dt_compats)
         ).search
 
+        # Maps binding paths to their 'compatible', or None for binding
+        # fragments, if an index was given
+        binding_compats: dict[str, Optional[str]] = {}
+        if self._binding_index is not None:
+            binding_compats = _binding_index_compats(self._binding_index,
+                                                     self._binding_paths)
+
         for binding_path in self._binding_paths:
+            if (binding_path in binding_compats
+                    and binding_compats[binding_path] not in dt_compats):
+                # Known not to match without reading it
+                continue
+
             with open(binding_path, encoding="utf-8") as f:
                 contents = f.read()
 
@@ -2329,7 +2354,7 @@ class EDT:
             try:
                 # Parsed PyYAML output (Python lists/dictionaries/strings/etc.,
                 # representing the file)
-                raw = yaml.load(contents, Loader=_BindingLoader)
+                raw = _load_binding_raw(binding_path)
             except yaml.YAMLError as e:
                 _err(
                         f"'{binding_path}' appears in binding directories "
@@ -2539,6 +2564,141 @@ def bindings_from_paths(yaml_paths: list[str],
     return ret
 
 
+class EDTSnapshot:
+    """
+    Read-only view on an EDT saved by gen_edt.py, for clients which only
+    need a few lookups from it.
+
+    The file holds the pickled EDT, followed by the tables written by
+    write_snapshot_tables(). The lookups in the compat2nodes, compat2okay,
+    compat2notokay and label2node dicts, and in the /chosen node, are
+    answered from these tables, without unpickling the EDT. For example,
+    'compat in snapshot.compat2okay' only reads the tables.
+
+    The EDT is unpickled, from the memory-mapped file, the first time the
+    view is used in any other way: to get the Node objects from these
+    dicts, or to access any other EDT attribute or method, which are all
+    available on the view. Files without tables, like plain pickled EDT
+    objects, are unpickled right away.
+
+    These attributes are available on EDTSnapshot objects, in addition to
+    those of the EDT:
+
+    edt:
+      The EDT object, unpickled on first access
+    """
+
+    def __init__(self, path: str):
+        """
+        EDTSnapshot constructor.
+
+        path:
+          Path to the file written by gen_edt.py (e.g. edt.pickle)
+        """
+        self._edt: Optional[EDT] = None
+        self._mm: Optional[mmap.mmap] = None
+        self._edt_size: int = 0
+        self._tables: Optional[dict[str, Any]] = None
+
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        size = len(self._mm)
+        trailer_size = _SNAPSHOT_TRAILER.size
+        if size >= trailer_size:
+            tables_size, magic = _SNAPSHOT_TRAILER.unpack_from(
+                self._mm, size - trailer_size)
+            if magic == _SNAPSHOT_MAGIC and tables_size <= size - trailer_size:
+                self._edt_size = size - trailer_size - tables_size
+                with memoryview(self._mm)[self._edt_size:size - trailer_size] as view:
+                    self._tables = pickle.loads(view)
+
+        if self._tables is None:
+            self._edt_size = size
+            self._load()
+        else:
+            self.dts_path: str = self._tables["dts_path"]
+            self.bindings_dirs: list[str] = self._tables["bindings_dirs"]
+            self.compat2nodes = _SnapshotLookup(self, "compat2nodes", list)
+            self.compat2okay = _SnapshotLookup(self, "compat2okay", list)
+            self.compat2notokay = _SnapshotLookup(self, "compat2notokay", list)
+            self.label2node = _SnapshotLookup(self, "label2node")
+
+    @property
+    def edt(self) -> EDT:
+        "See the class docstring"
+        if self._edt is None:
+            self._load()
+        if TYPE_CHECKING:
+            assert self._edt is not None
+        return self._edt
+
+    def chosen_node(self, name: str) -> Optional[Node]:
+        """
+        Returns the Node pointed at by the property named 'name' in /chosen,
+        or None if the property is missing
+        """
+        if self._tables is not None and name not in self._tables["chosen"]:
+            return None
+        return self.edt.chosen_node(name)
+
+    def __getattr__(self, name: str) -> Any:
+        # Everything else comes from the EDT. Private and special attributes
+        # are not forwarded, as they would be looked up while the view is
+        # being initialized, copied, etc.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.edt, name)
+
+    def __repr__(self) -> str:
+        return f"<EDTSnapshot of {self.edt!r}>"
+
+    def _load(self) -> None:
+        # Unpickles the EDT, and unmaps the file as it's no longer needed
+        if TYPE_CHECKING:
+            assert self._mm is not None
+        with memoryview(self._mm)[:self._edt_size] as view:
+            self._edt = pickle.loads(view)
+        self._mm.close()
+        self._mm = None
+
+
+class _SnapshotLookup(Mapping):
+    # One of the lookup dicts of an EDTSnapshot. The keys come from the
+    # saved tables, the values from the unpickled EDT.
+    #
+    # Like the defaultdict(list) of the EDT, the dicts with a 'default' give
+    # an empty list for missing keys, but without adding them.
+
+    def __init__(self, snapshot: EDTSnapshot, name: str,
+                 default: Optional[Callable[[], Any]] = None):
+        self._snapshot = snapshot
+        self._name = name
+        self._default = default
+        self._keys: dict[str, Any] = snapshot._tables[name]  # type: ignore
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys:
+            if self._default is not None:
+                return self._default()
+            raise KeyError(key)
+        return getattr(self._snapshot.edt, self._name)[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._keys:
+            return default
+        return self[key]
+
+
 class EDTError(Exception):
     "Exception raised for devicetree- and binding-related errors"
 
@@ -2568,11 +2728,40 @@ def load_vendor_prefixes_txt(vendor_prefixes: str) -> dict[str, str]:
             vnd2vendor[vnd_vendor[0]] = vnd_vendor[1]
     return vnd2vendor
 
+def write_snapshot_tables(edt: EDT, f: IO[bytes]) -> None:
+    """
+    Write the lookup tables used by EDTSnapshot to the file 'f', right after
+    the pickled 'edt'. The file can still be read with pickle.load(), which
+    ignores them.
+    """
+    tables = {
+        "dts_path": edt.dts_path,
+        "bindings_dirs": edt.bindings_dirs,
+        "compat2nodes": _node_paths(edt.compat2nodes),
+        "compat2okay": _node_paths(edt.compat2okay),
+        "compat2notokay": _node_paths(edt.compat2notokay),
+        "label2node": {label: node.path
+                       for label, node in edt.label2node.items()},
+        "chosen": {name: node.path
+                   for name, node in edt.chosen_nodes.items()},
+    }
+    data = pickle.dumps(tables, protocol=4)
+    f.write(data)
+    f.write(_SNAPSHOT_TRAILER.pack(len(data), _SNAPSHOT_MAGIC))
+
 #
 # Private global functions
 #
 
 
+def _node_paths(compat2nodes: dict[str, list[Node]]) -> dict[str, list[str]]:
+    # Helper for write_snapshot_tables(). Empty lists, which may have been
+    # added by lookups in the defaultdict, are left out.
+
+    return {compat: [node.path for node in nodes]
+            for compat, nodes in compat2nodes.items() if nodes}
+
+
 def _dt_compats(dt: DT) -> set[str]:
     # Returns a set() with all 'compatible' strings in the devicetree
     # represented by dt (a dtlib.DT instance)
@@ -2594,6 +2783,114 @@ def _binding_paths(bindings_dirs: list[str]) -> list[str]:
             if filename.endswith((".yaml", ".yml"))]
 
 
+# Ends the files read by EDTSnapshot: the size of the pickled lookup tables,
+# which come right before, and a magic value
+_SNAPSHOT_MAGIC = b"EDTSNAP1"
+_SNAPSHOT_TRAILER = struct.Struct("<Q8s")
+
+# Bumped when the format of the binding index changes
+_BINDING_INDEX_VERSION = 2
+
+# Process-wide memo of the parsed binding files, mapping their paths to
+# ((<modification time>, <size>), <pickled contents>) tuples. See
+# _load_binding_raw().
+_binding_raw_cache: dict[str, tuple[tuple[int, int], bytes]] = {}
+
+
+def _file_stamp(path: str) -> tuple[int, int]:
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _load_binding_raw(path: str) -> Any:
+    # Returns the parsed YAML contents of the binding file 'path'.
+    #
+    # Common include files like base.yaml are included by most bindings, so
+    # the parsed contents are memoized for as long as the file doesn't
+    # change. Callers modify what they get (e.g. when merging includes), so
+    # a new copy is returned each time. Unpickling it is much faster than
+    # parsing the YAML again.
+
+    stamp = _file_stamp(path)
+    cached = _binding_raw_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return pickle.loads(cached[1])
+
+    with open(path, encoding="utf-8") as f:
+        raw = yaml.load(f, Loader=_BindingLoader)
+    _binding_raw_cache[path] = (stamp, pickle.dumps(raw, pickle.HIGHEST_PROTOCOL))
+    return raw
+
+
+def _binding_index_compats(index_path: str,
+                           binding_paths: list[str]) -> dict[str, Optional[str]]:
+    # Returns a dict that maps the paths in 'binding_paths' to the
+    # 'compatible' of the binding in each file, or None if the file doesn't
+    # have one. The results are cached in the file 'index_path', which is
+    # updated for the files whose modification time or size changed.
+    #
+    # The index also keeps the parsed contents of the files, which are
+    # added to the memo used by _load_binding_raw(): the bindings and
+    # include files needed by the devicetree don't need to be parsed again.
+    #
+    # Files which can't be loaded, or don't look like bindings, are left out
+    # of the returned dict: the regular binding loading reports the errors.
+
+    try:
+        with open(index_path, 'rb') as f:
+            version, entries = pickle.load(f)
+        if version != _BINDING_INDEX_VERSION:
+            entries = {}
+    except Exception:
+        # Missing, or unreadable; it's only a cache
+        entries = {}
+
+    ret: dict[str, Optional[str]] = {}
+    new_entries: dict[str, tuple[tuple[int, int], Optional[str], bytes]] = {}
+    changed = False
+    for binding_path in binding_paths:
+        try:
+            stamp = _file_stamp(binding_path)
+        except OSError:
+            continue
+
+        entry = entries.get(binding_path)
+        if entry is not None and entry[0] == stamp:
+            _binding_raw_cache[binding_path] = (stamp, entry[2])
+        else:
+            try:
+                raw = _load_binding_raw(binding_path)
+            except (OSError, UnicodeDecodeError, yaml.YAMLError):
+                continue
+
+            if raw is None:
+                compatible = None
+            elif isinstance(raw, dict) and isinstance(raw.get("compatible"),
+                                                      (str, type(None))):
+                compatible = raw.get("compatible")
+            else:
+                continue
+            entry = (stamp, compatible, _binding_raw_cache[binding_path][1])
+            changed = True
+
+        ret[binding_path] = entry[1]
+        new_entries[binding_path] = entry
+
+    if changed or len(new_entries) != len(entries):
+        # Written atomically, as builds running in parallel share the index
+        try:
+            index_dir = os.path.dirname(os.path.abspath(index_path))
+            os.makedirs(index_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=index_dir)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((_BINDING_INDEX_VERSION, new_entries), f)
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            _LOG.warning(f"could not write binding index '{index_path}': {e}")
+
+    return ret
+
+
 def _binding_inc_error(msg):
     # Helper for reporting errors in the !include implementation
 
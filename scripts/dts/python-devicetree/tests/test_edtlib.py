@@ -7,9 +7,12 @@ import io
 from logging import WARNING
 import os
 from pathlib import Path
+import pickle
 import textwrap
+from unittest import mock
 
 import pytest
+import yaml
 
 from devicetree import edtlib
 
@@ -825,6 +828,127 @@ def test_child_dependencies():
     assert edt.get_node("/child-binding/child-1/grandchild") in dep_node.required_by
     assert edt.get_node("/child-binding/child-2") in dep_node.required_by
 
+def test_binding_index(tmp_path, monkeypatch):
+    '''Test that a binding index gives the same EDT while reading fewer bindings'''
+    index = tmp_path / "binding_index.pickle"
+
+    with from_here():
+        edt = edtlib.EDT("test.dts", ["test-bindings"])
+        edt_indexed = edtlib.EDT("test.dts", ["test-bindings"],
+                                 binding_index=str(index))
+    assert index.exists()
+    assert repr(edt_indexed.nodes) == repr(edt.nodes)
+
+    # The bindings for compatibles in test.dts
+    binding_paths = edtlib._binding_paths([os.path.join(HERE, "test-bindings")])
+    dt_compats = edtlib._dt_compats(edt._dt)
+    needed = set()
+    for path in binding_paths:
+        with open(path, encoding="utf-8") as f:
+            raw = yaml.load(f, Loader=edtlib._BindingLoader)
+        if isinstance(raw, dict) and raw.get("compatible") in dt_compats:
+            needed.add(os.path.basename(path))
+    assert 0 < len(needed) < len(binding_paths)
+
+    # Bindings are served from the index, not from the memo of this process
+    monkeypatch.setattr(edtlib, "_binding_raw_cache", {})
+
+    opened = []
+    real_open = open
+    def recording_open(file, *args, **kwargs):
+        opened.append(file)
+        return real_open(file, *args, **kwargs)
+    monkeypatch.setattr("builtins.open", recording_open)
+    yaml_load = mock.Mock(wraps=edtlib.yaml.load)
+    monkeypatch.setattr(edtlib.yaml, "load", yaml_load)
+
+    with from_here():
+        edt_indexed = edtlib.EDT("test.dts", ["test-bindings"],
+                                 binding_index=str(index))
+    assert repr(edt_indexed.nodes) == repr(edt.nodes)
+
+    # No binding or include file was parsed again
+    yaml_load.assert_not_called()
+
+    # Only the bindings for compatibles in test.dts were read, to check
+    # their contents. Unrelated bindings and include files were not.
+    read_bindings = {os.path.basename(path) for path in opened
+                     if str(path).endswith(".yaml")}
+    assert read_bindings == needed
+    assert "multidir.yaml" not in read_bindings
+
+def test_binding_raw_memo(tmp_path):
+    '''Test the memo of the parsed binding files'''
+    binding = tmp_path / "memo.yaml"
+    binding.write_text("compatible: vnd,memo\ninclude: [base.yaml]\n")
+
+    raw = edtlib._load_binding_raw(str(binding))
+    assert raw == {"compatible": "vnd,memo", "include": ["base.yaml"]}
+
+    # Callers get their own copy, which they are free to modify
+    raw.pop("include")
+    again = edtlib._load_binding_raw(str(binding))
+    assert again == {"compatible": "vnd,memo", "include": ["base.yaml"]}
+    assert again is not raw
+
+    # A modified file is parsed again
+    binding.write_text("compatible: vnd,memo-2\n")
+    assert edtlib._load_binding_raw(str(binding)) == {"compatible": "vnd,memo-2"}
+
+def test_snapshot(tmp_path):
+    '''Test EDTSnapshot, reading the lookup tables saved after a pickled EDT'''
+    dts_file = tmp_path / "snapshot.dts"
+    dts_file.write_text("""
+/dts-v1/;
+
+/ {
+	chosen {
+		zephyr,console = &uart0;
+	};
+	uart0: serial-0 {
+		compatible = "vnd,serial";
+	};
+	serial-1 {
+		compatible = "vnd,serial";
+		status = "disabled";
+	};
+};
+""")
+    edt = edtlib.EDT(str(dts_file), [])
+    snapshot_file = tmp_path / "edt.pickle"
+    with open(snapshot_file, "wb") as f:
+        pickle.dump(edt, f, protocol=4)
+        edtlib.write_snapshot_tables(edt, f)
+
+    # Still a regular pickled EDT
+    with open(snapshot_file, "rb") as f:
+        assert repr(pickle.load(f)) == repr(edt)
+
+    snapshot = edtlib.EDTSnapshot(str(snapshot_file))
+    assert "vnd,serial" in snapshot.compat2okay
+    assert "vnd,serial" in snapshot.compat2notokay
+    assert "vnd,other" not in snapshot.compat2nodes
+    assert snapshot.compat2okay["vnd,other"] == []
+    assert "vnd,other" not in snapshot.compat2okay
+    assert snapshot.label2node.get("uart1") is None
+    assert sorted(snapshot.label2node) == ["uart0"]
+    assert snapshot.chosen_node("zephyr,shell-uart") is None
+    assert snapshot.bindings_dirs == []
+    # None of the above needed the EDT
+    assert snapshot._edt is None
+
+    assert snapshot.label2node["uart0"].path == "/serial-0"
+    assert snapshot.chosen_node("zephyr,console").path == "/serial-0"
+    assert [node.path for node in snapshot.nodes] == \
+        [node.path for node in edt.nodes]
+
+    # Plain pickled objects are loaded right away
+    pickle_file = tmp_path / "plain.pickle"
+    pickle_file.write_bytes(pickle.dumps(edt, protocol=4))
+    snapshot = edtlib.EDTSnapshot(str(pickle_file))
+    assert "vnd,serial" in snapshot.compat2okay
+    assert snapshot.get_node("/serial-0").labels == ["uart0"]
+
 def test_slice_errs(tmp_path):
     '''Test error messages from the internal _slice() helper'''
 
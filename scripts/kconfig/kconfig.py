@@ -136,6 +136,11 @@ def main():
     print(kconf.write_config(args.config_out))
     print(kconf.write_autoconf(args.header_out))
 
+    if args.sync_deps:
+        # Lets objects depend on the symbols they use instead of on the
+        # whole header
+        kconf.sync_deps(args.sync_deps)
+
     # Write value origin information for the merged configuration
     trace_data = collect_trace_data(kconf)
     with open(args.config_out + '-trace.pickle', 'wb') as f:
@@ -366,6 +371,11 @@ def parse_args():
                              " adjustments.")
     parser.add_argument("--zephyr-base",
                         help="Path to current Zephyr installation")
+    parser.add_argument("--sync-deps",
+                        metavar="DIR",
+                        help="Keep a stamp file per symbol in DIR, touched "
+                             "when the value of the symbol changes (see "
+                             "Kconfig.sync_deps() and scripts/build/fixdep.py)")
     parser.add_argument("kconfig_file",
                         help="Top-level Kconfig file")
     parser.add_argument("config_out",
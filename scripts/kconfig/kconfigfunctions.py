@@ -4,10 +4,8 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import functools
-import inspect
 import operator
 import os
-import pickle
 import re
 import sys
 from pathlib import Path
@@ -26,9 +24,11 @@ if not doc_mode:
 
     # The "if" handles a missing dts.
     if EDT_PICKLE is not None and os.path.isfile(EDT_PICKLE):
-        with open(EDT_PICKLE, 'rb') as f:
-            edt = pickle.load(f)
-            edtlib = inspect.getmodule(edt)
+        from devicetree import edtlib
+
+        # Many functions only look up compatibles, labels or chosen nodes,
+        # which the snapshot answers without unpickling the whole EDT
+        edt = edtlib.EDTSnapshot(EDT_PICKLE)
     else:
         edt = None
         edtlib = None
@@ -241,6 +241,13 @@ symbol appear in Symbol.assignable. For other symbol types, just check if
 sym.visibility is non-0 (non-n) to see whether the user value will have an
 effect.
 
+To try out assignments without losing the current configuration, use
+Kconfig.checkpoint() and Kconfig.rollback(), or the Kconfig.what_if() context
+manager. Rolling back restores the previous user values, and like for
+assignments, only the symbols that depend on the changed symbols are
+recalculated, which keeps repeated 'what if' queries on a large configuration
+cheap.
+
 
 Intro to the menu tree
 ======================
@@ -455,6 +462,26 @@ Some optional warnings can be controlled via environment variables:
     variable.
 
 
+Caching the parsed Kconfig tree
+-------------------------------
+
+If the KCONFIG_CACHE environment variable is set, Kconfig.__init__() saves the
+parsed Kconfig tree (symbols, choices, menu nodes, and expressions) to the file
+it names, and later restores it from there instead of parsing the Kconfig
+files again, as long as the saved tree is up to date.
+
+The saved tree is up to date if the Kconfig files have the same contents, the
+'source' glob patterns match the same files, the environment variables
+referenced from the Kconfig files have the same values, and calls to $(shell),
+$(info), and user-defined preprocessor functions give the same results. These
+calls are made again to check this, with the same parsing location. The
+arguments to Kconfig.__init__() and the Kconfiglib version must be the same
+too.
+
+Warnings generated while parsing are saved with the tree, and printed again
+when it is restored, if Kconfig.warn_to_stderr is True.
+
+
 Preprocessor user functions defined in Python
 ---------------------------------------------
 
@@ -549,6 +576,7 @@ import re
 import sys
 
 # Get rid of some attribute lookups. These are obvious in context.
+from contextlib import contextmanager
 from glob import iglob
 from os.path import dirname, exists, expandvars, islink, join, realpath
 
@@ -858,6 +886,15 @@ class Kconfig(object):
         "_tokens",
         "_tokens_i",
         "_reuse_tokens",
+
+        # Inputs recorded for the parsed tree cache (see KCONFIG_CACHE)
+        "_cache_calls",
+        "_cache_env",
+        "_cache_globs",
+
+        # Assignment journal, see checkpoint()
+        "_checkpoints",
+        "_journal",
     )
 
     #
@@ -1035,6 +1072,25 @@ class Kconfig(object):
         except ImportError:
             pass
 
+        # Preprocessor function calls, environment variables, and glob results
+        # the parse depends on, saved with the tree in the cache to validate it
+        self._cache_calls = []
+        self._cache_env = {}
+        self._cache_globs = []
+
+        # Saved user states of the symbols and choices changed since the
+        # oldest open checkpoint, or None if there is no open checkpoint
+        self._journal = None
+        # (<length of the journal>, <items recorded since>) when each open
+        # checkpoint was created
+        self._checkpoints = []
+
+        # Restore the parsed tree from the cache if it's up to date. See the
+        # 'Caching the parsed Kconfig tree' section in the module docstring.
+        cache_filename = os.getenv("KCONFIG_CACHE")
+        if cache_filename and self._load_cache(cache_filename, filename):
+            return
+
         # This determines whether previously unseen symbols are registered.
         # They shouldn't be if we parse expressions after parsing, as part of
         # Kconfig.eval_string().
@@ -1124,6 +1180,9 @@ class Kconfig(object):
         # awkward during dependency loop detection
         self._add_choice_deps()
 
+        if cache_filename:
+            self._save_cache(cache_filename, filename)
+
     @property
     def mainmenu_text(self):
         """
@@ -2002,6 +2061,94 @@ class Kconfig(object):
         finally:
             self._warn_assign_no_prompt = True
 
+    def checkpoint(self):
+        """
+        Starts recording changes to the configuration, so that they can be
+        undone with rollback(). Returns a checkpoint to pass to rollback() or
+        commit().
+
+        Checkpoints can be nested. All changes made after the checkpoint was
+        created are recorded, whether they're made with load_config(),
+        Symbol/Choice.set_value(), unset_value(), or unset_values(). Warnings
+        and Kconfig.missing_syms are not restored by rollback().
+
+        Checkpoints must be rolled back or committed in the reverse order of
+        their creation. Rolling back or committing a checkpoint closes any
+        checkpoint created after it too.
+        """
+        if self._journal is None:
+            self._journal = []
+        self._checkpoints.append((len(self._journal), set()))
+        return len(self._checkpoints) - 1
+
+    def rollback(self, checkpoint):
+        """
+        Undoes the changes made to the configuration since 'checkpoint' was
+        created by checkpoint(), and closes it.
+
+        Symbols and choices get back the user values they had. The items
+        depending on them are invalidated as for an assignment, and their
+        values recalculated when needed.
+        """
+        journal = self._journal
+        start = self._checkpoints[checkpoint][0]
+        entries = journal[start:]
+        del journal[start:]
+        del self._checkpoints[checkpoint:]
+
+        # Rolling back isn't recorded
+        self._journal = None
+
+        # An item is recorded once per checkpoint, so there can be several
+        # states for it with nested checkpoints. The oldest one is restored
+        # last.
+        self._warn_assign_no_prompt = False
+        try:
+            for item, state in reversed(entries):
+                item._restore_state(state)
+        finally:
+            self._warn_assign_no_prompt = True
+
+        if self._checkpoints:
+            self._journal = journal
+
+    def _record(self, item):
+        # Saves the user state of 'item' for rollback() before its first
+        # change since the last checkpoint. Only called while a checkpoint is
+        # open.
+
+        recorded = self._checkpoints[-1][1]
+        if item not in recorded:
+            recorded.add(item)
+            self._journal.append((item, item._save_state()))
+
+    def commit(self, checkpoint):
+        """
+        Keeps the changes made to the configuration since 'checkpoint' was
+        created by checkpoint(), and closes it. The changes can still be
+        undone by rolling back an older checkpoint.
+        """
+        del self._checkpoints[checkpoint:]
+        if not self._checkpoints:
+            self._journal = None
+
+    @contextmanager
+    def what_if(self):
+        """
+        Context manager that undoes the changes made to the configuration in
+        its body when exiting, using checkpoint() and rollback(). For example,
+        this checks whether a configuration fragment can be applied as is:
+
+          with kconf.what_if():
+              kconf.load_config("fragment.conf", replace=False)
+              ok = all(sym.str_value == sym.user_value ...)
+        """
+        checkpoint = self.checkpoint()
+        try:
+            yield self
+        finally:
+            self.rollback(checkpoint)
+
     def enable_warnings(self):
         """
         Do 'Kconfig.warn = True' instead. Maintained for backwards
@@ -2848,9 +2995,13 @@ class Kconfig(object):
                                    .format(self.filename, self.linenr, fn,
                                            expected_args, len(args) - 1))
 
-            return py_fn(self, *args)
+            res = py_fn(self, *args)
+            if fn not in _CACHE_PURE_FUNCTIONS:
+                self._cache_calls.append((tuple(args), self.loc, res))
+            return res
 
         # Environment variables are tried last
+        self._cache_env[fn] = os.environ.get(fn)
         if fn in os.environ:
             self.env_vars.add(fn)
             return os.environ[fn]
@@ -2980,7 +3131,9 @@ class Kconfig(object):
                 # - Sort the glob results to ensure a consistent ordering of
                 #   Kconfig symbols, which indirectly ensures a consistent
                 #   ordering in e.g. .config files
-                filenames = sorted(iglob(join(self._srctree_prefix, pattern)))
+                glob_pattern = join(self._srctree_prefix, pattern)
+                filenames = sorted(iglob(glob_pattern))
+                self._cache_globs.append((glob_pattern, filenames))
 
                 if not filenames and t0 in _OBL_SOURCE_TOKENS:
                     raise KconfigError(
@@ -3213,6 +3366,7 @@ class Kconfig(object):
 
                     env_var = self._expect_str_and_eol()
                     node.item.env_var = env_var
+                    self._cache_env[env_var] = os.environ.get(env_var)
 
                     if env_var in os.environ:
                         node.defaults.append(
@@ -3466,6 +3620,136 @@ class Kconfig(object):
 
         self._parse_error("malformed expression")
 
+    #
+    # Parsed tree cache
+    #
+
+    def _cache_key(self, filename):
+        # Returns the parts of the cache key that are known before parsing
+
+        return (_file_stamp(__file__), sys.version,
+                os.path.abspath(join(self.srctree, filename)),
+                self._srctree_prefix, self.warn, self._encoding,
+                sorted(self._functions),
+                [os.getenv(var) for var in _CACHE_ENV_VARS])
+
+    def _load_cache(self, cache_filename, filename):
+        # Restores the tree saved by _save_cache() into this Kconfig instance,
+        # if it's up to date. Returns True if the tree was restored.
+
+        import gc
+        import pickle
+
+        try:
+            with open(cache_filename, "rb") as f:
+                unpickler = pickle.Unpickler(f)
+                if unpickler.load() != self._cache_key(filename) or \
+                   not self._cache_valid(*unpickler.load()):
+                    return False
+
+                # The tree consists of many small objects, which are created a
+                # lot faster with the garbage collector disabled
+                gc_enabled = gc.isenabled()
+                gc.disable()
+                try:
+                    kconf, objs = _load_tree(unpickler)
+                finally:
+                    if gc_enabled:
+                        gc.enable()
+        except Exception:
+            # Missing cache, or one that can't be loaded by this version of
+            # Kconfiglib. Calls to user-defined functions that now fail end up
+            # here too, and fail again while parsing.
+            return False
+
+        for name in self.__slots__:
+            if hasattr(kconf, name):
+                setattr(self, name, getattr(kconf, name))
+
+        for obj in objs:
+            if obj is not kconf:
+                obj.kconfig = self
+
+        if self.warn_to_stderr:
+            for msg in self.warnings:
+                sys.stderr.write(msg + "\n")
+
+        return True
+
+    def _cache_valid(self, files, globs, env, calls):
+        # Returns True if a tree parsed with the inputs recorded by
+        # _save_cache() is still up to date
+
+        for name, value in env.items():
+            if os.environ.get(name) != value:
+                return False
+
+        for pattern, filenames in globs:
+            # Patterns without wildcards that matched a file are checked with
+            # the other files below
+            if (_glob_magic_search(pattern) or not filenames) and \
+               sorted(iglob(pattern)) != filenames:
+                return False
+
+        for path, stamp, digest in files:
+            if _file_stamp(path) != stamp and _file_digest(path) != digest:
+                return False
+
+        # Make the calls last, as they might have side effects. Any warnings
+        # they generate were saved with the tree.
+        warn = self.warn
+        self.warn = False
+        try:
+            for args, self.loc, res in calls:
+                self.filename, self.linenr = self.loc
+                if self._functions[args[0]][0](self, *args) != res:
+                    return False
+        finally:
+            self.warn = warn
+
+        return True
+
+    def _save_cache(self, cache_filename, filename):
+        # Saves the parsed tree to 'cache_filename', together with the inputs
+        # of the parse, used to check that the tree is still up to date. The
+        # cache is only an optimization, so errors are ignored.
+
+        import gc
+        import pickle
+        import tempfile
+
+        try:
+            files = []
+            for path in _ordered_unique(self.kconfig_filenames):
+                path = os.path.abspath(join(self.srctree, path))
+                files.append((path, _file_stamp(path), _file_digest(path)))
+
+            fd, tmp_filename = tempfile.mkstemp(
+                dir=dirname(cache_filename) or ".", suffix=".tmp")
+        except EnvironmentError:
+            return
+
+        # Like for loading, the garbage collector slows pickling down a lot
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with os.fdopen(fd, "wb") as f:
+                _save_tree(
+                    f, self, self._cache_key(filename),
+                    (files, self._cache_globs, self._cache_env,
+                     self._cache_calls))
+            # Replace the cache atomically, as other processes might be
+            # reading it
+            os.replace(tmp_filename, cache_filename)
+        except (EnvironmentError, pickle.PicklingError):
+            try:
+                os.remove(tmp_filename)
+            except EnvironmentError:
+                pass
+        finally:
+            if gc_enabled:
+                gc.enable()
+
     #
     # Caching and invalidation
     #
@@ -4710,6 +4994,8 @@ class Symbol(object):
         # wouldn't be safe (symbol user values always match the values set in a
         # .config file or via set_value(), and are never implicitly updated).
         if value == self.user_value and not self.choice:
+            if self.kconfig._journal is not None:
+                self.kconfig._record(self)
             self._was_set = True
             return True
 
@@ -4732,6 +5018,9 @@ class Symbol(object):
 
             return False
 
+        if self.kconfig._journal is not None:
+            self.kconfig._record(self)
+
         self.user_loc = loc
         self.user_value = value
         self._was_set = True
@@ -4741,6 +5030,8 @@ class Symbol(object):
             # choice. Like for symbol user values, the user selection is not
             # guaranteed to match the actual selection of the choice, as
             # dependencies come into play.
+            if self.kconfig._journal is not None:
+                self.kconfig._record(self.choice)
             self.choice.user_selection = self
             self.choice._was_set = True
             self.choice._rec_invalidate()
@@ -4755,6 +5046,9 @@ class Symbol(object):
         gotten a user value via Kconfig.load_config() or Symbol.set_value().
         """
         if self.user_value is not None:
+            if self.kconfig._journal is not None:
+                self.kconfig._record(self)
+
             self.user_loc = None
             self.user_value = None
             self._rec_invalidate_if_has_prompt()
@@ -4970,6 +5264,20 @@ class Symbol(object):
         self._cached_str_val = self._cached_tri_val = self._cached_vis = \
         self._cached_assignable = None
 
+    def _save_state(self):
+        # Returns the user state of the symbol, for Kconfig.rollback().
+        # Calculated values aren't saved, as they may have been calculated
+        # from the state of other items being rolled back.
+
+        return (self.user_value, self.user_loc, self._was_set)
+
+    def _restore_state(self, state):
+        # Restores a state returned by _save_state(), invalidating the values
+        # calculated from the current one like set_value() does
+
+        self.user_value, self.user_loc, self._was_set = state
+        self._rec_invalidate_if_has_prompt()
+
     def _rec_invalidate(self):
         # Invalidates the symbol and all items that (possibly) depend on it
 
@@ -5374,6 +5682,8 @@ class Choice(object):
         if value == self.user_value:
             # We know the value must be valid if it was successfully set
             # previously
+            if self.kconfig._journal is not None:
+                self.kconfig._record(self)
             self._was_set = True
             return True
 
@@ -5390,6 +5700,9 @@ class Choice(object):
 
             return False
 
+        if self.kconfig._journal is not None:
+            self.kconfig._record(self)
+
         self.user_loc = loc
         self.user_value = value
         self._was_set = True
@@ -5403,6 +5716,9 @@ class Choice(object):
         the user had never touched the mode or any of the choice symbols.
         """
         if self.user_value is not None or self.user_selection:
+            if self.kconfig._journal is not None:
+                self.kconfig._record(self)
+
             self.user_loc = None
             self.user_value = self.user_selection = None
             self._rec_invalidate()
@@ -5516,6 +5832,8 @@ class Choice(object):
         # to special-case choices.
         self.is_constant = self.is_optional = False
 
+        self._was_set = False
+
         # See Kconfig._build_dep()
         self._dependents = set()
 
@@ -5577,6 +5895,20 @@ class Choice(object):
         self._cached_vis = self._cached_assignable = None
         self._cached_selection = _NO_CACHED_SELECTION
 
+    def _save_state(self):
+        # See Symbol._save_state()
+
+        return (self.user_value, self.user_selection, self.user_loc,
+                self._was_set)
+
+    def _restore_state(self, state):
+        # See Symbol._restore_state(). Invalidating clears user_loc, so it's
+        # done first.
+
+        self._rec_invalidate()
+        (self.user_value, self.user_selection, self.user_loc,
+         self._was_set) = state
+
     def _rec_invalidate(self):
         # See Symbol._rec_invalidate()
 
@@ -6893,6 +7225,93 @@ def _warn_verbose_deprecated(fn_name):
         "configuration interfaces.\n".format(fn_name))
 
 
+def _file_stamp(path):
+    # Returns a tuple that changes when the file at 'path' is modified
+
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _file_digest(path):
+    # Returns a hash of the contents of the file at 'path'
+
+    import hashlib
+
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def _save_tree(f, kconf, *headers):
+    # Pickles each of 'headers', followed by the parsed tree of 'kconf', to the
+    # file 'f'. Load them with _load_tree().
+    #
+    # Symbols, choices, menu nodes, and preprocessor variables reference each
+    # other in long chains, which would make pickle recurse too deeply.
+    # Instead, they are pickled without their attributes where they are first
+    # referenced, and their attributes are pickled afterwards, in batches,
+    # which only reference the (already pickled) objects.
+
+    import copyreg
+    import pickle
+
+    class TreePickler(pickle.Pickler):
+        def reducer_override(self, obj):
+            if type(obj) is _TreeState:
+                return (_tree_obj, (obj.obj,), obj.state)
+
+            if type(obj) in _TREE_CLASSES:
+                self.unfilled.append(obj)
+                return (copyreg.__newobj__, (type(obj),))
+
+            return NotImplemented
+
+    pickler = TreePickler(f, pickle.HIGHEST_PROTOCOL)
+    pickler.unfilled = []
+    for header in headers:
+        pickler.dump(header)
+    pickler.dump(kconf)
+    while pickler.unfilled:
+        objs = pickler.unfilled
+        pickler.unfilled = []
+        pickler.dump([_TreeState(obj) for obj in objs])
+    pickler.dump([])
+
+
+def _load_tree(unpickler):
+    # Loads a tree saved by _save_tree(), after its headers. Returns a
+    # (<Kconfig instance>, <list of all objects in the tree>) tuple.
+
+    kconf = unpickler.load()
+    objs = []
+    while True:
+        batch = unpickler.load()
+        if not batch:
+            return (kconf, objs)
+        objs += batch
+
+
+def _tree_obj(obj):
+    # Used by _save_tree() to fill in an already loaded object with its
+    # attributes when loading, by returning it unchanged
+
+    return obj
+
+
+class _TreeState(object):
+    # An object of the tree in _save_tree() with its attributes
+
+    __slots__ = ("obj", "state")
+
+    def __init__(self, obj):
+        self.obj = obj
+        # (None, <dict with the values of the __slots__ attributes>)
+        self.state = obj.__reduce_ex__(2)[2]
+        if type(obj) is Kconfig:
+            self.state = (None, {
+                name: val for name, val in self.state[1].items()
+                if name not in _CACHE_UNSAVED_ATTRS})
+
+
 # Predefined preprocessor functions
 
 
@@ -7255,6 +7674,48 @@ _RELATIONS = frozenset({
     GREATER_EQUAL,
 })
 
+# Classes of the objects in the parsed tree cache
+_TREE_CLASSES = frozenset({
+    Kconfig,
+    Symbol,
+    Choice,
+    MenuNode,
+    Variable,
+})
+
+# Kconfig attributes that aren't saved in the parsed tree cache
+_CACHE_UNSAVED_ATTRS = frozenset({
+    "_cache_calls",
+    "_cache_env",
+    "_cache_globs",
+    "_checkpoints",
+    "_functions",
+    "_journal",
+    "_readline",
+    "warn_to_stderr",
+})
+
+# Predefined preprocessor functions whose results only depend on the Kconfig
+# files. Calls to other functions are saved in the parsed tree cache.
+_CACHE_PURE_FUNCTIONS = frozenset({
+    "error-if",
+    "filename",
+    "lineno",
+    "warning-if",
+})
+
+# Environment variables read by Kconfig.__init__() that affect parsing
+_CACHE_ENV_VARS = (
+    "CONFIG_",
+    "KCONFIG_AUTOHEADER_HEADER",
+    "KCONFIG_CONFIG_HEADER",
+    "KCONFIG_FUNCTIONS",
+    "KCONFIG_STRICT",
+    "KCONFIG_WARN_UNDEF",
+    "KCONFIG_WARN_UNDEF_ASSIGN",
+    "srctree",
+)
+
 # Origin kinds map
 KIND_TO_STR = {
     UNKNOWN:    "unset",    # value not set
@@ -7303,6 +7764,9 @@ _assignment_lhs_fragment_match = _re_match("[A-Za-z0-9_-]*")
 # variable assignment
 _assignment_rhs_match = _re_match(r"\s*(=|:=|\+=)\s*(.*)")
 
+# Wildcards in a glob pattern
+_glob_magic_search = _re_search(r"[*?[]")
+
 # Special characters/strings while expanding a macro ('(', ')', ',', and '$(')
 _macro_special_search = _re_search(r"\(|\)|,|\$\(")
 
@@ -23,7 +23,11 @@ import sys
 import dictionary_parser.log_database
 import elftools
 from dictionary_parser.log_database import LogDatabase
-from dictionary_parser.utils import extract_one_string_in_section, find_string_in_mappings
+from dictionary_parser.utils import (
+    build_string_mappings_index,
+    extract_one_string_in_section,
+    find_string_in_mappings,
+)
 from elftools.dwarf.descriptions import describe_DWARF_expr
 from elftools.dwarf.locationlists import LocationExpr, LocationParser
 from elftools.elf.constants import SH_FLAGS
@@ -188,6 +192,8 @@ def parse_log_const_symbols(database, log_const_area, log_const_symbols, string_
 
     first_offset -= log_const_area['start']
 
+    string_mappings_index = build_string_mappings_index(string_mappings)
+
     # find all log_const_*
     for sym in log_const_symbols:
         # Find data offset in log_const_area for this symbol
@@ -209,7 +215,7 @@ def parse_log_const_symbols(database, log_const_area, log_const_symbols, string_
         str_ptr, level = struct.unpack(formatter, datum)
 
         # Offset to rodata section for string
-        instance_name = find_string_in_mappings(string_mappings, str_ptr)
+        instance_name = find_string_in_mappings(string_mappings, str_ptr, string_mappings_index)
         if instance_name is None:
             instance_name = "unknown"
 
@@ -131,6 +131,7 @@ class DataTypes:
 
         self.data_types[data_type] = {}
         self.data_types[data_type]['fmt'] = formatter
+        self.data_types[data_type]['struct'] = struct.Struct(formatter)
 
         size = struct.calcsize(formatter)
 
@@ -179,3 +180,7 @@ class DataTypes:
     def get_formatter(self, data_type):
         """Get the formatter for a data type"""
         return self.data_types[data_type]['fmt']
+
+    def get_struct(self, data_type):
+        """Get the precompiled struct.Struct of the formatter for a data type"""
+        return self.data_types[data_type]['struct']
@@ -13,7 +13,11 @@ import copy
 import json
 
 from .mipi_syst import gen_syst_xml_file
-from .utils import extract_one_string_in_section, find_string_in_mappings
+from .utils import (
+    build_string_mappings_index,
+    extract_one_string_in_section,
+    find_string_in_mappings,
+)
 
 ARCHS = {
     "arc": {
@@ -75,6 +79,9 @@ class LogDatabase:
 
         self.database = new_db
 
+        # Index of the string mappings, built on first use
+        self._string_mappings_index = None
+
     def get_version(self):
         """Get Database Version"""
         return self.database['version']
@@ -153,6 +160,7 @@ class LogDatabase:
     def set_string_mappings(self, database):
         """Add string mappings to database"""
         self.database['string_mappings'] = database
+        self._string_mappings_index = None
 
     def has_string_mappings(self):
         """Return True if there are string mappings in database"""
@@ -170,7 +178,12 @@ class LogDatabase:
         Find string pointed by string_ptr in the string mapping
         list. Return None if not found.
         """
-        return find_string_in_mappings(self.database['string_mappings'], string_ptr)
+        string_mappings = self.database['string_mappings']
+
+        if self._string_mappings_index is None:
+            self._string_mappings_index = build_string_mappings_index(string_mappings)
+
+        return find_string_in_mappings(string_mappings, string_ptr, self._string_mappings_index)
 
     def __find_string_in_sections(self, string_ptr):
         """
@@ -9,7 +9,10 @@ Abstract Class for Dictionary-based Logging Parsers
 """
 
 import abc
+import functools
 import re
+import sys
+from dataclasses import dataclass
 
 from colorama import Fore
 
@@ -32,6 +35,7 @@ def get_log_level_str_color(lvl):
     return LOG_LEVELS[lvl]
 
 
+@functools.lru_cache(maxsize=4096)
 def formalize_fmt_string(fmt_str):
     """Replace unsupported formatter"""
     new_str = fmt_str
@@ -55,6 +59,104 @@ def formalize_fmt_string(fmt_str):
     return new_str
 
 
+@functools.lru_cache(maxsize=4096)
+def get_fmt_str_arg_types(fmt_str):
+    """Parse the format string and return the types of its
+    arguments in the binary arglist, as a tuple of
+    (data type, is string) tuples"""
+    idx = 0
+    arg_data_type = None
+    is_parsing = False
+
+    arg_types = []
+
+    # Translated from cbvprintf_package()
+    for idx, fmt in enumerate(fmt_str):
+        if not is_parsing:
+            if fmt == '%':
+                is_parsing = True
+                arg_data_type = DataTypes.INT
+                continue
+
+        elif fmt == '%':
+            # '%%' -> literal percentage sign
+            is_parsing = False
+            continue
+
+        elif fmt == '*':
+            pass
+
+        elif fmt.isdecimal() or str.lower(fmt) == 'l' or fmt in (' ', '#', '-', '+', '.', 'h'):
+            # formatting modifiers, just ignore
+            continue
+
+        elif fmt in ('j', 'z', 't'):
+            # intmax_t, size_t or ptrdiff_t
+            arg_data_type = DataTypes.LONG
+
+        elif fmt in ('c', 'd', 'i', 'o', 'u', 'x', 'X'):
+            unsigned = fmt in ('c', 'o', 'u', 'x', 'X')
+
+            if fmt_str[idx - 1] == 'l':
+                if fmt_str[idx - 2] == 'l':
+                    arg_data_type = DataTypes.ULONG_LONG if unsigned else DataTypes.LONG_LONG
+                else:
+                    arg_data_type = DataTypes.ULONG if unsigned else DataTypes.LONG
+            else:
+                arg_data_type = DataTypes.UINT if unsigned else DataTypes.INT
+
+            is_parsing = False
+            arg_types.append((arg_data_type, False))
+
+        elif fmt in ('s', 'p', 'n'):
+            arg_data_type = DataTypes.PTR
+
+            is_parsing = False
+            arg_types.append((arg_data_type, fmt == 's'))
+
+        elif str.lower(fmt) in ('a', 'e', 'f', 'g'):
+            # Python doesn't do"long double".
+            #
+            # Parse it as double (probably incorrect), but
+            # still have to skip enough bytes.
+            if fmt_str[idx - 1] == 'L':
+                arg_data_type = DataTypes.LONG_DOUBLE
+            else:
+                arg_data_type = DataTypes.DOUBLE
+
+            is_parsing = False
+            arg_types.append((arg_data_type, False))
+
+        else:
+            is_parsing = False
+            continue
+
+    return tuple(arg_types)
+
+
+@dataclass
+class LogRecord:
+    """One decoded log message"""
+
+    timestamp: int = 0
+    domain_id: int = 0
+    level: int = 0
+    source_id: int = 0
+    source: str = ""
+    # Address of the format string, which identifies it in the database
+    fmt_str_ptr: int = 0
+    fmt_str: str = ""
+    args: tuple = ()
+    hexdump: bytes = b""
+    # Set if the record reports a number of dropped messages instead
+    num_dropped: int | None = None
+
+    @property
+    def msg(self):
+        """The formatted message"""
+        return formalize_fmt_string(self.fmt_str) % self.args
+
+
 class LogParser(abc.ABC):
     """Abstract class of log parser"""
 
@@ -64,6 +166,50 @@ class LogParser(abc.ABC):
         self.data_types = DataTypes(self.database)
 
     @abc.abstractmethod
-    def parse_log_data(self, logdata, debug=False):
-        """Parse log data"""
-        return None
+    def decode_one_msg(self, logdata, offset):
+        """Decode the log message at offset in logdata.
+
+        Return a (record, next message offset) tuple, or (None, offset)
+        if the message is not complete in logdata."""
+        return None, offset
+
+    @abc.abstractmethod
+    def format_record(self, record):
+        """Return the text of a decoded log record, as printed"""
+        return ""
+
+    def decode_log_data(self, logdata, offset=0):
+        """Generate the records decoded from logdata, starting at offset,
+        until the end of the data or the first incomplete message"""
+        while offset < len(logdata):
+            record, offset = self.decode_one_msg(logdata, offset)
+            if record is None:
+                break
+
+            yield record
+
+    def parse_log_data(self, logdata, debug=False, sink=None):
+        """Parse binary log data and print the encoded log messages,
+        or write their records to sink.
+
+        Return the offset of the first byte not parsed."""
+        if sink is None:
+            # The sinks depend on this module
+            from .log_sinks import TextSink
+
+            sink = TextSink(sys.stdout, self)
+
+        offset = 0
+
+        try:
+            while offset < len(logdata):
+                record, offset = self.decode_one_msg(logdata, offset)
+                if record is None:
+                    break
+
+                sink.write(record)
+        finally:
+            # Messages decoded before an error are written too
+            sink.flush()
+
+        return offset
@@ -22,7 +22,12 @@ import colorama
 from colorama import Fore
 
 from .data_types import DataTypes
-from .log_parser import LogParser, formalize_fmt_string, get_log_level_str_color
+from .log_parser import (
+    LogParser,
+    LogRecord,
+    get_fmt_str_arg_types,
+    get_log_level_str_color,
+)
 
 HEX_BYTES_IN_LINE = 16
 
@@ -89,6 +94,15 @@ class LogParserV3(LogParser):
         else:
             self.fmt_msg_timestamp = endian + FMT_MSG_TIMESTAMP_32
 
+        self.msg_type_struct = struct.Struct(self.fmt_msg_type)
+        self.dropped_cnt_struct = struct.Struct(self.fmt_dropped_cnt)
+        self.msg_hdr_struct = struct.Struct(self.fmt_msg_hdr)
+        self.msg_timestamp_struct = struct.Struct(self.fmt_msg_timestamp)
+
+        self.full_msg_hdr_size = (
+            self.msg_type_struct.size + self.msg_hdr_struct.size + self.msg_timestamp_struct.size
+        )
+
     def __get_string(self, arg, arg_offset, string_tbl):
         one_str = self.database.find_string(arg)
         if one_str is not None:
@@ -109,98 +123,31 @@ class LogParserV3(LogParser):
         """Parse the format string to extract arguments from
         the binary arglist and return a tuple usable with
         Python's string formatting"""
-        idx = 0
         arg_offset = 0
-        arg_data_type = None
-        is_parsing = False
-        do_extract = False
 
         args = []
 
-        # Translated from cbvprintf_package()
-        for idx, fmt in enumerate(fmt_str):
-            if not is_parsing:
-                if fmt == '%':
-                    is_parsing = True
-                    arg_data_type = DataTypes.INT
-                    continue
-
-            elif fmt == '%':
-                # '%%' -> literal percentage sign
-                is_parsing = False
-                continue
-
-            elif fmt == '*':
-                pass
+        for arg_data_type, is_string in get_fmt_str_arg_types(fmt_str):
+            align = self.data_types.get_alignment(arg_data_type)
+            size = self.data_types.get_sizeof(arg_data_type)
+            unpack_struct = self.data_types.get_struct(arg_data_type)
 
-            elif fmt.isdecimal() or str.lower(fmt) == 'l' or fmt in (' ', '#', '-', '+', '.', 'h'):
-                # formatting modifiers, just ignore
-                continue
+            # Align the argument list by rounding up
+            stack_align = self.data_types.get_stack_alignment(arg_data_type)
+            if stack_align > 1:
+                arg_offset = (arg_offset + align - 1) // align * align
 
-            elif fmt in ('j', 'z', 't'):
-                # intmax_t, size_t or ptrdiff_t
-                arg_data_type = DataTypes.LONG
-
-            elif fmt in ('c', 'd', 'i', 'o', 'u', 'x', 'X'):
-                unsigned = fmt in ('c', 'o', 'u', 'x', 'X')
-
-                if fmt_str[idx - 1] == 'l':
-                    if fmt_str[idx - 2] == 'l':
-                        arg_data_type = DataTypes.ULONG_LONG if unsigned else DataTypes.LONG_LONG
-                    else:
-                        arg_data_type = DataTypes.ULONG if unsigned else DataTypes.LONG
-                else:
-                    arg_data_type = DataTypes.UINT if unsigned else DataTypes.INT
-
-                is_parsing = False
-                do_extract = True
-
-            elif fmt in ('s', 'p', 'n'):
-                arg_data_type = DataTypes.PTR
-
-                is_parsing = False
-                do_extract = True
-
-            elif str.lower(fmt) in ('a', 'e', 'f', 'g'):
-                # Python doesn't do"long double".
-                #
-                # Parse it as double (probably incorrect), but
-                # still have to skip enough bytes.
-                if fmt_str[idx - 1] == 'L':
-                    arg_data_type = DataTypes.LONG_DOUBLE
-                else:
-                    arg_data_type = DataTypes.DOUBLE
-
-                is_parsing = False
-                do_extract = True
-
-            else:
-                is_parsing = False
-                continue
+            one_arg = unpack_struct.unpack_from(arg_list, arg_offset)[0]
 
-            if do_extract:
-                do_extract = False
+            if is_string:
+                one_arg = self.__get_string(one_arg, arg_offset, string_tbl)
 
-                align = self.data_types.get_alignment(arg_data_type)
-                size = self.data_types.get_sizeof(arg_data_type)
-                unpack_fmt = self.data_types.get_formatter(arg_data_type)
+            args.append(one_arg)
+            arg_offset += size
 
-                # Align the argument list by rounding up
-                stack_align = self.data_types.get_stack_alignment(arg_data_type)
-                if stack_align > 1:
-                    arg_offset = int((arg_offset + (align - 1)) / align) * align
-
-                one_arg = struct.unpack_from(unpack_fmt, arg_list, arg_offset)[0]
-
-                if fmt == 's':
-                    one_arg = self.__get_string(one_arg, arg_offset, string_tbl)
-
-                args.append(one_arg)
-                arg_offset += size
-
-                # Align the offset
-                if stack_align > 1:
-                    arg_offset = int((arg_offset + align - 1) / align) * align
+            # Align the offset
+            if stack_align > 1:
+                arg_offset = (arg_offset + align - 1) // align * align
 
         return tuple(args)
 
@@ -229,61 +176,46 @@ class LogParserV3(LogParser):
         return tbl
 
     @staticmethod
-    def print_hexdump(hex_data, prefix_len, color):
-        """Print hex dump"""
-        hex_vals = ""
-        chr_vals = ""
-        chr_done = 0
-
-        for one_hex in hex_data:
-            hex_vals += f'{one_hex:02x} '
-            chr_vals += chr(one_hex)
-            chr_done += 1
-
-            if chr_done == HEX_BYTES_IN_LINE / 2:
-                hex_vals += " "
-                chr_vals += " "
-
-            elif chr_done == HEX_BYTES_IN_LINE:
-                print(f"{color}%s%s|%s{Fore.RESET}" % ((" " * prefix_len), hex_vals, chr_vals))
-                hex_vals = ""
-                chr_vals = ""
-                chr_done = 0
-
-        if len(chr_vals) > 0:
-            hex_padding = "   " * (HEX_BYTES_IN_LINE - chr_done)
-            print(
-                f"{color}%s%s%s|%s{Fore.RESET}"
-                % ((" " * prefix_len), hex_vals, hex_padding, chr_vals)
-            )
+    def format_hexdump(hex_data, prefix_len, color):
+        """Return the text of a hex dump"""
+        prefix = " " * prefix_len
+        lines = []
+
+        for idx in range(0, len(hex_data), HEX_BYTES_IN_LINE):
+            chunk = hex_data[idx : idx + HEX_BYTES_IN_LINE]
+            first = chunk[: HEX_BYTES_IN_LINE // 2]
+            second = chunk[HEX_BYTES_IN_LINE // 2 :]
+            sep = " " if len(first) == HEX_BYTES_IN_LINE // 2 else ""
+
+            hex_vals = "".join(f'{one_hex:02x} ' for one_hex in first) + sep
+            hex_vals += "".join(f'{one_hex:02x} ' for one_hex in second)
+            hex_padding = "   " * (HEX_BYTES_IN_LINE - len(chunk))
+            # Each byte is one character, as with chr()
+            chr_vals = first.decode("iso-8859-1") + sep + second.decode("iso-8859-1")
+
+            lines.append(f"{color}{prefix}{hex_vals}{hex_padding}|{chr_vals}{Fore.RESET}\n")
+
+        return "".join(lines)
 
     def get_full_msg_hdr_size(self):
         """Get the size of the full message header"""
-        return (
-            struct.calcsize(self.fmt_msg_type)
-            + struct.calcsize(self.fmt_msg_hdr)
-            + struct.calcsize(self.fmt_msg_timestamp)
-        )
+        return self.full_msg_hdr_size
 
     def get_normal_msg_size(self, logdata, offset):
         """Get the needed size of the normal log message at offset"""
-        _, pkg_len, data_len, _ = struct.unpack_from(
-            self.fmt_msg_hdr,
-            logdata,
-            offset + struct.calcsize(self.fmt_msg_type),
+        _, pkg_len, data_len, _ = self.msg_hdr_struct.unpack_from(
+            logdata, offset + self.msg_type_struct.size
         )
-        return self.get_full_msg_hdr_size() + pkg_len + data_len
+        return self.full_msg_hdr_size + pkg_len + data_len
 
-    def parse_one_normal_msg(self, logdata, offset):
-        """Parse one normal log message and print the encoded message"""
+    def decode_one_normal_msg(self, logdata, offset):
+        """Decode one normal log message and return its record, or None on error"""
         # Parse log message header
-        domain_lvl, pkg_len, data_len, source_id = struct.unpack_from(
-            self.fmt_msg_hdr, logdata, offset
-        )
-        offset += struct.calcsize(self.fmt_msg_hdr)
+        domain_lvl, pkg_len, data_len, source_id = self.msg_hdr_struct.unpack_from(logdata, offset)
+        offset += self.msg_hdr_struct.size
 
-        timestamp = struct.unpack_from(self.fmt_msg_timestamp, logdata, offset)[0]
-        offset += struct.calcsize(self.fmt_msg_timestamp)
+        timestamp = self.msg_timestamp_struct.unpack_from(logdata, offset)[0]
+        offset += self.msg_timestamp_struct.size
 
         # domain_id, level
         if self.is_big_endian:
@@ -293,29 +225,28 @@ class LogParserV3(LogParser):
             domain_id = domain_lvl & 0x0F
             level = (domain_lvl >> 4) & 0x0F
 
-        level_str, color = get_log_level_str_color(level)
         source_id_str = self.database.get_log_source_string(domain_id, source_id)
 
-        # Skip over data to point to next message (save as return value)
+        # Skip over data to point to next message
         next_msg_offset = offset + pkg_len + data_len
 
         # Offset from beginning of cbprintf_packaged data to end of va_list arguments
-        offset_end_of_args = struct.unpack_from("B", logdata, offset)[0]
+        offset_end_of_args = logdata[offset]
         offset_end_of_args *= self.data_types.get_sizeof(DataTypes.INT)
         offset_end_of_args += offset
 
         # Extra data after packaged log
-        extra_data = logdata[(offset + pkg_len) : next_msg_offset]
+        extra_data = bytes(logdata[(offset + pkg_len) : next_msg_offset])
 
         # Number of appended strings in package
-        num_packed_strings = struct.unpack_from("B", logdata, offset + 1)[0]
+        num_packed_strings = logdata[offset + 1]
 
         # Number of read-only string indexes
-        num_ro_str_indexes = struct.unpack_from("B", logdata, offset + 2)[0]
+        num_ro_str_indexes = logdata[offset + 2]
         offset_end_of_args += num_ro_str_indexes
 
         # Number of read-write string indexes
-        num_rw_str_indexes = struct.unpack_from("B", logdata, offset + 3)[0]
+        num_rw_str_indexes = logdata[offset + 3]
         offset_end_of_args += num_rw_str_indexes
 
         # Extract the string table in the packaged log message
@@ -334,9 +265,7 @@ class LogParserV3(LogParser):
         # the offset begins at 0 for va_list. However, the format string
         # itself is before the va_list, so need to go back the width of
         # a pointer.
-        fmt_str_ptr = struct.unpack_from(
-            self.data_types.get_formatter(DataTypes.PTR), logdata, offset
-        )[0]
+        fmt_str_ptr = self.data_types.get_struct(DataTypes.PTR).unpack_from(logdata, offset)[0]
         fmt_str = self.__get_string(
             fmt_str_ptr, -self.data_types.get_sizeof(DataTypes.PTR), string_tbl
         )
@@ -348,70 +277,71 @@ class LogParserV3(LogParser):
 
         args = self.process_one_fmt_str(fmt_str, logdata[offset:offset_end_of_args], string_tbl)
 
-        fmt_str = formalize_fmt_string(fmt_str)
-        log_msg = fmt_str % args
-
-        if level == 0:
-            print(f"{log_msg}", end='')
-            log_prefix = ""
-        else:
-            log_prefix = f"[{timestamp:>10}] <{level_str}> {source_id_str}: "
-            print(f"{color}%s%s{Fore.RESET}" % (log_prefix, log_msg))
-
-        if data_len > 0:
-            # Has hexdump data
-            self.print_hexdump(extra_data, len(log_prefix), color)
-
-        # Point to next message
-        return next_msg_offset
+        return LogRecord(
+            timestamp=timestamp,
+            domain_id=domain_id,
+            level=level,
+            source_id=source_id,
+            source=source_id_str,
+            fmt_str_ptr=fmt_str_ptr,
+            fmt_str=fmt_str,
+            args=args,
+            hexdump=extra_data,
+        )
 
-    def parse_one_msg(self, logdata, offset):
-        if offset + struct.calcsize(self.fmt_msg_type) > len(logdata):
-            return False, offset
+    def decode_one_msg(self, logdata, offset):
+        if offset + self.msg_type_struct.size > len(logdata):
+            return None, offset
 
         # Get message type
-        msg_type = struct.unpack_from(self.fmt_msg_type, logdata, offset)[0]
+        msg_type = self.msg_type_struct.unpack_from(logdata, offset)[0]
 
         if msg_type == MSG_TYPE_DROPPED:
-            if offset + struct.calcsize(self.fmt_dropped_cnt) > len(logdata):
-                return False, offset
+            if offset + self.msg_type_struct.size + self.dropped_cnt_struct.size > len(logdata):
+                return None, offset
 
-            offset += struct.calcsize(self.fmt_msg_type)
+            offset += self.msg_type_struct.size
 
-            num_dropped = struct.unpack_from(self.fmt_dropped_cnt, logdata, offset)[0]
-            offset += struct.calcsize(self.fmt_dropped_cnt)
+            num_dropped = self.dropped_cnt_struct.unpack_from(logdata, offset)[0]
+            offset += self.dropped_cnt_struct.size
 
-            print(f"--- {num_dropped} messages dropped ---")
+            return LogRecord(num_dropped=num_dropped), offset
 
-        elif msg_type == MSG_TYPE_NORMAL:
-            if (offset + self.get_full_msg_hdr_size() > len(logdata)) or (
-                offset + self.get_normal_msg_size(logdata, offset) > len(logdata)
-            ):
-                return False, offset
+        if msg_type == MSG_TYPE_NORMAL:
+            if offset + self.full_msg_hdr_size > len(logdata):
+                return None, offset
 
-            offset += struct.calcsize(self.fmt_msg_type)
+            next_msg_offset = offset + self.get_normal_msg_size(logdata, offset)
+            if next_msg_offset > len(logdata):
+                return None, offset
 
-            ret = self.parse_one_normal_msg(logdata, offset)
-            if ret is None:
+            record = self.decode_one_normal_msg(logdata, offset + self.msg_type_struct.size)
+            if record is None:
                 raise ValueError("Error parsing normal log message")
 
-            offset = ret
+            return record, next_msg_offset
 
-        else:
-            logger.error("------ Unknown message type: %s", msg_type)
-            raise ValueError(f"Unknown message type: {msg_type}")
+        logger.error("------ Unknown message type: %s", msg_type)
+        raise ValueError(f"Unknown message type: {msg_type}")
 
-        return True, offset
+    def format_record(self, record):
+        if record.num_dropped is not None:
+            return f"--- {record.num_dropped} messages dropped ---\n"
 
-    def parse_log_data(self, logdata, debug=False):
-        """Parse binary log data and print the encoded log messages"""
-        offset = 0
-        still_parsing = True
+        level_str, color = get_log_level_str_color(record.level)
 
-        while offset < len(logdata) and still_parsing:
-            still_parsing, offset = self.parse_one_msg(logdata, offset)
+        if record.level == 0:
+            text = record.msg
+            log_prefix = ""
+        else:
+            log_prefix = f"[{record.timestamp:>10}] <{level_str}> {record.source}: "
+            text = f"{color}{log_prefix}{record.msg}{Fore.RESET}\n"
+
+        if record.hexdump:
+            # Has hexdump data
+            text += self.format_hexdump(record.hexdump, len(log_prefix), color)
 
-        return offset
+        return text
 
 
 colorama.init()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+#
+# Copyright The Zephyr Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Sinks for the records decoded by the Dictionary-based Logging Parsers
+
+A sink writes the decoded records in one output format:
+
+- text: the messages as printed by the log parsers, see
+  LogParser.format_record()
+
+- jsonl: JSON Lines, one object per record, with the raw
+  format string and arguments of each message
+
+- columnar: a compact binary format, read back with
+  read_columnar_records()
+
+The columnar format starts with COLUMNAR_MAGIC, followed by
+blocks of records. Each block starts with a little-endian
+header of the number of records and the size of its JSON
+part, followed by these little-endian columns, with one
+value per record:
+
+- timestamp (uint64)
+- source ID (uint64)
+- format string address (uint64)
+- number of dropped messages (int64, -1 for normal messages)
+- index of the format string in the block strings (uint32)
+- index of the source name in the block strings (uint32)
+- hexdump length (uint32)
+- domain ID (uint8)
+- level (uint8)
+
+followed by the concatenated hexdumps, and by the JSON part:
+an object with the block strings in "strings", and the
+arguments of each record in "args".
+"""
+
+import abc
+import json
+import struct
+import sys
+
+from .log_parser import LogRecord
+
+COLUMNAR_MAGIC = b"ZLOGCOL1"
+
+COLUMNAR_BLOCK_HDR = struct.Struct("<II")
+
+# Column formats of the columnar format, in order
+COLUMNAR_COLUMNS = ("Q", "Q", "Q", "q", "I", "I", "I", "B", "B")
+
+
+class LogSink(abc.ABC):
+    """Abstract class of the destination of decoded log records"""
+
+    # Number of records buffered before being written out
+    BATCH_SIZE = 256
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    @abc.abstractmethod
+    def write(self, record):
+        """Write one decoded log record"""
+
+    def flush(self):
+        """Write out the buffered records"""
+        self.stream.flush()
+
+
+class TextSink(LogSink):
+    """Sink writing the messages as text, as printed by the log parsers"""
+
+    def __init__(self, stream, log_parser):
+        super().__init__(stream)
+        self.log_parser = log_parser
+        self.output = []
+
+    def write(self, record):
+        self.output.append(self.log_parser.format_record(record))
+        if len(self.output) >= self.BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        self.stream.write("".join(self.output))
+        self.output.clear()
+        super().flush()
+
+
+class JsonLinesSink(LogSink):
+    """Sink writing one JSON object per line for each record"""
+
+    def __init__(self, stream):
+        super().__init__(stream)
+        self.output = []
+
+    @staticmethod
+    def record_to_dict(record):
+        """Return the JSON object of a record"""
+        if record.num_dropped is not None:
+            return {"dropped": record.num_dropped}
+
+        return {
+            "timestamp": record.timestamp,
+            "domain": record.domain_id,
+            "level": record.level,
+            "source_id": record.source_id,
+            "source": record.source,
+            "fmt_id": record.fmt_str_ptr,
+            "fmt": record.fmt_str,
+            "args": record.args,
+            "hexdump": record.hexdump.hex(),
+        }
+
+    def write(self, record):
+        self.output.append(json.dumps(self.record_to_dict(record)))
+        if len(self.output) >= self.BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.output:
+            self.output.append("")
+            self.stream.write("\n".join(self.output))
+            self.output.clear()
+        super().flush()
+
+
+class ColumnarSink(LogSink):
+    """Sink writing the records in the columnar binary format,
+    to a binary stream"""
+
+    # Records are written in blocks this large
+    BATCH_SIZE = 4096
+
+    def __init__(self, stream):
+        super().__init__(stream)
+        self.records = []
+        self.stream.write(COLUMNAR_MAGIC)
+
+    def write(self, record):
+        self.records.append(record)
+        if len(self.records) >= self.BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.records:
+            self.stream.write(self.encode_block(self.records))
+            self.records.clear()
+        super().flush()
+
+    @staticmethod
+    def encode_block(records):
+        """Return one block of the columnar format with records"""
+        strings = {}
+
+        def string_idx(one_str):
+            return strings.setdefault(one_str, len(strings))
+
+        columns = [
+            [r.timestamp for r in records],
+            [r.source_id for r in records],
+            [r.fmt_str_ptr for r in records],
+            [-1 if r.num_dropped is None else r.num_dropped for r in records],
+            [string_idx(r.fmt_str) for r in records],
+            [string_idx(r.source) for r in records],
+            [len(r.hexdump) for r in records],
+            [r.domain_id for r in records],
+            [r.level for r in records],
+        ]
+
+        json_part = json.dumps(
+            {"strings": list(strings), "args": [r.args for r in records]}
+        ).encode()
+
+        num = len(records)
+        block = [COLUMNAR_BLOCK_HDR.pack(num, len(json_part))]
+        for fmt, values in zip(COLUMNAR_COLUMNS, columns, strict=True):
+            block.append(struct.pack(f"<{num}{fmt}", *values))
+        block.extend(r.hexdump for r in records)
+        block.append(json_part)
+
+        return b"".join(block)
+
+
+def read_columnar_records(stream):
+    """Generate the records of a file in the columnar format,
+    read from a binary stream"""
+    if stream.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError("Not a columnar log records file")
+
+    while True:
+        hdr = stream.read(COLUMNAR_BLOCK_HDR.size)
+        if not hdr:
+            return
+
+        num, json_size = COLUMNAR_BLOCK_HDR.unpack(hdr)
+
+        columns = []
+        for fmt in COLUMNAR_COLUMNS:
+            col_struct = struct.Struct(f"<{num}{fmt}")
+            columns.append(col_struct.unpack(stream.read(col_struct.size)))
+
+        (
+            timestamps,
+            source_ids,
+            fmt_ids,
+            dropped,
+            fmt_idxs,
+            source_idxs,
+            hexdump_lens,
+            domain_ids,
+            levels,
+        ) = columns
+
+        hexdumps = stream.read(sum(hexdump_lens))
+        json_part = json.loads(stream.read(json_size))
+        strings = json_part["strings"]
+
+        offset = 0
+        for idx in range(num):
+            hexdump = hexdumps[offset : offset + hexdump_lens[idx]]
+            offset += hexdump_lens[idx]
+
+            yield LogRecord(
+                timestamp=timestamps[idx],
+                domain_id=domain_ids[idx],
+                level=levels[idx],
+                source_id=source_ids[idx],
+                source=strings[source_idxs[idx]],
+                fmt_str_ptr=fmt_ids[idx],
+                fmt_str=strings[fmt_idxs[idx]],
+                args=tuple(json_part["args"][idx]),
+                hexdump=hexdump,
+                num_dropped=None if dropped[idx] < 0 else dropped[idx],
+            )
+
+
+SINK_FORMATS = ("text", "jsonl", "columnar")
+
+
+def get_sink(fmt, log_parser, stream=None):
+    """Return the sink writing the records in format fmt to stream,
+    or to stdout. Columnar sinks need a binary stream."""
+    if fmt == "text":
+        return TextSink(stream or sys.stdout, log_parser)
+
+    if fmt == "jsonl":
+        return JsonLinesSink(stream or sys.stdout)
+
+    if fmt == "columnar":
+        return ColumnarSink(stream or sys.stdout.buffer)
+
+    raise ValueError(f"Unknown output format: {fmt}")
@@ -9,20 +9,13 @@ Utilities for Dictionary-based Logging Parser
 """
 
 import binascii
+import bisect
 
 
 def convert_hex_file_to_bin(hexfile):
     """This converts a file in hexadecimal to binary"""
-    bin_data = b''
-
     with open(hexfile, encoding="iso-8859-1") as hfile:
-        for line in hfile.readlines():
-            hex_str = line.strip()
-
-            bin_str = binascii.unhexlify(hex_str)
-            bin_data += bin_str
-
-    return bin_data
+        return b''.join(binascii.unhexlify(line.strip()) for line in hfile)
 
 
 def extract_one_string_in_section(section, str_ptr):
@@ -34,19 +27,40 @@ def extract_one_string_in_section(section, str_ptr):
     if offset < 0 or offset >= max_offset:
         return None
 
-    ret_str = ""
+    end = data.find(b'\0', offset, max_offset)
+    if end < 0:
+        end = max_offset
 
-    while (offset < max_offset) and (data[offset] != 0):
-        ret_str += chr(data[offset])
-        offset += 1
+    # Each byte is one character, as with chr()
+    return data[offset:end].decode('iso-8859-1')
 
-    return ret_str
 
+def build_string_mappings_index(string_mappings):
+    """
+    Build an index of the string mapping list for find_string_in_mappings(),
+    to find strings containing a pointer without going through the whole
+    list. Return a (<addresses>, <max ends>) tuple, where the addresses of
+    the strings are sorted, and each max end is the highest end address of
+    the strings at this address or lower ones.
+    """
+    ptrs = sorted(string_mappings)
+    max_ends = []
+    max_end = 0
 
-def find_string_in_mappings(string_mappings, str_ptr):
+    for ptr in ptrs:
+        max_end = max(max_end, ptr + len(string_mappings[ptr]))
+        max_ends.append(max_end)
+
+    return ptrs, max_ends
+
+
+def find_string_in_mappings(string_mappings, str_ptr, index=None):
     """
     Find string pointed by string_ptr in the string mapping
     list. Return None if not found.
+
+    The index returned by build_string_mappings_index() for the
+    list can be passed to avoid building it again for each lookup.
     """
     if string_mappings is None:
         return None
@@ -58,10 +72,19 @@ def find_string_in_mappings(string_mappings, str_ptr):
         return string_mappings[str_ptr]
 
     # No direct match on pointer value.
-    # This may be a combined string. So check for that.
-    for ptr, string in string_mappings.items():
-        if ptr <= str_ptr < (ptr + len(string)):
-            whole_str = string_mappings[ptr]
+    # This may be a combined string. So check for that, from the
+    # closest string before the pointer, until no string before
+    # can reach it.
+    if index is None:
+        index = build_string_mappings_index(string_mappings)
+    ptrs, max_ends = index
+
+    idx = bisect.bisect_right(ptrs, str_ptr) - 1
+    while idx >= 0 and max_ends[idx] > str_ptr:
+        ptr = ptrs[idx]
+        whole_str = string_mappings[ptr]
+        if str_ptr < (ptr + len(whole_str)):
             return whole_str[str_ptr - ptr :]
+        idx -= 1
 
     return None
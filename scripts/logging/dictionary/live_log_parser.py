@@ -22,6 +22,7 @@ import time
 
 import parserlib
 import serial
+from dictionary_parser.log_sinks import SINK_FORMATS
 
 try:
     # Pylink is an optional dependency for RTT reading, which requires it's own installation.
@@ -33,6 +34,12 @@ except ImportError:
 LOGGER_FORMAT = "%(message)s"
 logger = logging.getLogger("parser")
 
+# Maximum number of bytes read from files at once
+READ_SIZE = 64 * 1024
+
+# Seconds between two reports of the decoding statistics
+STATS_INTERVAL = 10
+
 
 class SerialReader:
     """Class to read data from serial port and parse it"""
@@ -83,7 +90,7 @@ class FileReader:
         # Read available data using a reasonable buffer size (without buffer size, this blocks
         # forever, but with buffer size it returns even when less data than the buffer read was
         # available).
-        return self.file.read(1024)
+        return self.file.read(READ_SIZE)
 
 
 class JLinkRTTReader:
@@ -154,6 +161,20 @@ def parse_args():
 
     parser.add_argument("dbfile", help="Dictionary Logging Database file")
     parser.add_argument("--debug", action="store_true", help="Print extra debugging information")
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Periodically print the number of decoded and dropped messages, and the decoding rate",
+    )
+    parser.add_argument(
+        "--format",
+        choices=SINK_FORMATS,
+        default="text",
+        help="Output format of the decoded messages (default: text)",
+    )
+    parser.add_argument(
+        "--output", help="Write the decoded messages to this file instead of stdout"
+    )
     parser.add_argument(
         "--polling-interval",
         type=float,
@@ -206,8 +227,7 @@ def main():
         logger.setLevel(logging.INFO)
 
     log_parser = parserlib.get_log_parser(args.dbfile, logger)
-
-    data = b''
+    stream = parserlib.LogStream(log_parser)
 
     if args.mode == "serial":
         reader = SerialReader(args.port, args.baudrate)
@@ -220,15 +240,29 @@ def main():
     else:
         raise ValueError("Invalid mode selected. Use 'serial' or 'file'.")
 
-    with reader.open():
-        while True:
-            if hasattr(reader, 'fileno'):
-                _, _, _ = select.select([reader], [], [])
-            else:
-                time.sleep(args.polling_interval)
-            data += reader.read_non_blocking()
-            parsed_data_offset = parserlib.parser(data, log_parser, logger)
-            data = data[parsed_data_offset:]
+    next_stats = time.monotonic() + STATS_INTERVAL
+
+    with reader.open(), parserlib.open_sink(args.format, log_parser, args.output) as sink:
+        try:
+            while True:
+                if hasattr(reader, 'fileno'):
+                    _, _, _ = select.select([reader], [], [])
+                else:
+                    time.sleep(args.polling_interval)
+
+                # Write out all the messages decoded from the data at once
+                try:
+                    for record in stream.feed(reader.read_non_blocking()):
+                        sink.write(record)
+                finally:
+                    sink.flush()
+
+                if args.stats and time.monotonic() >= next_stats:
+                    logger.info("--- %s ---", stream.stats())
+                    next_stats = time.monotonic() + STATS_INTERVAL
+        finally:
+            if args.stats:
+                logger.info("--- %s ---", stream.stats())
 
 
 if __name__ == "__main__":
@@ -15,16 +15,20 @@ log data and print the log messages.
 import argparse
 import binascii
 import logging
+import re
 import sys
 
 import dictionary_parser
 import parserlib
+from dictionary_parser.log_sinks import SINK_FORMATS
 
 LOGGER_FORMAT = "%(message)s"
 logger = logging.getLogger("parser")
 
 LOG_HEX_SEP = "##ZLOGV1##"
 
+HEX_DIGITS_RE = re.compile(r"[0-9a-fA-F]*")
+
 
 def parse_args():
     """Parse command line arguments"""
@@ -39,6 +43,15 @@ def parse_args():
         "--rawhex", action="store_true", help="Log file only contains hexadecimal log data"
     )
     argparser.add_argument("--debug", action="store_true", help="Print extra debugging information")
+    argparser.add_argument(
+        "--format",
+        choices=SINK_FORMATS,
+        default="text",
+        help="Output format of the decoded messages (default: text)",
+    )
+    argparser.add_argument(
+        "--output", help="Write the decoded messages to this file instead of stdout"
+    )
 
     return argparser.parse_args()
 
@@ -56,11 +69,8 @@ def read_log_file(args):
             # Simply log file with only hexadecimal data
             logdata = dictionary_parser.utils.convert_hex_file_to_bin(args.logfile)
         else:
-            hexdata = ''
-
             with open(args.logfile, encoding="iso-8859-1") as hexfile:
-                for line in hexfile.readlines():
-                    hexdata += line.strip()
+                hexdata = ''.join(line.strip() for line in hexfile)
 
             if LOG_HEX_SEP not in hexdata:
                 logger.error("ERROR: Cannot find start of log data, exiting...")
@@ -74,20 +84,13 @@ def read_log_file(args):
                 idx = int(len(hexdata) / 2) * 2
                 hexdata = hexdata[:idx]
 
-            idx = 0
-            while idx < len(hexdata):
-                # When running QEMU via west or ninja, there may be additional
-                # strings printed by QEMU, west or ninja (for example, QEMU
-                # is terminated, or user interrupted, etc). So we need to
-                # figure out where the end of log data stream by
-                # trying to convert from hex to bin.
-                idx += 2
-
-                try:
-                    binascii.unhexlify(hexdata[:idx])
-                except binascii.Error:
-                    idx -= 2
-                    break
+            # When running QEMU via west or ninja, there may be additional
+            # strings printed by QEMU, west or ninja (for example, QEMU
+            # is terminated, or user interrupted, etc). So we need to
+            # figure out where the end of log data stream is, by
+            # finding the hexadecimal digits that can be converted
+            # from hex to bin.
+            idx = HEX_DIGITS_RE.match(hexdata).end() // 2 * 2
 
             logdata = binascii.unhexlify(hexdata[:idx])
     else:
@@ -128,7 +131,8 @@ def main():
         logger.error("ERROR: cannot read log from file: %s, exiting...", args.logfile)
         sys.exit(1)
 
-    parsed_data_offset = parserlib.parser(logdata, log_parser, logger)
+    with parserlib.open_sink(args.format, log_parser, args.output) as sink:
+        parsed_data_offset = parserlib.parser(logdata, log_parser, logger, sink)
     if parsed_data_offset != len(logdata):
         logger.error(
             'ERROR: Not all data was parsed, %d bytes left unparsed',
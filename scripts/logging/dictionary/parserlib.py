@@ -12,10 +12,14 @@ This library along with dictionary_parser converts the
 input binary data to the log using log database.
 """
 
+import contextlib
 import logging
+import time
 
+import colorama
 import dictionary_parser
 from dictionary_parser.log_database import LogDatabase
+from dictionary_parser.log_sinks import get_sink
 
 
 def get_log_parser(dbfile, logger):
@@ -44,8 +48,11 @@ def get_log_parser(dbfile, logger):
     return log_parser
 
 
-def parser(logdata, log_parser, logger):
-    """function of serial parser"""
+def parser(logdata, log_parser, logger, sink=None):
+    """function of serial parser
+
+    The decoded messages are printed, or their records written
+    to sink if given."""
 
     if not isinstance(logger, logging.Logger):
         raise ValueError("Invalid logger instance. Please configure the logger!")
@@ -54,5 +61,92 @@ def parser(logdata, log_parser, logger):
         logger.error("ERROR: cannot read log from file:  exiting...")
         raise ValueError("Cannot read log data.")
 
-    ret = log_parser.parse_log_data(logdata)
+    ret = log_parser.parse_log_data(logdata, sink=sink)
     return ret
+
+
+@contextlib.contextmanager
+def open_sink(fmt, log_parser, output=None):
+    """Context manager giving the sink writing the decoded records
+    in format fmt (one of log_sinks.SINK_FORMATS) to the output file,
+    or to stdout if None"""
+    if output is None:
+        sink = get_sink(fmt, log_parser)
+        try:
+            yield sink
+        finally:
+            sink.flush()
+        return
+
+    mode = "wb" if fmt == "columnar" else "w"
+    encoding = None if fmt == "columnar" else "utf-8"
+    with open(output, mode, encoding=encoding) as stream:
+        if fmt == "text":
+            # Colors are removed, as when stdout is redirected to a file
+            sink = get_sink(fmt, log_parser, colorama.AnsiToWin32(stream, strip=True).stream)
+        else:
+            sink = get_sink(fmt, log_parser, stream)
+        try:
+            yield sink
+        finally:
+            sink.flush()
+
+
+class LogStream:
+    """Decoder of log data received in chunks, e.g. from a serial port.
+
+    Incomplete messages at the end of a chunk are kept in a buffer
+    until the following chunks complete them."""
+
+    # Decoded data is only removed from the start of the buffer once it
+    # is this large, so that the buffer isn't copied for each chunk
+    COMPACT_SIZE = 64 * 1024
+
+    def __init__(self, log_parser):
+        self.log_parser = log_parser
+        self.buffer = bytearray()
+        self.offset = 0
+
+        self.msg_count = 0
+        self.dropped_count = 0
+        self.start_time = time.monotonic()
+
+    def feed(self, data):
+        """Add data to the stream, and return a generator of the records
+        of the messages it completes"""
+        if self.offset >= self.COMPACT_SIZE or self.offset == len(self.buffer):
+            del self.buffer[: self.offset]
+            self.offset = 0
+
+        self.buffer += data
+
+        return self._decode()
+
+    def _decode(self):
+        while self.offset < len(self.buffer):
+            record, self.offset = self.log_parser.decode_one_msg(self.buffer, self.offset)
+            if record is None:
+                break
+
+            if record.num_dropped is not None:
+                self.dropped_count += record.num_dropped
+            else:
+                self.msg_count += 1
+
+            yield record
+
+    def pending(self):
+        """Return the number of bytes of incomplete messages in the buffer"""
+        return len(self.buffer) - self.offset
+
+    def msgs_per_sec(self):
+        """Return the average number of messages decoded per second"""
+        elapsed = time.monotonic() - self.start_time
+        return self.msg_count / elapsed if elapsed > 0 else 0.0
+
+    def stats(self):
+        """Return a summary of the decoded and dropped messages"""
+        return (
+            f"{self.msg_count} messages decoded ({self.msgs_per_sec():.1f}/s), "
+            f"{self.dropped_count} dropped"
+        )
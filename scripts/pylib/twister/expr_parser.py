@@ -226,10 +226,9 @@ def ast_expr(ast, env, edt):
         return bool(re.match(ast[2], ast_sym(ast[1], env)))
     elif ast[0] == "dt_compat_enabled":
         compat = ast[1][0]
-        for node in edt.nodes:
-            if (node.matching_compat == compat or compat in node.compats) and node.status == "okay":
-                return True
-        return False
+        # Only the compatibles with enabled nodes are keys. Getting the nodes
+        # would unpickle the whole EDT from an EDTSnapshot.
+        return compat in edt.compat2okay
     elif ast[0] == "dt_alias_exists":
         alias = ast[1][0]
         for node in edt.nodes:
@@ -294,21 +293,87 @@ def ast_expr(ast, env, edt):
         return False
 
 
+def _compile_ast(ast):
+    """Turn an AST into a closure taking (env, edt), with the constant
+    operands of the comparisons converted once"""
+    op = ast[0]
+    if op == "not":
+        arg = _compile_ast(ast[1])
+        return lambda env, edt: not arg(env, edt)
+    elif op == "or":
+        left, right = _compile_ast(ast[1]), _compile_ast(ast[2])
+        return lambda env, edt: left(env, edt) or right(env, edt)
+    elif op == "and":
+        left, right = _compile_ast(ast[1]), _compile_ast(ast[2])
+        return lambda env, edt: left(env, edt) and right(env, edt)
+    elif op in ("==", "!=", "in", "exists", ":"):
+        sym, value = ast[1], ast[2] if len(ast) > 2 else None
+        if op == "==":
+            return lambda env, edt: ast_sym(sym, env) == value
+        elif op == "!=":
+            return lambda env, edt: ast_sym(sym, env) != value
+        elif op == "in":
+            return lambda env, edt: ast_sym(sym, env) in value
+        elif op == "exists":
+            return lambda env, edt: bool(ast_sym(sym, env))
+        regex = re.compile(value)
+        return lambda env, edt: bool(regex.match(ast_sym(sym, env)))
+    elif op in (">", "<", ">=", "<="):
+        sym = ast[1]
+        try:
+            value = int(ast[2])
+        except ValueError:
+            # Only fail if the comparison actually gets evaluated
+            return lambda env, edt: ast_expr(ast, env, edt)
+        if op == ">":
+            return lambda env, edt: ast_sym_int(sym, env) > value
+        elif op == "<":
+            return lambda env, edt: ast_sym_int(sym, env) < value
+        elif op == ">=":
+            return lambda env, edt: ast_sym_int(sym, env) >= value
+        return lambda env, edt: ast_sym_int(sym, env) <= value
+
+    # Devicetree functions walk the EDT, there is nothing to precompute
+    return lambda env, edt: ast_expr(ast, env, edt)
+
+
 mutex = threading.Lock()
 
+# Expression text -> compiled expression
+_compiled = {}
+
+def compile_expr(expr_text):
+    """Return a function evaluating the given expression against an
+    environment and an EDT.
+
+    Expressions are parsed only once per process: the same filter is
+    usually evaluated for many platforms."""
+    func = _compiled.get(expr_text)
+    if func is not None:
+        return func
+
+    # Like it's C counterpart, state machine is not thread-safe
+    with mutex:
+        func = _compiled.get(expr_text)
+        if func is None:
+            func = _compile_ast(parser.parse(expr_text))
+            _compiled[expr_text] = func
+    return func
+
 def parse(expr_text, env, edt):
     """Given a text representation of an expression in our language,
     use the provided environment to determine whether the expression
     is true or false"""
 
-    # Like it's C counterpart, state machine is not thread-safe
-    mutex.acquire()
-    try:
-        ast = parser.parse(expr_text)
-    finally:
-        mutex.release()
+    return compile_expr(expr_text)(env, edt)
+
+def parse_many(expr_text, envs_and_edts):
+    """Evaluate one expression against many (environment, EDT) pairs,
+    e.g. the filter data of several platforms. Returns the list of
+    results, in order."""
 
-    return ast_expr(ast, env, edt)
+    func = compile_expr(expr_text)
+    return [func(env, edt) for env, edt in envs_and_edts]
 
 # Just some test code
 if __name__ == "__main__":
@@ -3,15 +3,18 @@
 # Copyright (c) 2018-2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import array
 import collections
 import contextlib
 import filecmp
 import glob
+import json
 import logging
 import os
 import pathlib
 import re
 import shutil
+import struct
 import subprocess
 import sys
 import tempfile
@@ -24,10 +27,123 @@ supported_coverage_formats = {
 }
 
 
+class GcdaError(Exception):
+    """ Raised for gcda files which can't be merged in-process
+    """
+
+
+class GcdaFile:
+    """ In-memory gcda file, as written by the Zephyr gcov support
+    (subsys/testsuite/coverage), with its arc counters.
+
+    The files of one object dumped by different runs of the same image have
+    the same records, only the values of their counters differ. They are
+    merged by summing their arc counters, like 'gcov-tool merge' does.
+    Files with other kinds of counters or records which differ can't be
+    merged this way, and GcdaError is raised for them.
+    """
+
+    MAGIC = b'gcda'
+    TAG_FUNCTION = 0x01000000
+    TAG_COUNTER_BASE = 0x01a10000
+    TAG_COUNTER_ARCS = TAG_COUNTER_BASE
+    COUNTER_MASK = (1 << 64) - 1
+
+    def __init__(self, data):
+        # Words are written in the byte order of the target
+        if data[:4] == self.MAGIC[::-1]:
+            self.byteorder = 'little'
+        elif data[:4] == self.MAGIC:
+            self.byteorder = 'big'
+        else:
+            raise GcdaError("not a gcda file")
+        self._record = struct.Struct(('<' if self.byteorder == 'little' else '>') + 'II')
+
+        if len(data) < 12:
+            raise GcdaError("truncated header")
+        # The version is the GCC version as 4 characters, e.g. 'B23*' for
+        # 12.3: since GCC 12, the header has an object checksum, and the
+        # length of the records is in bytes instead of words.
+        version = data[4:8] if self.byteorder == 'big' else data[7:3:-1]
+        major = (version[0] - ord('A')) * 10 + version[1] - ord('0')
+        self.length_unit = 1 if major >= 12 else 4
+        header_size = 16 if major >= 12 else 12
+
+        self.header = bytes(data[:header_size])
+        # (tag, length, payload) of each record, with the payload of the
+        # arc counters as an array of the counter values
+        self.records = []
+        self.trailer = b''
+        pos = header_size
+        while pos < len(data):
+            if pos + self._record.size > len(data):
+                # libgcov ends the files with a zero word
+                self.trailer = bytes(data[pos:])
+                if self.trailer != bytes(4):
+                    raise GcdaError("truncated record")
+                break
+            tag, length = self._record.unpack_from(data, pos)
+            pos += self._record.size
+            size = length * self.length_unit
+            payload = data[pos:pos + size]
+            if len(payload) != size:
+                raise GcdaError(f"truncated record {tag:#010x}")
+            pos += size
+
+            if tag == self.TAG_COUNTER_ARCS:
+                payload = array.array('Q', payload)
+                if self.byteorder != sys.byteorder:
+                    payload.byteswap()
+            elif tag != self.TAG_FUNCTION and tag >> 24 == self.TAG_FUNCTION >> 24:
+                # Other counters, e.g. value profiles, aren't summed
+                raise GcdaError(f"unsupported counters {tag:#010x}")
+            else:
+                payload = bytes(payload)
+            self.records.append((tag, length, payload))
+
+    def merge(self, other):
+        """ Add the counters of other, a gcda file of the same object
+        """
+        if other.header != self.header or other.trailer != self.trailer or \
+                len(other.records) != len(self.records):
+            raise GcdaError("gcda files of different objects")
+
+        for idx, (tag, length, payload) in enumerate(self.records):
+            other_tag, other_length, other_payload = other.records[idx]
+            if other_tag != tag or other_length != length:
+                raise GcdaError("gcda files of different objects")
+            if tag == self.TAG_COUNTER_ARCS:
+                mask = self.COUNTER_MASK
+                self.records[idx] = (tag, length, array.array(
+                    'Q', [(a + b) & mask for a, b in zip(payload, other_payload, strict=True)]
+                ))
+            elif other_payload != payload:
+                raise GcdaError(f"gcda files with different records {tag:#010x}")
+
+    def to_bytes(self):
+        """ Return the contents of the gcda file
+        """
+        data = [self.header]
+        for tag, length, payload in self.records:
+            data.append(self._record.pack(tag, length))
+            if isinstance(payload, array.array):
+                if self.byteorder != sys.byteorder:
+                    payload = array.array('Q', payload)
+                    payload.byteswap()
+                payload = payload.tobytes()
+            data.append(payload)
+        data.append(self.trailer)
+        return b''.join(data)
+
+
 class CoverageTool:
     """ Base class for every supported coverage tool
     """
 
+    # Saved next to the captured handler logs, with the gcda files
+    # created from them
+    CAPTURE_CACHE = "gcov_capture.json"
+
     def __init__(self):
         self.gcov_tool = None
         self.base_dir = None
@@ -57,12 +173,12 @@ class CoverageTool:
         capture_data = False
         capture_complete = False
         with open(input_file) as fp:
-            for line in fp.readlines():
-                if re.search("GCOV_COVERAGE_DUMP_START", line):
+            for line in fp:
+                if "GCOV_COVERAGE_DUMP_START" in line:
                     capture_data = True
                     capture_complete = False
                     continue
-                if re.search("GCOV_COVERAGE_DUMP_END", line):
+                if "GCOV_COVERAGE_DUMP_END" in line:
                     capture_complete = True
                     # Keep searching for additional dumps
                 # Loop until the coverage data is found.
@@ -90,6 +206,16 @@ class CoverageTool:
         if len(hexdumps) == 1:
             return hexdumps[0]
 
+        # Sum the counters in-process when possible, it is much faster than
+        # running gcov-tool for each pair of hexdumps
+        try:
+            merged = GcdaFile(hexdumps[0])
+            for dump in hexdumps[1:]:
+                merged.merge(GcdaFile(dump))
+            return merged.to_bytes()
+        except GcdaError as e:
+            logger.debug(f"Merging {len(hexdumps)} hexdumps with gcov-tool: {e}")
+
         with tempfile.TemporaryDirectory() as dir:
             # Write each hexdump to a dedicated temporary folder
             dirs = []
@@ -134,9 +260,47 @@ class CoverageTool:
                 gcda_created = False
         return gcda_created
 
+    @staticmethod
+    def _file_signature(filename):
+        st = os.stat(filename)
+        return [st.st_size, st.st_mtime_ns]
+
+    def _is_captured(self, filename):
+        # Whether the gcda files of the log were created by a previous
+        # capture, and neither the log nor the files changed since then
+        cache_file = os.path.join(os.path.dirname(filename), self.CAPTURE_CACHE)
+        try:
+            with open(cache_file) as fp:
+                cache = json.load(fp)
+            return cache['log'] == self._file_signature(filename) and all(
+                self._file_signature(gcda) == signature
+                for gcda, signature in cache['gcda'].items()
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return False
+
+    def _save_captured(self, filename, extracted_coverage_info):
+        cache_file = os.path.join(os.path.dirname(filename), self.CAPTURE_CACHE)
+        try:
+            cache = {
+                'log': self._file_signature(filename),
+                'gcda': {
+                    gcda: self._file_signature(gcda)
+                    for gcda in extracted_coverage_info
+                    if "kobject_hash" not in gcda
+                },
+            }
+            with open(cache_file, 'w') as fp:
+                json.dump(cache, fp)
+        except OSError as e:
+            logger.debug(f"Unable to save the gcov capture of {filename}: {e}")
+
     def capture_data(self, outdir):
         coverage_completed = True
         for filename in glob.glob(f"{outdir}/**/handler.log", recursive=True):
+            if self._is_captured(filename):
+                logger.debug(f"Gcov data already captured: {filename}")
+                continue
             gcov_data = self.__class__.retrieve_gcov_data(filename)
             capture_complete = gcov_data['complete']
             extracted_coverage_info = gcov_data['data']
@@ -144,6 +308,7 @@ class CoverageTool:
                 gcda_created = self.create_gcda_files(extracted_coverage_info)
                 if gcda_created:
                     logger.debug(f"Gcov data captured: {filename}")
+                    self._save_captured(filename, extracted_coverage_info)
                 else:
                     logger.error(f"Gcov data invalid for: {filename}")
                     coverage_completed = False
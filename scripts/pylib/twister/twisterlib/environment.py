@@ -457,6 +457,15 @@ structure in the main Zephyr tree: boards/<vendor>/<board_name>/""")
                 If not provided, seed in generated by system.
                 Used only when --shuffle-tests is provided.""")
 
+    parser.add_argument(
+        "--durations-from", action="append", metavar="FILENAME", default=[],
+        help="Load the build and execution times of test configurations from "
+             "a report of a previous run ('twister.json' schema). Longest "
+             "configurations are then scheduled first and --subset shards are "
+             "balanced by predicted duration instead of number of configurations. "
+             "May be called multiple times, durations found in several reports "
+             "are averaged.")
+
     parser.add_argument(
         "-c", "--clobber-output", action="store_true",
         help="Cleaning the output directory will simply delete it instead "
@@ -707,6 +716,40 @@ structure in the main Zephyr tree: boards/<vendor>/<board_name>/""")
              "including those that are filtered based on testsuite definition."
         )
 
+    parser.add_argument(
+        "--filter-cache-dir",
+        metavar="DIR",
+        help="Directory where the devicetree and Kconfig outputs of the filter stage "
+             "are cached, to be reused by test configurations sharing the same board, "
+             "configuration files and overlays. Defaults to 'filter_cache' in the "
+             "output directory; point it to a persistent location to also reuse "
+             "the outputs across runs.")
+
+    parser.add_argument(
+        "--no-filter-cache", action="store_true",
+        help="Always run the filter stage, instead of reusing cached outputs of "
+             "an identical configuration.")
+
+    parser.add_argument(
+        "--configure-server", action="store_true",
+        help="Run the Python scripts of the CMake configure stage from a "
+             "persistent server process, which has their modules imported "
+             "already (see scripts/build/configure_server.py). Same as setting "
+             "ZEPHYR_CONFIGURE_SERVER in the environment.")
+
+    parser.add_argument(
+        "--testsuite-index",
+        metavar="FILE",
+        help="File where the parsed test suite configurations and the test cases "
+             "found in their sources are saved, to be reused by the next "
+             "invocations for the files which did not change. Defaults to a file "
+             "in the Zephyr user cache directory.")
+
+    parser.add_argument(
+        "--no-testsuite-index", action="store_true",
+        help="Always parse all test suite configurations and sources, without "
+             "using or updating the testsuite index.")
+
     parser.add_argument(
         "-O", "--outdir",
         default=os.path.join(os.getcwd(), "twister-out"),
@@ -0,0 +1,242 @@
+# Copyright The Zephyr Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+"""Cache of the devicetree and Kconfig outputs of the CMake filter stage.
+
+Test suites whose filter only depends on devicetree and Kconfig go through
+the CMake package helper before being configured for real. Many test
+instances share the same board, configuration files and overlays and so get
+identical outputs from it. This cache lets such instances reuse the outputs
+generated for the first of them, from any worker process and across runs.
+
+Entries are looked up by a key computed from the inputs given to CMake: the
+command line with instance-specific paths removed, the content of the
+configuration files of the application and of the files named on the command
+line, the relevant environment variables and the devicetree/Kconfig scripts.
+Each entry also records the files which were read while generating it (from
+the devicetree dependency file, the lists of parsed Kconfig files and of
+merged configuration files, and the bindings directories) and is only reused
+while none of them changed. The configuration files merged from outside the
+application, like the board defconfig and the shield and snippet fragments,
+are only known once CMake ran and so are only checked this way.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+from twisterlib.environment import ZEPHYR_BASE, canonical_zephyr_base
+
+sys.path.insert(0, os.path.join(ZEPHYR_BASE, "scripts", "dts", "python-devicetree", "src"))
+from devicetree import edtlib
+
+logger = logging.getLogger('twister')
+
+# Outputs of the package helper read back by FilterBuilder.parse_generated()
+CACHED_OUTPUTS = [
+    os.path.join('zephyr', '.config'),
+    os.path.join('zephyr', 'edt.pickle'),
+]
+
+# Application files which can change the devicetree or Kconfig output
+APP_CONFIG_SUFFIXES = (
+    '.conf',
+    '.overlay',
+    '.dts',
+    '.dtsi',
+    '.yaml',
+    '.yml',
+    '.cmake',
+    '.defconfig',
+)
+
+# Lists of the Kconfig files and configuration files read by Kconfig
+KCONFIG_INPUT_LISTS = [
+    os.path.join('zephyr', 'kconfig', 'sources.txt'),
+    os.path.join('zephyr', 'kconfig', 'inputs.txt'),
+]
+
+# Environment variables which can change the devicetree or Kconfig output
+ENV_PREFIXES = ('ZEPHYR_', 'BOARD', 'SOC', 'ARCH', 'DTS', 'DTC', 'KCONFIG', 'SNIPPET', 'TOOLCHAIN')
+
+# Scripts and CMake modules producing the cached outputs
+TOOL_DIRS = [
+    os.path.join('cmake', 'modules'),
+    os.path.join('scripts', 'dts'),
+    os.path.join('scripts', 'dts', 'python-devicetree', 'src', 'devicetree'),
+    os.path.join('scripts', 'kconfig'),
+]
+
+
+def _hash_file(hasher, path):
+    try:
+        with open(path, 'rb') as f:
+            hasher.update(hashlib.sha256(f.read()).digest())
+    except OSError:
+        hasher.update(b'<missing>')
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _stat_tree(path):
+    """Signature of a directory tree, from the stats of all its entries."""
+    hasher = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in [root] + sorted(os.path.join(root, f) for f in files):
+            hasher.update(f'{name}:{_stat(name)}'.encode())
+    return hasher.hexdigest()
+
+
+def _parse_depfile(path):
+    """Return the dependencies listed in a Makefile-style dependency file."""
+    try:
+        with open(path) as f:
+            content = f.read()
+    except OSError:
+        return []
+    _, _, deps = content.replace('\\\n', ' ').partition(': ')
+    return [dep for dep in deps.split() if not dep.endswith(':')]
+
+
+class FilterCache:
+    """On-disk cache of the package helper outputs, see the module documentation."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self._tools_signature = None
+        self._tree_signatures = {}
+
+    def key(self, cmd, source_dir, build_dir):
+        """Compute the cache key of a package helper invocation."""
+        hasher = hashlib.sha256()
+        hasher.update(self._get_tools_signature().encode())
+
+        for arg in cmd:
+            if arg.startswith(('-B', '-DTC_RUNID=', '-DTC_NAME=')):
+                continue
+            # Files named on the command line are hashed by content, so that
+            # per-instance copies of identical files give the same key.
+            for value in arg.partition('=')[2].strip('"').replace(';', ' ').split():
+                path = os.path.join(source_dir, value)
+                if os.path.isfile(path):
+                    _hash_file(hasher, path)
+            arg = arg.replace(build_dir, '<build>').replace(source_dir, '<app>')
+            hasher.update(arg.encode() + b'\0')
+
+        for root, dirs, files in os.walk(source_dir):
+            dirs.sort()
+            for name in sorted(files):
+                if name.startswith('Kconfig') or name.endswith(APP_CONFIG_SUFFIXES):
+                    path = os.path.join(root, name)
+                    hasher.update(os.path.relpath(path, source_dir).encode())
+                    _hash_file(hasher, path)
+
+        for name, value in sorted(os.environ.items()):
+            if name.startswith(ENV_PREFIXES):
+                hasher.update(f'{name}={value}\0'.encode())
+
+        return hasher.hexdigest()
+
+    def restore(self, key, build_dir):
+        """Copy the outputs of a cache entry to build_dir.
+
+        Returns True on a cache hit.
+        """
+        entry = self._entry_dir(key)
+        try:
+            with open(os.path.join(entry, 'manifest.json')) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        for path, stat in manifest['files'].items():
+            if _stat(path) != stat:
+                logger.debug(f"Filter cache entry {key} is stale: {path} changed")
+                return False
+        for path, signature in manifest['trees'].items():
+            if self._get_tree_signature(path) != signature:
+                logger.debug(f"Filter cache entry {key} is stale: {path} changed")
+                return False
+
+        for output in manifest['outputs']:
+            dst = os.path.join(build_dir, output)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            shutil.copyfile(os.path.join(entry, output), dst)
+        return True
+
+    def store(self, key, build_dir):
+        """Save the outputs found in build_dir in a new cache entry."""
+        outputs = [o for o in CACHED_OUTPUTS if os.path.exists(os.path.join(build_dir, o))]
+        deps = _parse_depfile(os.path.join(build_dir, 'zephyr', 'zephyr.dts.d'))
+        for input_list in KCONFIG_INPUT_LISTS:
+            try:
+                with open(os.path.join(build_dir, input_list)) as f:
+                    deps.extend(line.strip() for line in f if line.strip())
+            except OSError:
+                pass
+
+        trees = []
+        edt_pickle = os.path.join(build_dir, 'zephyr', 'edt.pickle')
+        if os.path.exists(edt_pickle):
+            trees = getattr(edtlib.EDTSnapshot(edt_pickle), 'bindings_dirs', [])
+
+        manifest = {
+            'outputs': outputs,
+            'files': {dep: _stat(dep) for dep in deps},
+            'trees': {tree: self._get_tree_signature(tree) for tree in trees},
+        }
+
+        entry = self._entry_dir(key)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(entry))
+        try:
+            for output in outputs:
+                dst = os.path.join(tmp_dir, output)
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                shutil.copyfile(os.path.join(build_dir, output), dst)
+            with open(os.path.join(tmp_dir, 'manifest.json'), 'w') as f:
+                json.dump(manifest, f)
+            if os.path.exists(entry):
+                # Replace a stale entry
+                shutil.rmtree(entry, ignore_errors=True)
+            os.rename(tmp_dir, entry)
+        except OSError as e:
+            # Another worker stored the same entry in the meantime
+            logger.debug(f"Could not store filter cache entry {key}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _get_tools_signature(self):
+        if self._tools_signature is None:
+            hasher = hashlib.sha256(canonical_zephyr_base.encode())
+            for tool_dir in TOOL_DIRS:
+                tool_dir = os.path.join(canonical_zephyr_base, tool_dir)
+                try:
+                    names = sorted(os.listdir(tool_dir))
+                except OSError:
+                    continue
+                for name in names:
+                    path = os.path.join(tool_dir, name)
+                    hasher.update(f'{path}:{_stat(path)}'.encode())
+            self._tools_signature = hasher.hexdigest()
+        return self._tools_signature
+
+    def _get_tree_signature(self, path):
+        # Bindings directories do not change during a run, compute their
+        # signature only once per process.
+        if path not in self._tree_signatures:
+            self._tree_signatures[path] = _stat_tree(path)
+        return self._tree_signatures[path]
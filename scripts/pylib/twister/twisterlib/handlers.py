@@ -8,6 +8,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import argparse
+import codecs
 import contextlib
 import csv
 import logging
@@ -73,6 +74,48 @@ def terminate_process(proc):
     proc.kill()
 
 
+class ConsoleReader:
+    """Splits the console output of a test into lines
+
+    The output is fed in chunks of up to READ_SIZE bytes as they are read,
+    decoded incrementally so that characters split between chunks are kept
+    whole, and split into lines ending with a newline. The amount of output
+    is counted for the instance metrics.
+    """
+
+    READ_SIZE = 64 * 1024
+
+    def __init__(self, errors: str = "strict"):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors)
+        self._partial = ""
+        self.bytes_read = 0
+        self.lines_read = 0
+
+    def feed(self, data: bytes) -> list[str]:
+        """Return the lines completed by data, with their newline. Raises
+        UnicodeDecodeError for invalid output with the "strict" errors."""
+        self.bytes_read += len(data)
+        text = self._partial + self._decoder.decode(data)
+        end = text.rfind("\n") + 1
+        self._partial = text[end:]
+        if not end:
+            return []
+
+        lines = [line + "\n" for line in text[:end - 1].split("\n")]
+        self.lines_read += len(lines)
+        return lines
+
+    def finish(self) -> list[str]:
+        """Return the last line of the output, which has no newline, if any"""
+        text = self._partial + self._decoder.decode(b"", final=True)
+        self._partial = ""
+        if not text:
+            return []
+
+        self.lines_read += 1
+        return [text]
+
+
 class Handler:
     class FailureType(Enum):
         TIMEOUT = "Timeout"
@@ -108,6 +151,7 @@ class Handler:
         self.args = []
         self.terminated = False
         self.duts: list[DUT] = []
+        self.console: ConsoleReader | None = None
 
     def get_test_timeout(self):
         return math.ceil(self.instance.testsuite.timeout *
@@ -189,8 +233,18 @@ class Handler:
             build_dir = self.build_dir
         return build_dir
 
+    def _update_console_metrics(self):
+        if self.console is None or self.execution_time <= 0:
+            return
+
+        self.instance.metrics["console_bytes_per_sec"] = round(
+            self.console.bytes_read / self.execution_time)
+        self.instance.metrics["console_lines_per_sec"] = round(
+            self.console.lines_read / self.execution_time, 1)
+
     def _update_instance_info(self, harness, failure_type=FailureType.NONE):
         self.instance.execution_time = self.execution_time
+        self._update_console_metrics()
         if (not self.terminated and self.returncode != 0 and not self.ignore_crash) or \
             harness.status == TwisterStatus.NONE:
 
@@ -239,7 +293,6 @@ class BinaryHandler(Handler):
 
         self.seed = None
         self.extra_test_args = None
-        self.line = b""
         self.binary: str | None = None
 
     def try_kill_process_by_pid(self):
@@ -251,30 +304,52 @@ class BinaryHandler(Handler):
             with contextlib.suppress(ProcessLookupError, psutil.NoSuchProcess):
                 os.kill(pid, signal.SIGKILL)
 
-    def _output_reader(self, proc):
-        self.line = proc.stdout.readline()
+    @staticmethod
+    def _output_reader(proc, chunks):
+        # Queues the output of the process as it is read, until the
+        # empty chunk at the end of file
+        while True:
+            data = proc.stdout.read1(ConsoleReader.READ_SIZE)
+            chunks.put(data)
+            if not data:
+                break
 
     def _output_handler(self, proc, harness):
         suffix = '\\r\\n'
 
+        self.console = console = ConsoleReader(errors="replace")
+        chunks = Queue()
+        reader_t = threading.Thread(target=self._output_reader, args=(proc, chunks), daemon=True)
+        reader_t.start()
+
         with open(self.log, "w") as log_out_fp:
             timeout_extended = False
             timeout_time = time.time() + self.get_test_timeout()
-            while True:
+            eof = False
+            while not eof:
                 this_timeout = timeout_time - time.time()
                 if this_timeout < 0:
                     break
-                reader_t = threading.Thread(target=self._output_reader, args=(proc,), daemon=True)
-                reader_t.start()
-                reader_t.join(this_timeout)
-                if not reader_t.is_alive() and self.line != b"":
-                    line_decoded = self.line.decode('utf-8', "replace")
+                try:
+                    data = chunks.get(timeout=this_timeout)
+                except Empty:
+                    break
+
+                if data:
+                    lines = console.feed(data)
+                else:
+                    lines = console.finish()
+                    eof = True
+                if not lines:
+                    continue
+
+                log_out_fp.write(strip_ansi_sequences("".join(lines)))
+                log_out_fp.flush()
+                for line_decoded in lines:
                     stripped_line = line_decoded.rstrip()
                     if stripped_line.endswith(suffix):
                         stripped_line = stripped_line[:-len(suffix)].rstrip()
                     logger.debug(f"OUTPUT: {stripped_line}")
-                    log_out_fp.write(strip_ansi_sequences(line_decoded))
-                    log_out_fp.flush()
                     harness.handle(stripped_line)
                     if (
                         harness.status != TwisterStatus.NONE
@@ -286,9 +361,6 @@ class BinaryHandler(Handler):
                             timeout_time = time.time() + 30
                         else:
                             timeout_time = time.time() + 2
-                else:
-                    reader_t.join(0)
-                    break
             try:
                 # POSIX arch based ztests end on their own,
                 # so let's give it up to 100ms to do so
@@ -453,6 +525,7 @@ class DeviceHandler(Handler):
         # Clear serial leftover.
         ser.reset_input_buffer()
 
+        self.console = console = ConsoleReader(errors="ignore")
         with open(self.log, "wb") as log_out_fp:
             while ser.isOpen():
                 if halt_event.is_set():
@@ -461,7 +534,8 @@ class DeviceHandler(Handler):
                     break
 
                 try:
-                    if not ser.in_waiting:
+                    in_waiting = ser.in_waiting
+                    if not in_waiting:
                         # no incoming bytes are waiting to be read from
                         # the serial input buffer, let other threads run
                         time.sleep(0.001)
@@ -479,18 +553,18 @@ class DeviceHandler(Handler):
                     logger.debug("Serial port is already closed, stop reading.")
                     break
 
-                serial_line = None
+                serial_data = None
                 # SerialException may happen during the serial device power off/on process.
                 with contextlib.suppress(TypeError, serial.SerialException):
-                    serial_line = ser.readline()
+                    serial_data = ser.read(min(in_waiting, ConsoleReader.READ_SIZE))
 
                 # Just because ser_fileno has data doesn't mean an entire line
-                # is available yet.
-                if serial_line:
-                    # can be more lines in serial_line so split them before handling
-                    for sl in serial_line.decode('utf-8', 'ignore').splitlines(keepends=True):
-                        log_out_fp.write(strip_ansi_sequences(sl).encode('utf-8'))
-                        log_out_fp.flush()
+                # is available yet, the reader keeps the rest for later.
+                lines = console.feed(serial_data) if serial_data else []
+                if lines:
+                    log_out_fp.write(strip_ansi_sequences("".join(lines)).encode('utf-8'))
+                    log_out_fp.flush()
+                    for sl in lines:
                         if sl := sl.strip():
                             logger.debug(f"DEVICE: {sl}")
                             harness.handle(sl)
@@ -499,6 +573,10 @@ class DeviceHandler(Handler):
                     ser.close()
                     break
 
+            # Keep the last line in the log, even without its newline
+            if lines := console.finish():
+                log_out_fp.write(strip_ansi_sequences(lines[0]).encode('utf-8'))
+
     @staticmethod
     @contextmanager
     def acquire_dut_locks(duts):
@@ -1017,7 +1095,7 @@ class QEMUHandler(Handler):
             _status = TwisterStatus.NONE
             _reason = None
 
-            line = ""
+            handler.console = console = ConsoleReader()
             timeout_extended = False
 
             pid = 0
@@ -1056,51 +1134,53 @@ class QEMUHandler(Handler):
                     with open(pid_fn) as pid_file:
                         pid = int(pid_file.read())
 
+                # Read whatever QEMU has written, the pipe is unbuffered
+                data = in_fp.read(ConsoleReader.READ_SIZE)
+                if not data:
+                    # EOF, this shouldn't happen unless QEMU crashes
+                    if not ignore_unexpected_eof:
+                        _status = TwisterStatus.FAIL
+                        _reason = "unexpected eof"
+                    break
+
                 try:
-                    c = in_fp.read(1).decode("utf-8")
+                    lines = console.feed(data)
                 except UnicodeDecodeError:
                     # Test is writing something weird, fail
                     _status = TwisterStatus.FAIL
                     _reason = "unexpected byte"
                     break
 
-                if c == "":
-                    # EOF, this shouldn't happen unless QEMU crashes
-                    if not ignore_unexpected_eof:
-                        _status = TwisterStatus.FAIL
-                        _reason = "unexpected eof"
-                    break
-                line = line + c
-                if c != "\n":
+                if not lines:
                     continue
 
-                # line contains a full line of data output from QEMU
-                log_out_fp.write(strip_ansi_sequences(line))
+                # lines contains full lines of data output from QEMU
+                log_out_fp.write(strip_ansi_sequences("".join(lines)))
                 log_out_fp.flush()
-                line = line.rstrip()
-                logger.debug(f"QEMU ({pid}): {line}")
-
-                harness.handle(line)
-                if harness.status != TwisterStatus.NONE:
-                    # if we have registered a fail make sure the status is not
-                    # overridden by a false success message coming from the
-                    # testsuite
-                    if _status != TwisterStatus.FAIL:
-                        _status = harness.status
-                        _reason = harness.reason
-
-                    # if we get some status, that means test is doing well, we reset
-                    # the timeout and wait for 2 more seconds to catch anything
-                    # printed late. We wait much longer if code
-                    # coverage is enabled since dumping this information can
-                    # take some time.
-                    if not timeout_extended or harness.capture_coverage:
-                        timeout_extended = True
-                        if harness.capture_coverage:
-                            timeout_time = time.time() + 30
-                        else:
-                            timeout_time = time.time() + 2
-                line = ""
+                for line in lines:
+                    line = line.rstrip()
+                    logger.debug(f"QEMU ({pid}): {line}")
+
+                    harness.handle(line)
+                    if harness.status != TwisterStatus.NONE:
+                        # if we have registered a fail make sure the status is not
+                        # overridden by a false success message coming from the
+                        # testsuite
+                        if _status != TwisterStatus.FAIL:
+                            _status = harness.status
+                            _reason = harness.reason
+
+                        # if we get some status, that means test is doing well, we reset
+                        # the timeout and wait for 2 more seconds to catch anything
+                        # printed late. We wait much longer if code
+                        # coverage is enabled since dumping this information can
+                        # take some time.
+                        if not timeout_extended or harness.capture_coverage:
+                            timeout_extended = True
+                            if harness.capture_coverage:
+                                timeout_time = time.time() + 30
+                            else:
+                                timeout_time = time.time() + 2
 
             handler.execution_time = time.time() - start_time
             logger.debug(
@@ -34,6 +34,66 @@ logger = logging.getLogger('twister')
 _WINDOWS = platform.system() == 'Windows'
 
 
+class LineMatcher:
+    """Matches console lines against a list of patterns
+
+    Each pattern is given as a (key, match function, literals) tuple, where
+    the match function is the search() or match() method of a compiled
+    regular expression, and literals are strings one of which is in any
+    line the pattern matches. Most console lines contain none of the
+    literals of the patterns, and are rejected with a few substring
+    searches, without running any regular expression. Patterns without
+    literals are tried on all the lines.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._update_literals()
+
+    def _update_literals(self):
+        literals = []
+        for _, _, pattern_literals in self.patterns:
+            if not pattern_literals:
+                # No prefiltering possible
+                literals = None
+                break
+            literals.extend(lit for lit in pattern_literals if lit not in literals)
+        self.literals = literals
+
+    def _may_match(self, line):
+        if self.literals is None:
+            return True
+        return any(map(line.__contains__, self.literals))
+
+    def remove(self, key):
+        """Stop matching the patterns with the given key"""
+        self.patterns = [p for p in self.patterns if p[0] != key]
+        self._update_literals()
+
+    def first(self, line):
+        """Return the (key, match object) of the first pattern matching
+        the line, in the order of the patterns, or (None, None)"""
+        if self._may_match(line):
+            for key, match_fn, literals in self.patterns:
+                if literals and not any(lit in line for lit in literals):
+                    continue
+                if match := match_fn(line):
+                    return key, match
+        return None, None
+
+    def all(self, line):
+        """Return the list of (key, match object) of all the patterns
+        matching the line, in the order of the patterns"""
+        matches = []
+        if self._may_match(line):
+            for key, match_fn, literals in self.patterns:
+                if literals and not any(lit in line for lit in literals):
+                    continue
+                if match := match_fn(line):
+                    matches.append((key, match))
+        return matches
+
+
 class Harness:
     GCOV_START = "GCOV_COVERAGE_DUMP_START"
     GCOV_END = "GCOV_COVERAGE_DUMP_END"
@@ -41,6 +101,7 @@ class Harness:
     RUN_PASSED = "PROJECT EXECUTION SUCCESSFUL"
     RUN_FAILED = "PROJECT EXECUTION FAILED"
     run_id_pattern = r"RunID: (?P<run_id>[0-9A-Fa-f]+)"
+    run_id_regex = re.compile(run_id_pattern)
 
     def __init__(self):
         self._status = TwisterStatus.NONE
@@ -156,7 +217,7 @@ class Harness:
 
         self.parse_record(line)
 
-        runid_match = re.search(self.run_id_pattern, line)
+        runid_match = "RunID: " in line and self.run_id_regex.search(line)
         if runid_match:
             run_id = runid_match.group("run_id")
             self.run_id_exists = True
@@ -254,6 +315,9 @@ class Robot(Harness):
 
 class Console(Harness):
 
+    # Matcher of the patterns not found yet, for unordered multi_line
+    unordered_matcher = None
+
     def get_testcase_name(self):
         '''
         Get current TestCase name.
@@ -312,13 +376,19 @@ class Console(Harness):
                 if self.next_pattern >= len(self.patterns):
                     self.status = TwisterStatus.PASS
         elif self.type == "multi_line" and not self.ordered:
-            for i, pattern in enumerate(self.patterns):
-                r = self.regex[i]
-                if pattern.search(line) and r not in self.matches:
+            if self.unordered_matcher is None:
+                self.unordered_matcher = LineMatcher(
+                    (r, pattern.search, None)
+                    for r, pattern in zip(self.regex, self.patterns, strict=False)
+                )
+            for r, match in self.unordered_matcher.all(line):
+                if r not in self.matches:
                     self.matches[r] = line
                     logger.debug(f"HARNESS:{self.__class__.__name__}:EXPECTED("
                                  f"{len(self.matches)}/{self.patterns_expected}):"
-                                 f"'{pattern.pattern}'")
+                                 f"'{match.re.pattern}'")
+                    # Each pattern is only expected once
+                    self.unordered_matcher.remove(r)
             if len(self.matches) == len(self.regex):
                 self.status = TwisterStatus.PASS
         else:
@@ -712,6 +782,21 @@ class Gtest(Harness):
         ".*(?:\\[==========\\] Done running all tests\\.|"
         + "\\[----------\\] Global test environment tear-down)"
     )
+    # Matchers of the patterns above, with the literals found in the
+    # lines they match
+    start_matcher = LineMatcher([
+        ('start', re.compile(TEST_START_PATTERN).search, ("[ RUN      ] ",)),
+    ])
+    finished_matcher = LineMatcher([
+        ('finished', re.compile(FINISHED_PATTERN).search,
+         ("[==========] Done running all tests.",
+          "[----------] Global test environment tear-down")),
+    ])
+    result_matcher = LineMatcher([
+        (TwisterStatus.PASS, re.compile(TEST_PASS_PATTERN).search, ("[       OK ] ",)),
+        (TwisterStatus.SKIP, re.compile(TEST_SKIP_PATTERN).search, ("[ DISABLED ] ",)),
+        (TwisterStatus.FAIL, re.compile(TEST_FAIL_PATTERN).search, ("[  FAILED  ] ",)),
+    ])
 
     def __init__(self):
         super().__init__()
@@ -720,13 +805,13 @@ class Gtest(Harness):
 
     def handle(self, line):
         # Strip the ANSI characters, they mess up the patterns
-        non_ansi_line = self.ANSI_ESCAPE.sub('', line)
+        non_ansi_line = self.ANSI_ESCAPE.sub('', line) if '\x1b' in line else line
 
         if self.status != TwisterStatus.NONE:
             return
 
         # Check if we started running a new test
-        test_start_match = re.search(self.TEST_START_PATTERN, non_ansi_line)
+        _, test_start_match = self.start_matcher.first(non_ansi_line)
         if test_start_match:
             # Add the suite name
             suite_name = test_start_match.group("suite_name")
@@ -753,7 +838,7 @@ class Gtest(Harness):
             self._match = True
 
         # Check if the test run finished
-        finished_match = re.search(self.FINISHED_PATTERN, non_ansi_line)
+        _, finished_match = self.finished_matcher.first(non_ansi_line)
         if finished_match:
             tc = self.instance.get_case_or_create(self.id)
             if self.has_failures or self.tc is not None:
@@ -788,26 +873,12 @@ class Gtest(Harness):
         self._match = False
 
     def _check_result(self, line):
-        test_pass_match = re.search(self.TEST_PASS_PATTERN, line)
-        if test_pass_match:
-            return TwisterStatus.PASS, \
-                   "{}.{}.{}".format(
-                        self.id, test_pass_match.group("suite_name"),
-                        test_pass_match.group("test_name")
-                    )
-        test_skip_match = re.search(self.TEST_SKIP_PATTERN, line)
-        if test_skip_match:
-            return TwisterStatus.SKIP, \
+        state, test_result_match = self.result_matcher.first(line)
+        if test_result_match:
+            return state, \
                    "{}.{}.{}".format(
-                       self.id, test_skip_match.group("suite_name"),
-                       test_skip_match.group("test_name")
-                    )
-        test_fail_match = re.search(self.TEST_FAIL_PATTERN, line)
-        if test_fail_match:
-            return TwisterStatus.FAIL, \
-                   "{}.{}.{}".format(
-                       self.id, test_fail_match.group("suite_name"),
-                       test_fail_match.group("test_name")
+                        self.id, test_result_match.group("suite_name"),
+                        test_result_match.group("test_name")
                     )
         return None, None
 
@@ -833,7 +904,16 @@ class Test(Harness):
     test_case_summary_pattern = re.compile(
         r".*- (PASS|FAIL|SKIP) - \[([^\.]*).(test_)?(\S*)\] duration = (\d*[.,]?\d*) seconds"
     )
-
+    # All the patterns above, in the order they are tried on each line,
+    # with the literals found in the lines they match
+    line_matcher = LineMatcher([
+        ('suite_start', test_suite_start_pattern.search, ("Running TESTSUITE ",)),
+        ('suite_end', test_suite_end_pattern.search, ("TESTSUITE ",)),
+        ('case_start', test_case_start_pattern.search, ("START - ",)),
+        ('case_end', test_case_end_pattern.match, (" seconds",)),
+        ('suite_summary', test_suite_summary_pattern.match, (" seconds",)),
+        ('case_summary', test_case_summary_pattern.match, (" seconds",)),
+    ])
 
     def get_testcase(self, tc_name, phase, ts_name=None):
         """ Search a Ztest case among detected in the test image binary
@@ -930,17 +1010,17 @@ class Test(Harness):
             logger.warning(f"{phase}: END case '{tc_name}' without START detected")
 
     def handle(self, line):
-        testcase_match = None
         if self._match:
             self.testcase_output += line + "\n"
-        if test_suite_start_match := re.search(self.test_suite_start_pattern, line):
-            self.start_suite(test_suite_start_match.group("suite_name"))
-        elif test_suite_end_match := re.search(self.test_suite_end_pattern, line):
-            suite_name=test_suite_end_match.group("suite_name")
+        key, match = self.line_matcher.first(line)
+        if key == 'suite_start':
+            self.start_suite(match.group("suite_name"))
+        elif key == 'suite_end':
+            suite_name=match.group("suite_name")
             self.end_suite(suite_name)
             self.ztest = True
-        elif testcase_match := re.search(self.test_case_start_pattern, line):
-            tc_name = testcase_match.group(2)
+        elif key == 'case_start':
+            tc_name = match.group(2)
             tc = self.get_testcase(tc_name, 'TC_START')
             self.start_case(tc.name)
             # Mark the test as started, if something happens here, it is mostly
@@ -953,30 +1033,30 @@ class Test(Harness):
         # some testcases are skipped based on predicates and do not show up
         # during test execution, however they are listed in the summary. Parse
         # the summary for status and use that status instead.
-        elif result_match := self.test_case_end_pattern.match(line):
-            matched_status = result_match.group(1)
-            tc_name = result_match.group(3)
+        elif key == 'case_end':
+            matched_status = match.group(1)
+            tc_name = match.group(3)
             tc = self.get_testcase(tc_name, 'TC_END')
             self.end_case(tc.name)
             tc.status = TwisterStatus[matched_status]
             if tc.status == TwisterStatus.SKIP:
                 tc.reason = "ztest skip"
-            tc.duration = float(result_match.group(4))
+            tc.duration = float(match.group(4))
             if tc.status == TwisterStatus.FAIL:
                 tc.output = self.testcase_output
             self.testcase_output = ""
             self._match = False
             self.ztest = True
-        elif test_suite_summary_match := self.test_suite_summary_pattern.match(line):
-            suite_name=test_suite_summary_match.group("suite_name")
-            suite_status=test_suite_summary_match.group("suite_status")
+        elif key == 'suite_summary':
+            suite_name=match.group("suite_name")
+            suite_status=match.group("suite_status")
             self._match = False
             self.ztest = True
             self.end_suite(suite_name, 'TS_SUM', suite_status=suite_status)
-        elif test_case_summary_match := self.test_case_summary_pattern.match(line):
-            matched_status = test_case_summary_match.group(1)
-            suite_name = test_case_summary_match.group(2)
-            tc_name = test_case_summary_match.group(4)
+        elif key == 'case_summary':
+            matched_status = match.group(1)
+            suite_name = match.group(2)
+            tc_name = match.group(4)
             tc = self.get_testcase(tc_name, 'TS_SUM', suite_name)
             self.end_case(tc.name, 'TS_SUM')
             if tc.status not in [TwisterStatus.NONE, TwisterStatus[matched_status]]:
@@ -987,7 +1067,7 @@ class Test(Harness):
             tc.status = TwisterStatus[matched_status]
             if tc.status == TwisterStatus.SKIP:
                 tc.reason = "ztest skip"
-            tc.duration = float(test_case_summary_match.group(5))
+            tc.duration = float(match.group(5))
             if tc.status == TwisterStatus.FAIL:
                 tc.output = self.testcase_output
             self.testcase_output = ""
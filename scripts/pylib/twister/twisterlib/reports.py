@@ -4,6 +4,8 @@
 # Copyright (c) 2018 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import collections
+import contextlib
 import json
 import logging
 import os
@@ -19,6 +21,9 @@ from twisterlib.statuses import TwisterStatus
 
 logger = logging.getLogger('twister')
 
+# Indentation of the test suites in the JSON reports
+JSON_SUITE_INDENT = ' ' * 8
+
 
 class ReportStatus(str, Enum):
     def __str__(self):
@@ -59,6 +64,9 @@ class Reporting:
         self.instance_fail_count = plan.instance_fail_count
         self.footprint = None
         self.coverage_status = None
+        # Files read and suites encoded while saving the reports, see read_once()
+        self._read_cache = None
+        self._suite_cache = None
 
 
     @staticmethod
@@ -71,6 +79,47 @@ class Reporting:
 
         return filtered_string
 
+    @staticmethod
+    def load_json_report(json_file):
+        """ Load a JSON report, with its test suites grouped by platform.
+        """
+        with open(json_file) as json_results:
+            json_data = json.load(json_results)
+
+        suites_by_platform = collections.defaultdict(list)
+        for suite in json_data.get("testsuites", []):
+            suites_by_platform[suite.get('platform')].append(suite)
+
+        return json_data, suites_by_platform
+
+    @staticmethod
+    def load_footprint(footprint_file):
+        with open(footprint_file) as footprint_json:
+            return json.load(footprint_json)
+
+    @contextlib.contextmanager
+    def read_once(self, cache_suites=False):
+        """ Read each file used by several reports only once in this context,
+        e.g. the logs and footprints of the instances for the per-platform
+        reports. With cache_suites, also encode each test suite only once
+        for the JSON reports with the same filters.
+        """
+        self._read_cache = {}
+        self._suite_cache = {} if cache_suites else None
+        try:
+            yield
+        finally:
+            self._read_cache = None
+            self._suite_cache = None
+
+    def _read(self, loader, filename):
+        if self._read_cache is None:
+            return loader(filename)
+        key = (loader, filename)
+        if key not in self._read_cache:
+            self._read_cache[key] = loader(filename)
+        return self._read_cache[key]
+
 
     @staticmethod
     def xunit_testcase(
@@ -140,10 +189,7 @@ class Reporting:
     # Generate a report with all testsuites instead of doing this per platform
     def xunit_report_suites(self, json_file, filename):
 
-        json_data = {}
-        with open(json_file) as json_results:
-            json_data = json.load(json_results)
-
+        json_data, _ = self._read(self.load_json_report, json_file)
 
         env = json_data.get('environment', {})
         version = env.get('zephyr_version', None)
@@ -212,19 +258,15 @@ class Reporting:
             logger.info(f"Writing xunit report {filename}...")
             selected = self.selected_platforms
 
-        json_data = {}
-        with open(json_file) as json_results:
-            json_data = json.load(json_results)
-
+        json_data, suites_by_platform = self._read(self.load_json_report, json_file)
 
         env = json_data.get('environment', {})
         version = env.get('zephyr_version', None)
 
         eleTestsuites = ET.Element('testsuites')
-        all_suites = json_data.get("testsuites", [])
 
         for platform in selected:
-            suites = list(filter(lambda d: d['platform'] == platform, all_suites))
+            suites = suites_by_platform.get(platform, [])
             # do not create entry if everything is filtered out
             if not self.env.options.detailed_skipped_report:
                 non_filtered = list(
@@ -294,204 +336,260 @@ class Reporting:
         with open(filename, 'wb') as report:
             report.write(result)
 
-    def json_report(self, filename, version="NA", platform=None, filters=None):
+    def json_report(self, filename, version="NA", platform=None, filters=None, instances=None):
         logger.info(f"Writing JSON report {filename}")
 
+        report = {}
+        report["environment"] = self.json_environment(version)
+        if instances is None:
+            instances = self.instances.values()
+
+        def encoded_suites():
+            for instance in instances:
+                if platform and platform != instance.platform.name:
+                    continue
+                key = (instance.name, id(filters))
+                if self._suite_cache is not None and key in self._suite_cache:
+                    # Already encoded for a report with the same filters
+                    yield self._suite_cache[key]
+                    continue
+                suite = self.json_suite(self.env, instance, filters, filename, self._read)
+                if suite is None:
+                    continue
+                encoded = self._encode_json_suite(suite)
+                if self._suite_cache is not None:
+                    self._suite_cache[key] = encoded
+                yield encoded
+
+        report["testsuites"] = []
+        self._write_json_report(filename, report, encoded_suites())
+
+    def json_environment(self, version="NA"):
         if self.env.options.report_all_options:
             report_options = vars(self.env.options)
         else:
             report_options = self.env.non_default_options()
 
-        report = {}
-        report["environment"] = {"os": platform_system(),
-                                 "zephyr_version": version,
-                                 "toolchain": self.env.toolchain,
-                                 "commit_date": self.env.commit_date,
-                                 "run_date": self.env.run_date,
-                                 "options": report_options
-                                 }
-        suites = []
+        return {"os": platform_system(),
+                "zephyr_version": version,
+                "toolchain": self.env.toolchain,
+                "commit_date": self.env.commit_date,
+                "run_date": self.env.run_date,
+                "options": report_options
+                }
 
-        for instance in self.instances.values():
-            if platform and platform != instance.platform.name:
-                continue
-            if instance.status == TwisterStatus.FILTER and not self.env.options.report_filtered:
-                continue
-            if (filters and 'allow_status' in filters and \
-                instance.status not in [TwisterStatus[s] for s in filters['allow_status']]):
-                logger.debug(
-                    f"Skip test suite '{instance.testsuite.name}'"
-                    f" status '{instance.status}' not allowed for {filename}"
-                )
-                continue
-            if (filters and 'deny_status' in filters and \
-                instance.status in [TwisterStatus[s] for s in filters['deny_status']]):
-                logger.debug(
-                    f"Skip test suite '{instance.testsuite.name}'"
-                    f" status '{instance.status}' denied for {filename}"
-                )
-                continue
-            suite = {}
-            handler_log = os.path.join(instance.build_dir, "handler.log")
-            pytest_log = os.path.join(instance.build_dir, "twister_harness.log")
-            build_log = os.path.join(instance.build_dir, "build.log")
-            device_log = os.path.join(instance.build_dir, "device.log")
+    @staticmethod
+    def _encode_json_suite(suite):
+        # Encoded as in the list of the test suites of a report
+        encoded = json.dumps(suite, indent=4, separators=(',',':'), cls=ReportingJSONEncoder)
+        return JSON_SUITE_INDENT + encoded.replace('\n', '\n' + JSON_SUITE_INDENT)
 
-            handler_time = instance.metrics.get('handler_time', 0)
-            used_ram = instance.metrics.get ("used_ram", 0)
-            used_rom  = instance.metrics.get("used_rom",0)
-            available_ram = instance.metrics.get("available_ram", 0)
-            available_rom = instance.metrics.get("available_rom", 0)
-            suite = {
-                "name": instance.testsuite.name,
-                "arch": instance.platform.arch,
-                "platform": instance.platform.name,
-                "path": instance.testsuite.source_dir_rel
-            }
-            if instance.run_id:
-                suite['run_id'] = instance.run_id
-
-            suite["runnable"] = False
-            if instance.status != TwisterStatus.FILTER:
-                suite["runnable"] = instance.run
-
-            if used_ram:
-                suite["used_ram"] = used_ram
-            if used_rom:
-                suite["used_rom"] = used_rom
-
-            suite['retries'] = instance.retries
-            if instance.toolchain:
-                suite['toolchain'] = instance.toolchain
-
-            if instance.dut:
-                suite["dut"] = instance.dut
-            if available_ram:
-                suite["available_ram"] = available_ram
-            if available_rom:
-                suite["available_rom"] = available_rom
-            if instance.status in [TwisterStatus.ERROR, TwisterStatus.FAIL]:
-                suite['status'] = instance.status
-                # FIXME
-                if os.path.exists(pytest_log):
-                    suite["log"] = self.process_log(pytest_log)
-                elif os.path.exists(handler_log):
-                    suite["log"] = self.process_log(handler_log)
-                elif os.path.exists(device_log):
-                    suite["log"] = self.process_log(device_log)
-                else:
-                    suite["log"] = self.process_log(build_log)
-
-                suite["reason"] = self.get_detailed_reason(instance.reason, suite["log"])
-                # update the reason to get more details also in other reports (e.g. junit)
-                # where build log is not available
-                instance.reason = suite["reason"]
-            elif instance.status == TwisterStatus.FILTER:
-                suite["status"] = TwisterStatus.FILTER
-                suite["reason"] = instance.reason
-            elif instance.status == TwisterStatus.PASS:
-                suite["status"] = TwisterStatus.PASS
-            elif instance.status == TwisterStatus.SKIP:
-                suite["status"] = TwisterStatus.SKIP
-                suite["reason"] = instance.reason
-            elif instance.status == TwisterStatus.NOTRUN:
-                suite["status"] = TwisterStatus.NOTRUN
-                suite["reason"] = instance.reason
+    @staticmethod
+    def _write_json_report(filename, report, suites):
+        # Writes the report with the encoded test suites one by one, the
+        # same as json.dump() with the test suites in report["testsuites"]
+        encoded = json.dumps(report, indent=4, separators=(',',':'), cls=ReportingJSONEncoder)
+        suites = iter(suites)
+        first_suite = next(suites, None)
+        with open(filename, 'w') as json_file:
+            if first_suite is None:
+                json_file.write(encoded)
+                return
+            json_file.write(encoded.removesuffix('[]\n}') + '[\n')
+            json_file.write(first_suite)
+            for suite in suites:
+                json_file.write(',\n')
+                json_file.write(suite)
+            json_file.write('\n    ]\n}')
+
+    @staticmethod
+    def json_suite(env, instance, filters=None, filename=None, read=None):
+        """ Return the entry of the instance in the test suites of a JSON
+        report, or None if it is filtered out. Files are read with
+        read(loader, filename) if given.
+        """
+        def read_file(loader, fname):
+            return read(loader, fname) if read else loader(fname)
+
+        if instance.status == TwisterStatus.FILTER and not env.options.report_filtered:
+            return None
+        if (filters and 'allow_status' in filters and \
+            instance.status not in [TwisterStatus[s] for s in filters['allow_status']]):
+            logger.debug(
+                f"Skip test suite '{instance.testsuite.name}'"
+                f" status '{instance.status}' not allowed for {filename}"
+            )
+            return None
+        if (filters and 'deny_status' in filters and \
+            instance.status in [TwisterStatus[s] for s in filters['deny_status']]):
+            logger.debug(
+                f"Skip test suite '{instance.testsuite.name}'"
+                f" status '{instance.status}' denied for {filename}"
+            )
+            return None
+        suite = {}
+        handler_log = os.path.join(instance.build_dir, "handler.log")
+        pytest_log = os.path.join(instance.build_dir, "twister_harness.log")
+        build_log = os.path.join(instance.build_dir, "build.log")
+        device_log = os.path.join(instance.build_dir, "device.log")
+
+        handler_time = instance.metrics.get('handler_time', 0)
+        used_ram = instance.metrics.get ("used_ram", 0)
+        used_rom  = instance.metrics.get("used_rom",0)
+        available_ram = instance.metrics.get("available_ram", 0)
+        available_rom = instance.metrics.get("available_rom", 0)
+        console_bytes_per_sec = instance.metrics.get("console_bytes_per_sec", 0)
+        console_lines_per_sec = instance.metrics.get("console_lines_per_sec", 0)
+        suite = {
+            "name": instance.testsuite.name,
+            "arch": instance.platform.arch,
+            "platform": instance.platform.name,
+            "path": instance.testsuite.source_dir_rel
+        }
+        if instance.run_id:
+            suite['run_id'] = instance.run_id
+
+        suite["runnable"] = False
+        if instance.status != TwisterStatus.FILTER:
+            suite["runnable"] = instance.run
+
+        if used_ram:
+            suite["used_ram"] = used_ram
+        if used_rom:
+            suite["used_rom"] = used_rom
+
+        suite['retries'] = instance.retries
+        if instance.toolchain:
+            suite['toolchain'] = instance.toolchain
+
+        if instance.dut:
+            suite["dut"] = instance.dut
+        if available_ram:
+            suite["available_ram"] = available_ram
+        if available_rom:
+            suite["available_rom"] = available_rom
+        if console_bytes_per_sec:
+            suite["console_bytes_per_sec"] = console_bytes_per_sec
+        if console_lines_per_sec:
+            suite["console_lines_per_sec"] = console_lines_per_sec
+        if instance.status in [TwisterStatus.ERROR, TwisterStatus.FAIL]:
+            suite['status'] = instance.status
+            # FIXME
+            if os.path.exists(pytest_log):
+                suite["log"] = read_file(Reporting.process_log, pytest_log)
+            elif os.path.exists(handler_log):
+                suite["log"] = read_file(Reporting.process_log, handler_log)
+            elif os.path.exists(device_log):
+                suite["log"] = read_file(Reporting.process_log, device_log)
             else:
-                suite["status"] = TwisterStatus.NONE
-                suite["reason"] = 'Unknown Instance status'
+                suite["log"] = read_file(Reporting.process_log, build_log)
+
+            suite["reason"] = Reporting.get_detailed_reason(instance.reason, suite["log"])
+            # update the reason to get more details also in other reports (e.g. junit)
+            # where build log is not available
+            instance.reason = suite["reason"]
+        elif instance.status == TwisterStatus.FILTER:
+            suite["status"] = TwisterStatus.FILTER
+            suite["reason"] = instance.reason
+        elif instance.status == TwisterStatus.PASS:
+            suite["status"] = TwisterStatus.PASS
+        elif instance.status == TwisterStatus.SKIP:
+            suite["status"] = TwisterStatus.SKIP
+            suite["reason"] = instance.reason
+        elif instance.status == TwisterStatus.NOTRUN:
+            suite["status"] = TwisterStatus.NOTRUN
+            suite["reason"] = instance.reason
+        else:
+            suite["status"] = TwisterStatus.NONE
+            suite["reason"] = 'Unknown Instance status'
 
-            if instance.status != TwisterStatus.NONE:
-                suite["execution_time"] =  f"{float(handler_time):.2f}"
-            suite["build_time"] =  f"{float(instance.build_time):.2f}"
+        if instance.status != TwisterStatus.NONE:
+            suite["execution_time"] =  f"{float(handler_time):.2f}"
+        suite["build_time"] =  f"{float(instance.build_time):.2f}"
 
-            testcases = []
+        testcases = []
 
-            if len(instance.testcases) == 1:
-                single_case_duration = f"{float(handler_time):.2f}"
-            else:
-                single_case_duration = 0
+        if len(instance.testcases) == 1:
+            single_case_duration = f"{float(handler_time):.2f}"
+        else:
+            single_case_duration = 0
 
-            for case in instance.testcases:
-                # freeform was set when no sub testcases were parsed, however,
-                # if we discover those at runtime, the fallback testcase wont be
-                # needed anymore and can be removed from the output, it does
-                # not have a status and would otherwise be reported as skipped.
-                if (
-                    case.freeform
-                    and case.status == TwisterStatus.NONE
-                    and len(instance.testcases) > 1
-                ):
-                    continue
-                testcase = {}
-                testcase['identifier'] = case.name
-                if instance.status != TwisterStatus.NONE:
-                    if single_case_duration:
-                        testcase['execution_time'] = single_case_duration
-                    else:
-                        testcase['execution_time'] = f"{float(case.duration):.2f}"
-
-                if case.output != "":
-                    testcase['log'] = case.output
-
-                if case.status == TwisterStatus.SKIP:
-                    if instance.status == TwisterStatus.FILTER:
-                        testcase["status"] = TwisterStatus.FILTER
-                    else:
-                        testcase["status"] = TwisterStatus.SKIP
-                        testcase["reason"] = case.reason or instance.reason
+        for case in instance.testcases:
+            # freeform was set when no sub testcases were parsed, however,
+            # if we discover those at runtime, the fallback testcase wont be
+            # needed anymore and can be removed from the output, it does
+            # not have a status and would otherwise be reported as skipped.
+            if (
+                case.freeform
+                and case.status == TwisterStatus.NONE
+                and len(instance.testcases) > 1
+            ):
+                continue
+            testcase = {}
+            testcase['identifier'] = case.name
+            if instance.status != TwisterStatus.NONE:
+                if single_case_duration:
+                    testcase['execution_time'] = single_case_duration
                 else:
-                    testcase["status"] = case.status
-                    if case.reason:
-                        testcase["reason"] = case.reason
+                    testcase['execution_time'] = f"{float(case.duration):.2f}"
 
-                testcases.append(testcase)
+            if case.output != "":
+                testcase['log'] = case.output
 
-            suite['testcases'] = testcases
+            if case.status == TwisterStatus.SKIP:
+                if instance.status == TwisterStatus.FILTER:
+                    testcase["status"] = TwisterStatus.FILTER
+                else:
+                    testcase["status"] = TwisterStatus.SKIP
+                    testcase["reason"] = case.reason or instance.reason
+            else:
+                testcase["status"] = case.status
+                if case.reason:
+                    testcase["reason"] = case.reason
 
-            if instance.recording is not None:
-                suite['recording'] = instance.recording
+            testcases.append(testcase)
 
-            if (
-                instance.status not in [
-                    TwisterStatus.NONE,
-                    TwisterStatus.ERROR,
-                    TwisterStatus.FILTER
-                ]
-                and self.env.options.create_rom_ram_report
-                and self.env.options.footprint_report is not None
-            ):
-                # Init as empty data preparing for filtering properties.
-                suite['footprint'] = {}
-
-            # Pass suite properties through the context filters.
-            if filters and 'allow_suite' in filters:
-                suite = {k:v for k,v in suite.items() if k in filters['allow_suite']}
-
-            if filters and 'deny_suite' in filters:
-                suite = {k:v for k,v in suite.items() if k not in filters['deny_suite']}
-
-            # Compose external data only to these properties which pass filtering.
-            if 'footprint' in suite:
-                do_all = 'all' in self.env.options.footprint_report
-                footprint_files = { 'ROM': 'rom.json', 'RAM': 'ram.json' }
-                for k,v in footprint_files.items():
-                    if do_all or k in self.env.options.footprint_report:
-                        footprint_fname = os.path.join(instance.build_dir, v)
-                        try:
-                            with open(footprint_fname) as footprint_json:
-                                logger.debug(f"Collect footprint.{k} for '{instance.name}'")
-                                suite['footprint'][k] = json.load(footprint_json)
-                        except FileNotFoundError:
-                            logger.error(f"Missing footprint.{k} for '{instance.name}'")
-                #
-            #
+        suite['testcases'] = testcases
 
-            suites.append(suite)
+        if instance.recording is not None:
+            suite['recording'] = instance.recording
 
-        report["testsuites"] = suites
-        with open(filename, 'w') as json_file:
-            json.dump(report, json_file, indent=4, separators=(',',':'), cls=ReportingJSONEncoder)
+        if (
+            instance.status not in [
+                TwisterStatus.NONE,
+                TwisterStatus.ERROR,
+                TwisterStatus.FILTER
+            ]
+            and env.options.create_rom_ram_report
+            and env.options.footprint_report is not None
+        ):
+            # Init as empty data preparing for filtering properties.
+            suite['footprint'] = {}
+
+        # Pass suite properties through the context filters.
+        if filters and 'allow_suite' in filters:
+            suite = {k:v for k,v in suite.items() if k in filters['allow_suite']}
+
+        if filters and 'deny_suite' in filters:
+            suite = {k:v for k,v in suite.items() if k not in filters['deny_suite']}
+
+        # Compose external data only to these properties which pass filtering.
+        if 'footprint' in suite:
+            do_all = 'all' in env.options.footprint_report
+            footprint_files = { 'ROM': 'rom.json', 'RAM': 'ram.json' }
+            for k,v in footprint_files.items():
+                if do_all or k in env.options.footprint_report:
+                    footprint_fname = os.path.join(instance.build_dir, v)
+                    try:
+                        logger.debug(f"Collect footprint.{k} for '{instance.name}'")
+                        suite['footprint'][k] = read_file(Reporting.load_footprint,
+                                                           footprint_fname)
+                    except FileNotFoundError:
+                        logger.error(f"Missing footprint.{k} for '{instance.name}'")
+            #
+        #
+
+        return suite
 
 
     def compare_metrics(self, filename):
@@ -505,15 +603,14 @@ class Reporting:
 
         results = []
         saved_metrics = {}
-        with open(filename) as fp:
-            jt = json.load(fp)
-            for ts in jt.get("testsuites", []):
-                d = {}
-                for m, _, _ in interesting_metrics:
-                    d[m] = ts.get(m, 0)
-                ts_name = ts.get('name')
-                ts_platform = ts.get('platform')
-                saved_metrics[(ts_name, ts_platform)] = d
+        keys = ['name', 'platform'] + [m for m, _, _ in interesting_metrics]
+        for ts in iter_report_suites(filename, keys):
+            d = {}
+            for m, _, _ in interesting_metrics:
+                d[m] = ts.get(m, 0)
+            ts_name = ts.get('name')
+            ts_platform = ts.get('platform')
+            saved_metrics[(ts_name, ts_platform)] = d
 
         for instance in self.instances.values():
             mkey = (instance.testsuite.name, instance.platform.name)
@@ -747,6 +844,26 @@ class Reporting:
             return
 
         logger.info("Saving reports...")
+        outdir, filename = self._report_path(name, suffix, report_dir)
+
+        if not no_update:
+            json_file = filename + ".json"
+            with self.read_once(cache_suites=platform_reports):
+                self.json_report(json_file, version=self.env.version,
+                                 filters=self.json_filters['twister.json'])
+                if self.env.options.footprint_report is not None:
+                    self.json_report(filename + "_footprint.json", version=self.env.version,
+                                     filters=self.json_filters['footprint.json'])
+                self.xunit_report(json_file, filename + ".xml", full_report=False)
+                self.xunit_report(json_file, filename + "_report.xml", full_report=True)
+                self.xunit_report_suites(json_file, filename + "_suite_report.xml")
+
+                if platform_reports:
+                    self.target_report(json_file, outdir, suffix)
+
+
+    def _report_path(self, name, suffix, report_dir):
+        # Returns the directory of the reports, and their path without extension
         if name:
             report_name = name
         else:
@@ -763,23 +880,24 @@ class Reporting:
         if suffix:
             filename = f"{filename}_{suffix}"
 
-        if not no_update:
-            json_file = filename + ".json"
-            self.json_report(json_file, version=self.env.version,
-                             filters=self.json_filters['twister.json'])
-            if self.env.options.footprint_report is not None:
-                self.json_report(filename + "_footprint.json", version=self.env.version,
-                                 filters=self.json_filters['footprint.json'])
-            self.xunit_report(json_file, filename + ".xml", full_report=False)
-            self.xunit_report(json_file, filename + "_report.xml", full_report=True)
-            self.xunit_report_suites(json_file, filename + "_suite_report.xml")
-
-            if platform_reports:
-                self.target_report(json_file, outdir, suffix)
+        return outdir, filename
 
+    def start_journal(self, name, suffix, report_dir):
+        """ Start the journal of the results of the run, written next to
+        twister.json while the instances are reported, see ReportJournal.
+        """
+        _, filename = self._report_path(name, suffix, report_dir)
+        journal = ReportJournal(self.env, filename + ".jsonl")
+        journal.start(self.json_environment(self.env.version))
+        return journal
 
     def target_report(self, json_file, outdir, suffix):
         platforms = {repr(inst.platform):inst.platform for _, inst in self.instances.items()}
+        # Group the instances once instead of going through all of them
+        # for each platform
+        instances_by_platform = collections.defaultdict(list)
+        for instance in self.instances.values():
+            instances_by_platform[instance.platform.name].append(instance)
         for platform in platforms.values():
             if suffix:
                 filename = os.path.join(outdir,f"{platform.normalized_name}_{suffix}.xml")
@@ -788,20 +906,23 @@ class Reporting:
                 filename = os.path.join(outdir,f"{platform.normalized_name}.xml")
                 json_platform_file = os.path.join(outdir, platform.normalized_name)
             self.xunit_report(json_file, filename, platform.name, full_report=True)
+            instances = instances_by_platform[platform.name]
             self.json_report(json_platform_file + ".json",
                              version=self.env.version, platform=platform.name,
-                             filters=self.json_filters['twister.json'])
+                             filters=self.json_filters['twister.json'], instances=instances)
             if self.env.options.footprint_report is not None:
                 self.json_report(json_platform_file + "_footprint.json",
                                  version=self.env.version, platform=platform.name,
-                                 filters=self.json_filters['footprint.json'])
+                                 filters=self.json_filters['footprint.json'],
+                                 instances=instances)
 
-    def get_detailed_reason(self, reason: str, log: str) -> str:
+    @staticmethod
+    def get_detailed_reason(reason: str, log: str) -> str:
         if reason == 'CMake build failure':
-            if error_key := self._parse_cmake_build_failure(log):
+            if error_key := Reporting._parse_cmake_build_failure(log):
                 return f"{reason} - {error_key}"
         elif reason == 'Build failure':  # noqa SIM102
-            if error_key := self._parse_build_failure(log):
+            if error_key := Reporting._parse_build_failure(log):
                 return f"{reason} - {error_key}"
         return reason
 
@@ -852,3 +973,172 @@ class Reporting:
                         return line + ' ' + next_line
                 return line
         return None
+
+
+class ReportJournal:
+    """ Journal of the results of a run, in the JSON Lines format, appended
+    to as soon as each instance is reported. Each line is an object with
+    one of these properties:
+
+    - "environment": the environment of the run, on the first line
+    - "instance": the name of an instance, with its entry in the test
+      suites of twister.json in "testsuite". An instance reported several
+      times, e.g. when retried, has several lines, the last one is its
+      result.
+    - "summary": the counters of the run, on the last line
+
+    A run which stops early leaves the results of the instances reported
+    so far. It is read back with iter_report_suites().
+    """
+
+    def __init__(self, env, filename):
+        self.env = env
+        self.filename = filename
+
+    def _write(self, record, truncate=False):
+        # Each line is written at once, for the lines appended by the
+        # processes of the runner not to interleave
+        line = (json.dumps(record, cls=ReportingJSONEncoder) + '\n').encode()
+        flags = os.O_WRONLY | os.O_CREAT | (os.O_TRUNC if truncate else os.O_APPEND)
+        fd = os.open(self.filename, flags, 0o666)
+        try:
+            view = memoryview(line)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+
+    def start(self, environment):
+        self._write({"environment": environment}, truncate=True)
+
+    def add(self, instance):
+        suite = Reporting.json_suite(self.env, instance, Reporting.json_filters['twister.json'],
+                                     self.filename)
+        if suite is not None:
+            self._write({"instance": instance.name, "testsuite": suite})
+
+    def finish(self, summary):
+        self._write({"summary": summary})
+
+
+# Size of the chunks read by the streaming JSON reader
+JSON_READ_SIZE = 64 * 1024
+
+# Characters which can follow a value in JSON
+JSON_DELIMITERS = ' \t\r\n,:]}'
+
+
+def iter_report_suites(filename, keys=None):
+    """ Generate the test suites of a JSON report, e.g. twister.json, or
+    of a journal (.jsonl), without loading the whole file. With keys, only
+    these properties of the test suites are kept.
+    """
+    if str(filename).endswith('.jsonl'):
+        suites = _iter_journal_suites(filename)
+    else:
+        suites = _iter_json_suites(filename)
+
+    for suite in suites:
+        if keys is not None:
+            suite = {k: v for k, v in suite.items() if k in keys}
+        yield suite
+
+
+def _iter_journal_suites(filename):
+    # The last line of each instance is its result. The instances are
+    # found first from the start of their lines, so that only the
+    # test suites kept are decoded.
+    prefix = b'{"instance": '
+    last_line = {}
+    with open(filename, 'rb') as journal:
+        for lineno, line in enumerate(journal):
+            if line.startswith(prefix) and line.endswith(b'\n'):
+                name, _ = json.JSONDecoder().raw_decode(line[len(prefix):].decode())
+                last_line[name] = lineno
+
+        keep = set(last_line.values())
+        journal.seek(0)
+        for lineno, line in enumerate(journal):
+            if lineno in keep:
+                yield json.loads(line)["testsuite"]
+
+
+def _iter_json_suites(filename):
+    # Decodes the items of the "testsuites" list of the top-level object
+    # one by one, reading the file in chunks
+    decoder = json.JSONDecoder()
+    with open(filename) as json_file:
+        buf = ''
+        pos = 0
+        eof = False
+
+        def fill():
+            # Reads more of the file, returns False at its end. At least as
+            # much as is left in the buffer is read, for values larger than
+            # a chunk to be decoded in linear time.
+            nonlocal buf, pos, eof
+            if eof:
+                return False
+            chunk = json_file.read(max(JSON_READ_SIZE, len(buf) - pos))
+            if not chunk:
+                eof = True
+                return False
+            buf = buf[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip_ws():
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in ' \t\r\n':
+                    pos += 1
+                if pos < len(buf) or not fill():
+                    return
+
+        def expect(chars):
+            nonlocal pos
+            skip_ws()
+            if pos >= len(buf) or buf[pos] not in chars:
+                raise ValueError(f"{filename}: invalid JSON report at offset {pos}")
+            pos += 1
+            return buf[pos - 1]
+
+        def value():
+            nonlocal pos
+            skip_ws()
+            while True:
+                try:
+                    obj, end = decoder.raw_decode(buf, pos)
+                    # A number is only complete once followed by a delimiter,
+                    # e.g. "1.5" may be split after "1" or "1."
+                    if eof or end < len(buf) and (
+                        buf[pos] in '"{[tfn' or buf[end] in JSON_DELIMITERS
+                    ):
+                        pos = end
+                        return obj
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                fill()
+
+        expect('{')
+        skip_ws()
+        if pos < len(buf) and buf[pos] == '}':
+            return
+        while True:
+            key = value()
+            expect(':')
+            if key == "testsuites":
+                expect('[')
+                skip_ws()
+                if pos < len(buf) and buf[pos] == ']':
+                    pos += 1
+                else:
+                    while True:
+                        yield value()
+                        if expect(',]') == ']':
+                            break
+            else:
+                value()
+            if expect(',}') == '}':
+                return
@@ -5,20 +5,20 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import contextlib
+import functools
 import logging
 import multiprocessing as mp
 import os
 import pathlib
-import pickle
 import re
 import shutil
 import subprocess
 import sys
 import time
 import traceback
-from collections import deque
+from collections import ChainMap, deque
 from math import log10
-from multiprocessing import Lock, Process, Value
+from multiprocessing import Array, Lock, Process
 from multiprocessing.managers import BaseManager
 
 import elftools
@@ -30,6 +30,7 @@ from packaging import version
 from twisterlib.cmakecache import CMakeCache
 from twisterlib.environment import canonical_zephyr_base
 from twisterlib.error import BuildError, ConfigurationError, StatusAttributeError
+from twisterlib.filter_cache import FilterCache
 from twisterlib.hardwaremap import DUT
 from twisterlib.log_helper import setup_logging
 from twisterlib.statuses import TwisterStatus
@@ -44,12 +45,15 @@ if sys.platform == 'linux':
 from twisterlib.environment import ZEPHYR_BASE
 
 sys.path.insert(0, os.path.join(ZEPHYR_BASE, "scripts/pylib/build_helpers"))
+sys.path.insert(0, os.path.join(ZEPHYR_BASE, "scripts", "dts", "python-devicetree", "src"))
+from devicetree import edtlib
 from domains import Domains
 from twisterlib.coverage import run_coverage_instance
 from twisterlib.environment import TwisterEnv
 from twisterlib.harness import Ctest, HarnessImporter, Pytest
 from twisterlib.log_helper import log_command
 from twisterlib.platform import Platform
+from twisterlib.scheduler import PipelineScheduler
 from twisterlib.testinstance import TestInstance
 from twisterlib.testplan import change_skip_to_error_if_integration
 from twisterlib.testsuite import TestSuite
@@ -70,8 +74,38 @@ from anytree import Node, RenderTree
 logger = logging.getLogger('twister')
 
 
+class _Counter:
+    """One of the counters of an ExecutionCounter.
+
+    Reading the attribute returns the counter value, assigning it sets the
+    value. An <name>_increment(value=1) method is also added to the class.
+    """
+
+    def __set_name__(self, owner, name):
+        self.index = len(owner.COUNTERS)
+        owner.COUNTERS.append(name)
+        index = self.index
+
+        def increment(self, value=1):
+            self._increment(index, value)
+
+        increment.__name__ = f'{name}_increment'
+        setattr(owner, increment.__name__, increment)
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj._get(self.index)
+
+    def __set__(self, obj, value):
+        obj._set(self.index, value)
+
+
 class ExecutionCounter:
-    def __init__(self, total=0):
+    # Names of the counters, in the order of the shared array
+    COUNTERS = []
+
+    def __init__(self, total=0, flush_interval=0.5):
         '''
         Most of the stats are at test instance level
         Except that case statistics are for cases of ALL test instances
@@ -84,66 +118,130 @@ class ExecutionCounter:
 
         pass rate = passed / (total - filtered_configs)
         case pass rate = passed_cases / (cases - filtered_cases - skipped_cases)
+
+        All counters live in a single shared memory array. Increments are
+        accumulated in the calling process and added to the array at most
+        every flush_interval seconds, or on flush(), so that workers do not
+        serialize on locks for each counter they update. report_out() flushes
+        once per instance and reports the values read in the same step, so
+        that each instance gets its own done count.
         '''
-        # instances that go through the pipeline
-        # updated by report_out()
-        self._done = Value('i', 0)
+        self._counters = Array('q', len(self.COUNTERS))
+        self.flush_interval = flush_interval
+        self._pid = os.getpid()
+        self._deltas = [0] * len(self.COUNTERS)
+        self._last_flush = time.monotonic()
+
+        self.lock = Lock()
+        self.total = total
 
-        # iteration
-        self._iteration = Value('i', 0)
+    # instances that go through the pipeline
+    # updated by report_out()
+    done = _Counter()
 
-        # instances that actually executed and passed
-        # updated by report_out()
-        self._passed = Value('i', 0)
+    # iteration
+    iteration = _Counter()
 
-        # instances that are built but not runnable
-        # updated by report_out()
-        self._notrun = Value('i', 0)
+    # instances that actually executed and passed
+    # updated by report_out()
+    passed = _Counter()
 
-        # static filter + runtime filter + build skipped
-        # updated by update_counting_before_pipeline() and report_out()
-        self._filtered_configs = Value('i', 0)
+    # instances that are built but not runnable
+    # updated by report_out()
+    notrun = _Counter()
 
-        # cmake filter + build skipped
-        # updated by report_out()
-        self._filtered_runtime = Value('i', 0)
+    # static filter + runtime filter + build skipped
+    # updated by update_counting_before_pipeline() and report_out()
+    filtered_configs = _Counter()
 
-        # static filtered at yaml parsing time
-        # updated by update_counting_before_pipeline()
-        self._filtered_static = Value('i', 0)
+    # cmake filter + build skipped
+    # updated by report_out()
+    filtered_runtime = _Counter()
 
-        # updated by report_out() in pipeline
-        self._error = Value('i', 0)
-        self._failed = Value('i', 0)
-        self._skipped = Value('i', 0)
+    # static filtered at yaml parsing time
+    # updated by update_counting_before_pipeline()
+    filtered_static = _Counter()
 
-        # initialized to number of test instances
-        self._total = Value('i', total)
+    # updated by report_out() in pipeline
+    error = _Counter()
+    failed = _Counter()
+    skipped = _Counter()
 
-        #######################################
-        # TestCase counters for all instances #
-        #######################################
-        # updated in report_out
-        self._cases = Value('i', 0)
+    # initialized to number of test instances
+    total = _Counter()
 
-        # updated by update_counting_before_pipeline() and report_out()
-        self._skipped_cases = Value('i', 0)
-        self._filtered_cases = Value('i', 0)
+    #######################################
+    # TestCase counters for all instances #
+    #######################################
+    # updated in report_out
+    cases = _Counter()
 
-        # updated by report_out() in pipeline
-        self._passed_cases = Value('i', 0)
-        self._notrun_cases = Value('i', 0)
-        self._failed_cases = Value('i', 0)
-        self._error_cases = Value('i', 0)
-        self._blocked_cases = Value('i', 0)
+    # updated by update_counting_before_pipeline() and report_out()
+    skipped_cases = _Counter()
+    filtered_cases = _Counter()
 
-        # Incorrect statuses
-        self._none_cases = Value('i', 0)
-        self._started_cases = Value('i', 0)
+    # updated by report_out() in pipeline
+    passed_cases = _Counter()
+    notrun_cases = _Counter()
+    failed_cases = _Counter()
+    error_cases = _Counter()
+    blocked_cases = _Counter()
 
-        self._warnings = Value('i', 0)
+    # Incorrect statuses
+    none_cases = _Counter()
+    started_cases = _Counter()
 
-        self.lock = Lock()
+    warnings = _Counter()
+
+    def flush(self):
+        """Add the increments made by this process to the shared counters.
+
+        Returns the values of all counters, read at once with the update.
+        """
+        deltas = self._get_deltas()
+        with self._counters.get_lock():
+            counters = self._counters.get_obj()
+            for index, delta in enumerate(deltas):
+                if delta:
+                    counters[index] += delta
+                    deltas[index] = 0
+            values = counters[:]
+        self._last_flush = time.monotonic()
+        return dict(zip(self.COUNTERS, values, strict=True))
+
+    def snapshot(self):
+        """Return the values of all counters, read at once."""
+        deltas = self._get_deltas()
+        with self._counters.get_lock():
+            values = self._counters.get_obj()[:]
+        return {
+            name: value + delta
+            for name, value, delta in zip(self.COUNTERS, values, deltas, strict=True)
+        }
+
+    def _get_deltas(self):
+        if self._pid != os.getpid():
+            # Forked: the increments of the parent are not ours to flush
+            self._pid = os.getpid()
+            self._deltas = [0] * len(self.COUNTERS)
+            self._last_flush = time.monotonic()
+        return self._deltas
+
+    def _get(self, index):
+        deltas = self._get_deltas()
+        with self._counters.get_lock():
+            return self._counters.get_obj()[index] + deltas[index]
+
+    def _set(self, index, value):
+        deltas = self._get_deltas()
+        with self._counters.get_lock():
+            self._counters.get_obj()[index] = value
+            deltas[index] = 0
+
+    def _increment(self, index, value):
+        self._get_deltas()[index] += value
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
 
     @staticmethod
     def _find_number_length(n):
@@ -203,314 +301,6 @@ class ExecutionCounter:
         for pre, _, node in RenderTree(root):
             print(f"{pre}{node.name}")
 
-    @property
-    def warnings(self):
-        with self._warnings.get_lock():
-            return self._warnings.value
-
-    @warnings.setter
-    def warnings(self, value):
-        with self._warnings.get_lock():
-            self._warnings.value = value
-
-    def warnings_increment(self, value=1):
-        with self._warnings.get_lock():
-            self._warnings.value += value
-
-    @property
-    def cases(self):
-        with self._cases.get_lock():
-            return self._cases.value
-
-    @cases.setter
-    def cases(self, value):
-        with self._cases.get_lock():
-            self._cases.value = value
-
-    def cases_increment(self, value=1):
-        with self._cases.get_lock():
-            self._cases.value += value
-
-    @property
-    def skipped_cases(self):
-        with self._skipped_cases.get_lock():
-            return self._skipped_cases.value
-
-    @skipped_cases.setter
-    def skipped_cases(self, value):
-        with self._skipped_cases.get_lock():
-            self._skipped_cases.value = value
-
-    def skipped_cases_increment(self, value=1):
-        with self._skipped_cases.get_lock():
-            self._skipped_cases.value += value
-
-    @property
-    def filtered_cases(self):
-        with self._filtered_cases.get_lock():
-            return self._filtered_cases.value
-
-    @filtered_cases.setter
-    def filtered_cases(self, value):
-        with self._filtered_cases.get_lock():
-            self._filtered_cases.value = value
-
-    def filtered_cases_increment(self, value=1):
-        with self._filtered_cases.get_lock():
-            self._filtered_cases.value += value
-
-    @property
-    def passed_cases(self):
-        with self._passed_cases.get_lock():
-            return self._passed_cases.value
-
-    @passed_cases.setter
-    def passed_cases(self, value):
-        with self._passed_cases.get_lock():
-            self._passed_cases.value = value
-
-    def passed_cases_increment(self, value=1):
-        with self._passed_cases.get_lock():
-            self._passed_cases.value += value
-
-    @property
-    def notrun_cases(self):
-        with self._notrun_cases.get_lock():
-            return self._notrun_cases.value
-
-    @notrun_cases.setter
-    def notrun_cases(self, value):
-        with self._notrun.get_lock():
-            self._notrun.value = value
-
-    def notrun_cases_increment(self, value=1):
-        with self._notrun_cases.get_lock():
-            self._notrun_cases.value += value
-
-    @property
-    def failed_cases(self):
-        with self._failed_cases.get_lock():
-            return self._failed_cases.value
-
-    @failed_cases.setter
-    def failed_cases(self, value):
-        with self._failed_cases.get_lock():
-            self._failed_cases.value = value
-
-    def failed_cases_increment(self, value=1):
-        with self._failed_cases.get_lock():
-            self._failed_cases.value += value
-
-    @property
-    def error_cases(self):
-        with self._error_cases.get_lock():
-            return self._error_cases.value
-
-    @error_cases.setter
-    def error_cases(self, value):
-        with self._error_cases.get_lock():
-            self._error_cases.value = value
-
-    def error_cases_increment(self, value=1):
-        with self._error_cases.get_lock():
-            self._error_cases.value += value
-
-    @property
-    def blocked_cases(self):
-        with self._blocked_cases.get_lock():
-            return self._blocked_cases.value
-
-    @blocked_cases.setter
-    def blocked_cases(self, value):
-        with self._blocked_cases.get_lock():
-            self._blocked_cases.value = value
-
-    def blocked_cases_increment(self, value=1):
-        with self._blocked_cases.get_lock():
-            self._blocked_cases.value += value
-
-    @property
-    def none_cases(self):
-        with self._none_cases.get_lock():
-            return self._none_cases.value
-
-    @none_cases.setter
-    def none_cases(self, value):
-        with self._none_cases.get_lock():
-            self._none_cases.value = value
-
-    def none_cases_increment(self, value=1):
-        with self._none_cases.get_lock():
-            self._none_cases.value += value
-
-    @property
-    def started_cases(self):
-        with self._started_cases.get_lock():
-            return self._started_cases.value
-
-    @started_cases.setter
-    def started_cases(self, value):
-        with self._started_cases.get_lock():
-            self._started_cases.value = value
-
-    def started_cases_increment(self, value=1):
-        with self._started_cases.get_lock():
-            self._started_cases.value += value
-
-    @property
-    def skipped(self):
-        with self._skipped.get_lock():
-            return self._skipped.value
-
-    @skipped.setter
-    def skipped(self, value):
-        with self._skipped.get_lock():
-            self._skipped.value = value
-
-    def skipped_increment(self, value=1):
-        with self._skipped.get_lock():
-            self._skipped.value += value
-
-    @property
-    def error(self):
-        with self._error.get_lock():
-            return self._error.value
-
-    @error.setter
-    def error(self, value):
-        with self._error.get_lock():
-            self._error.value = value
-
-    def error_increment(self, value=1):
-        with self._error.get_lock():
-            self._error.value += value
-
-    @property
-    def iteration(self):
-        with self._iteration.get_lock():
-            return self._iteration.value
-
-    @iteration.setter
-    def iteration(self, value):
-        with self._iteration.get_lock():
-            self._iteration.value = value
-
-    def iteration_increment(self, value=1):
-        with self._iteration.get_lock():
-            self._iteration.value += value
-
-    @property
-    def done(self):
-        with self._done.get_lock():
-            return self._done.value
-
-    @done.setter
-    def done(self, value):
-        with self._done.get_lock():
-            self._done.value = value
-
-    def done_increment(self, value=1):
-        with self._done.get_lock():
-            self._done.value += value
-
-    @property
-    def passed(self):
-        with self._passed.get_lock():
-            return self._passed.value
-
-    @passed.setter
-    def passed(self, value):
-        with self._passed.get_lock():
-            self._passed.value = value
-
-    def passed_increment(self, value=1):
-        with self._passed.get_lock():
-            self._passed.value += value
-
-    @property
-    def notrun(self):
-        with self._notrun.get_lock():
-            return self._notrun.value
-
-    @notrun.setter
-    def notrun(self, value):
-        with self._notrun.get_lock():
-            self._notrun.value = value
-
-    def notrun_increment(self, value=1):
-        with self._notrun.get_lock():
-            self._notrun.value += value
-
-    @property
-    def filtered_configs(self):
-        with self._filtered_configs.get_lock():
-            return self._filtered_configs.value
-
-    @filtered_configs.setter
-    def filtered_configs(self, value):
-        with self._filtered_configs.get_lock():
-            self._filtered_configs.value = value
-
-    def filtered_configs_increment(self, value=1):
-        with self._filtered_configs.get_lock():
-            self._filtered_configs.value += value
-
-    @property
-    def filtered_static(self):
-        with self._filtered_static.get_lock():
-            return self._filtered_static.value
-
-    @filtered_static.setter
-    def filtered_static(self, value):
-        with self._filtered_static.get_lock():
-            self._filtered_static.value = value
-
-    def filtered_static_increment(self, value=1):
-        with self._filtered_static.get_lock():
-            self._filtered_static.value += value
-
-    @property
-    def filtered_runtime(self):
-        with self._filtered_runtime.get_lock():
-            return self._filtered_runtime.value
-
-    @filtered_runtime.setter
-    def filtered_runtime(self, value):
-        with self._filtered_runtime.get_lock():
-            self._filtered_runtime.value = value
-
-    def filtered_runtime_increment(self, value=1):
-        with self._filtered_runtime.get_lock():
-            self._filtered_runtime.value += value
-
-    @property
-    def failed(self):
-        with self._failed.get_lock():
-            return self._failed.value
-
-    @failed.setter
-    def failed(self, value):
-        with self._failed.get_lock():
-            self._failed.value = value
-
-    def failed_increment(self, value=1):
-        with self._failed.get_lock():
-            self._failed.value += value
-
-    @property
-    def total(self):
-        with self._total.get_lock():
-            return self._total.value
-
-    @total.setter
-    def total(self, value):
-        with self._total.get_lock():
-            self._total.value = value
-
-    def total_increment(self, value=1):
-        with self._total.get_lock():
-            self._total.value += value
-
 class CMake:
     config_re = re.compile('(CONFIG_[A-Za-z0-9_]+)[=]\"?([^\"]*)\"?$')
     dt_re = re.compile('([A-Za-z0-9_]+)[=]\"?([^\"]*)\"?$')
@@ -532,6 +322,7 @@ class CMake:
 
         self.default_encoding = sys.getdefaultencoding()
         self.jobserver = jobserver
+        self.filter_cache = None
 
     def parse_generated(self, filter_stages=None):
         self.defconfig = {}
@@ -710,6 +501,23 @@ class CMake:
 
         if filter_stages:
             cmd += cmake_filter_args
+            if self.filter_cache:
+                cache_key = self.filter_cache.key(cmd, self.source_dir, self.build_dir)
+                if self.filter_cache.restore(cache_key, self.build_dir):
+                    logger.debug(
+                        f"Reusing cached {','.join(filter_stages)} filter stage outputs"
+                        f" for {self.source_dir} on {self.platform.name}"
+                    )
+                    with open(
+                        os.path.join(self.build_dir, self.log),
+                        "a",
+                        encoding=self.default_encoding
+                    ) as log:
+                        log.write(f"Filter stage outputs restored from cache entry {cache_key}\n")
+                    return {
+                        'returncode': 0,
+                        'filter': self.parse_generated(filter_stages)
+                    }
 
         kwargs = dict()
 
@@ -734,6 +542,8 @@ class CMake:
         self.instance.build_time += duration
 
         if p.returncode == 0:
+            if filter_stages and self.filter_cache:
+                self.filter_cache.store(cache_key, self.build_dir)
             filter_results = self.parse_generated(filter_stages)
             msg = (
                 f"Finished running cmake {self.source_dir} for {self.platform.name}"
@@ -826,20 +636,26 @@ class FilterBuilder(CMake):
 
         self.cmake_cache = cmake_conf
 
-        filter_data = {
+        # The first layers take precedence; chaining them avoids copying the
+        # whole environment for every instance.
+        layers = [self.cmake_cache]
+        if not filter_stages or "kconfig" in filter_stages:
+            layers.append(self.defconfig)
+        layers.append(os.environ)
+        layers.append({
             "ARCH": self.platform.arch,
             "PLATFORM": self.platform.name
-        }
-        filter_data.update(os.environ)
-        if not filter_stages or "kconfig" in filter_stages:
-            filter_data.update(self.defconfig)
-        filter_data.update(self.cmake_cache)
+        })
+        filter_data = ChainMap(*layers)
 
         if self.testsuite and self.testsuite.filter:
             try:
                 if os.path.exists(edt_pickle):
-                    with open(edt_pickle, 'rb') as f:
-                        edt = pickle.load(f)
+                    # dt_compat_enabled() is answered from the lookup tables
+                    # of the snapshot. The other dt_* filters check the
+                    # status or properties of nodes, which unpickles the EDT
+                    # on first use.
+                    edt = edtlib.EDTSnapshot(edt_pickle)
                 else:
                     edt = None
                 ret = expr_parser.parse(self.testsuite.filter, filter_data, edt)
@@ -865,8 +681,8 @@ class FilterBuilder(CMake):
                     ): False
                 }
         else:
-            self.platform.filter_data = filter_data
-            return filter_data
+            self.platform.filter_data = dict(filter_data)
+            return self.platform.filter_data
 
 
 class ProjectBuilder(FilterBuilder):
@@ -886,6 +702,18 @@ class ProjectBuilder(FilterBuilder):
         self.options = env.options
         self.env = env
         self.duts: list[DUT] = []
+        # Journal of the results, see ReportJournal
+        self.journal = None
+        if not self.options.no_filter_cache:
+            self.filter_cache = ProjectBuilder._get_filter_cache(
+                self.options.filter_cache_dir or os.path.join(self.options.outdir, "filter_cache")
+            )
+
+    @staticmethod
+    @functools.cache
+    def _get_filter_cache(cache_dir):
+        # One cache object per process, to share its in-memory signatures
+        return FilterCache(cache_dir)
 
     @property
     def trace(self) -> bool:
@@ -1530,8 +1358,6 @@ class ProjectBuilder(FilterBuilder):
 
 
     def report_out(self, results):
-        total_to_do = results.total - results.filtered_static
-        total_tests_width = len(str(total_to_do))
         results.done_increment()
         instance = self.instance
         if results.iteration == 1:
@@ -1539,6 +1365,11 @@ class ProjectBuilder(FilterBuilder):
 
         self._add_instance_testcases_to_status_counts(instance, results)
 
+        if self.journal:
+            # Set by the runner in the main process for the final reports
+            instance.metrics["handler_time"] = instance.execution_time
+            self.journal.add(instance)
+
         status = (
             f'{TwisterStatus.get_color(instance.status)}{str.upper(instance.status)}{Fore.RESET}'
         )
@@ -1578,6 +1409,14 @@ class ProjectBuilder(FilterBuilder):
             logger.debug(f"Unknown status = {instance.status}")
             status = Fore.YELLOW + "UNKNOWN" + Fore.RESET
 
+        # a consistent view of the counters, read at once with the
+        # increments of this instance so that no other worker reports the
+        # same done count
+        counters = results.flush()
+        total_to_do = counters['total'] - counters['filtered_static']
+        total_tests_width = len(str(total_to_do))
+        unfiltered = counters['done'] - counters['filtered_static']
+
         if self.options.verbose:
             if self.options.cmake_only:
                 more_info = "cmake"
@@ -1601,7 +1440,7 @@ class ProjectBuilder(FilterBuilder):
                 if instance.toolchain:
                     more_info += f" <{instance.toolchain}>"
             logger.info(
-                f"{results.done - results.filtered_static:>{total_tests_width}}/{total_to_do}"
+                f"{unfiltered:>{total_tests_width}}/{total_to_do}"
                 f" {name_columns(instance, 25, 50)}"
                 f" {status} ({more_info})"
             )
@@ -1619,37 +1458,40 @@ class ProjectBuilder(FilterBuilder):
             completed_perc = 0
             if total_to_do > 0:
                 completed_perc = int(
-                    (float(results.done - results.filtered_static) / total_to_do) * 100
+                    (float(unfiltered) / total_to_do) * 100
                 )
 
-            unfiltered = results.done - results.filtered_static
             complete_section = (
                 f"{TwisterStatus.get_color(TwisterStatus.PASS)}"
                 f"{unfiltered:>4}/{total_to_do:>4}"
                 f"{Fore.RESET}  {completed_perc:>2}%"
             )
             notrun_section = (
-                f"{TwisterStatus.get_color(TwisterStatus.NOTRUN)}{results.notrun:>4}{Fore.RESET}"
+                f"{TwisterStatus.get_color(TwisterStatus.NOTRUN)}{counters['notrun']:>4}{Fore.RESET}"
             )
             filtered_section_color = (
                 TwisterStatus.get_color(TwisterStatus.SKIP)
-                if results.filtered_configs > 0
+                if counters['filtered_configs'] > 0
                 else Fore.RESET
             )
             filtered_section = (
-                f"{filtered_section_color}{results.filtered_configs:>4}{Fore.RESET}"
+                f"{filtered_section_color}{counters['filtered_configs']:>4}{Fore.RESET}"
             )
             failed_section_color = (
-                TwisterStatus.get_color(TwisterStatus.FAIL) if results.failed > 0 else Fore.RESET
+                TwisterStatus.get_color(TwisterStatus.FAIL)
+                if counters['failed'] > 0
+                else Fore.RESET
             )
             failed_section = (
-                f"{failed_section_color}{results.failed:>4}{Fore.RESET}"
+                f"{failed_section_color}{counters['failed']:>4}{Fore.RESET}"
             )
             error_section_color = (
-                TwisterStatus.get_color(TwisterStatus.ERROR) if results.error > 0 else Fore.RESET
+                TwisterStatus.get_color(TwisterStatus.ERROR)
+                if counters['error'] > 0
+                else Fore.RESET
             )
             error_section = (
-                f"{error_section_color}{results.error:>4}{Fore.RESET}"
+                f"{error_section_color}{counters['error']:>4}{Fore.RESET}"
             )
             sys.stdout.write(
                 f"INFO    - Total complete: {complete_section}"
@@ -1825,19 +1667,19 @@ class TwisterRunner:
         self.jobs = 1
         self.results = None
         self.jobserver = None
+        self.journal = None
 
     def run(self):
 
         retries = self.options.retry_failed + 1
 
-        BaseManager.register('deque', deque, exposed=['append', 'appendleft', 'pop'])
         BaseManager.register('get_dict', dict)
         manager = BaseManager()
         manager.start()
 
         self.results = ExecutionCounter(total=len(self.instances))
         self.iteration = 0
-        processing_queue: deque = manager.deque()
+        processing_queue = PipelineScheduler()
         processing_ready: dict[str, TestInstance] = manager.get_dict()
 
         # Set number of jobs
@@ -1863,6 +1705,14 @@ class TwisterRunner:
 
         self.update_counting_before_pipeline()
 
+        if self.journal:
+            # Instances with a result before the run, e.g. statically filtered,
+            # are not reported by the pipeline. Those run again are journaled
+            # again with their new result.
+            for instance in self.instances.values():
+                if instance.status != TwisterStatus.NONE:
+                    self.journal.add(instance)
+
         while True:
             self.results.iteration_increment()
 
@@ -1877,6 +1727,8 @@ class TwisterRunner:
             else:
                 self.results.done = self.results.filtered_static + self.results.skipped
 
+            # the workers only see the counters updated so far once flushed
+            self.results.flush()
             self.execute(processing_queue, processing_ready)
 
             for inst in processing_ready.values():
@@ -1893,6 +1745,9 @@ class TwisterRunner:
             if retries == 0 or ( self.results.failed == 0 and not retry_errors):
                 break
 
+        if self.journal:
+            self.journal.finish(self.results.snapshot())
+
         self.show_brief()
 
     def update_counting_before_pipeline(self):
@@ -1924,7 +1779,7 @@ class TwisterRunner:
 
     def add_tasks_to_queue(
         self,
-        processing_queue: deque,
+        processing_queue: PipelineScheduler,
         build_only=False,
         test_only=False,
         retry_build_errors=False
@@ -1996,18 +1851,15 @@ class TwisterRunner:
         return not found_failed_app
 
     def are_required_apps_processed(
-            self, instance: TestInstance, processing_queue: deque,
+            self, instance: TestInstance, processing_queue: PipelineScheduler,
             processing_ready: dict[str, TestInstance], task
     ) -> bool:
         if not instance.required_applications:
             return True
 
         if not self._are_required_apps_ready(instance, processing_ready):
-            # required app not ready yet,
-            # add the task back to the pipeline to process it later
-            if self.jobs > 1:
-                # to avoid busy waiting
-                time.sleep(1)
+            # required app not ready yet, give the task back to the scheduler,
+            # which releases it again once a required app gets reported
             processing_queue.appendleft(task)
             return False
 
@@ -2029,38 +1881,40 @@ class TwisterRunner:
         return True
 
     def process_tasks(
-            self, processing_queue: deque, processing_ready: dict[str, TestInstance],
+            self, processing_queue: PipelineScheduler, processing_ready: dict[str, TestInstance],
             lock, results: ExecutionCounter
     ) -> bool:
-        while True:
-            try:
-                task = processing_queue.pop()
-            except IndexError:
-                break
-            else:
-                instance: TestInstance = task['test']
+        try:
+            while True:
+                try:
+                    task = processing_queue.pop()
+                except IndexError:
+                    break
+                else:
+                    instance: TestInstance = task['test']
 
-                if not self.are_required_apps_processed(
-                    instance, processing_queue, processing_ready, task
-                ):
-                    # postpone processing task if required applications are not ready
-                    continue
-
-                pb = ProjectBuilder(instance, self.env, self.jobserver)
-                pb.duts = self.duts
-                pb.process(processing_queue, processing_ready, task, lock, results)
-                if (
-                    self.env.options.quit_on_failure
-                    and pb.instance.status in [TwisterStatus.FAIL, TwisterStatus.ERROR]
-                ):
-                    try:
-                        while True:
-                            processing_queue.pop()
-                    except IndexError:
-                        pass
+                    if not self.are_required_apps_processed(
+                        instance, processing_queue, processing_ready, task
+                    ):
+                        # postpone processing task if required applications are not ready
+                        continue
+
+                    pb = ProjectBuilder(instance, self.env, self.jobserver)
+                    pb.duts = self.duts
+                    pb.journal = self.journal
+                    pb.process(processing_queue, processing_ready, task, lock, results)
+                    processing_queue.task_done(task)
+                    if (
+                        self.env.options.quit_on_failure
+                        and pb.instance.status in [TwisterStatus.FAIL, TwisterStatus.ERROR]
+                    ):
+                        processing_queue.abort()
+        finally:
+            results.flush()
         return True
 
-    def pipeline_mgr(self, processing_queue: deque, processing_ready: dict[str, TestInstance],
+    def pipeline_mgr(self, processing_queue: PipelineScheduler,
+                     processing_ready: dict[str, TestInstance],
                      lock, results: ExecutionCounter):
         try:
             if sys.platform == 'linux':
@@ -2072,11 +1926,13 @@ class TwisterRunner:
             logger.error(f"General exception: {e}\n{traceback.format_exc()}")
             sys.exit(1)
 
-    def execute(self, processing_queue: deque, processing_ready: dict[str, TestInstance]):
+    def execute(self, processing_queue: PipelineScheduler,
+                processing_ready: dict[str, TestInstance]):
         lock = Lock()
         logger.info("Adding tasks to the queue...")
         self.add_tasks_to_queue(processing_queue, self.options.build_only, self.options.test_only,
                                 retry_build_errors=self.options.retry_build_errors)
+        processing_queue.seal(processing_ready)
         logger.info("Added initial list of jobs to queue")
 
         processes = []
@@ -2089,6 +1945,7 @@ class TwisterRunner:
         logger.debug(f"Launched {self.jobs} jobs")
 
         try:
+            processing_queue.schedule(processes)
             for p in processes:
                 p.join()
                 if p.exitcode != 0:
@@ -2096,6 +1953,7 @@ class TwisterRunner:
                     for proc in processes:
                         proc.terminate()
                     sys.exit(1)
+            processing_queue.log_stage_times()
         except KeyboardInterrupt:
             logger.info("Execution interrupted")
             for p in processes:
@@ -0,0 +1,237 @@
+# Copyright The Zephyr Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+"""Dependency-aware scheduling of pipeline tasks over worker processes."""
+
+import logging
+import multiprocessing as mp
+import queue
+import time
+from collections import deque
+
+from twisterlib.statuses import TwisterStatus
+
+logger = logging.getLogger('twister')
+
+
+class PipelineScheduler:
+    """Hand pipeline tasks out to the twister worker processes.
+
+    Each test instance goes through a chain of pipeline stages (filter,
+    cmake, build, run, report, ...). A chain is executed by one worker: the
+    stage following the current one is pushed to the worker's local queue
+    and taken next, without any inter-process communication. Only the first
+    stage of each chain goes through the ready queue shared by all workers,
+    from which idle workers pick up new chains.
+
+    Required applications are explicit edges of the task graph. An instance
+    is released to the ready queue only once all of its required
+    applications have been reported, so workers never have to wait or poll
+    for them.
+
+    The task graph is owned by the main process, see schedule(). Workers
+    notify it of their progress through an event queue, which is also used
+    to collect how long every stage waited to be scheduled and how long it
+    ran.
+    """
+
+    def __init__(self, liveness_interval=1.0):
+        self.liveness_interval = liveness_interval
+        # stage name -> [count, waiting time, running time]
+        self.stage_times = {}
+        self._local = deque()
+        self._ready = mp.Queue()
+        self._events = mp.Queue()
+        self._stop = mp.Event()
+        self._reported = set()
+        self._blocked = {}
+        self._dependents = {}
+        self._released = 0
+        self._finished = 0
+
+    # Worker side
+
+    def append(self, task):
+        """Queue a task on the local queue of the calling process."""
+        task['queued'] = time.time()
+        self._local.append(task)
+
+    def appendleft(self, task):
+        """Give a task back to the scheduler, to be retried later.
+
+        The task is held back in the task graph until one of the
+        applications it requires gets reported.
+        """
+        task.pop('started', None)
+        self._events.put(('deferred', task))
+
+    def pop(self):
+        """Return the next task for the calling worker.
+
+        Tasks from the local queue are taken first; when it is empty, block
+        until a new chain is released to the ready queue.
+
+        Raises IndexError once there is no more work to hand out.
+        """
+        if self._stop.is_set():
+            self._local.clear()
+            raise IndexError('pop from a stopped scheduler')
+        if self._local:
+            task = self._local.pop()
+        else:
+            task = self._ready.get()
+            if task is None:
+                raise IndexError('pop from an exhausted scheduler')
+        task['started'] = time.time()
+        return task
+
+    def task_done(self, task):
+        """Notify the scheduler that a task popped by this worker was processed."""
+        name = task['test'].name
+        op = task.get('op')
+        started = task.get('started', time.time())
+        waited = started - task.get('queued', started)
+        self._events.put(('stage', op, waited, time.time() - started))
+        if op == 'report':
+            self._events.put(('reported', name))
+        if not self._local:
+            self._events.put(('finished', name))
+
+    def abort(self):
+        """Stop handing out tasks, to all workers."""
+        self._local.clear()
+        self._stop.set()
+        self._events.put(('abort', None))
+
+    # Main process side
+
+    def seal(self, processing_ready):
+        """Build the task graph from the tasks queued so far.
+
+        Must be called from the main process before the workers are started.
+        Applications found in processing_ready, which are not scheduled again,
+        are considered as already reported.
+        """
+        tasks = list(self._local)
+        self._local.clear()
+        self._stop.clear()
+        self._drain_ready()
+
+        scheduled = {task['test'].name for task in tasks}
+        self._reported = set(processing_ready.keys()) - scheduled
+        self._blocked = {}
+        self._dependents = {}
+        self._released = 0
+        self._finished = 0
+        self.stage_times = {}
+
+        for task in tasks:
+            self._submit(task)
+        logger.debug(
+            f"Scheduled {len(tasks)} tasks, {len(self._blocked)} waiting for required applications"
+        )
+
+    def schedule(self, processes):
+        """Drive the task graph until all released chains are finished.
+
+        Runs in the main process while the workers are executing. Returns
+        once all tasks are processed, the execution is aborted or all the
+        workers are gone; the workers are then told to exit.
+        """
+        while self._blocked or self._finished < self._released:
+            if self._released == self._finished:
+                # Nothing is running anymore, so nothing will ever unblock
+                # the instances that are still waiting.
+                self._release_stuck()
+                continue
+            try:
+                event = self._events.get(timeout=self.liveness_interval)
+            except queue.Empty:
+                if any(p.exitcode for p in processes):
+                    # A worker crashed, its chain will never be finished
+                    break
+                if not any(p.is_alive() for p in processes):
+                    logger.error("All workers exited before the end of the execution")
+                    break
+                continue
+            if not self._handle_event(event):
+                break
+
+        for _ in processes:
+            self._ready.put(None)
+
+    def log_stage_times(self):
+        """Log how long the pipeline stages waited to be scheduled and how long they ran."""
+        if not self.stage_times:
+            return
+        logger.info("Pipeline stages (tasks, total waiting time, total running time):")
+        for op, (count, waited, ran) in self.stage_times.items():
+            logger.info(f"  {op:<15} {count:>6} {waited:>10.2f}s {ran:>10.2f}s")
+
+    def _handle_event(self, event):
+        kind, *args = event
+        if kind == 'stage':
+            op, waited, ran = args
+            times = self.stage_times.setdefault(op, [0, 0.0, 0.0])
+            times[0] += 1
+            times[1] += waited
+            times[2] += ran
+        elif kind == 'reported':
+            self._on_reported(args[0])
+        elif kind == 'finished':
+            self._finished += 1
+        elif kind == 'deferred':
+            # The chain leaves the worker without being finished
+            self._released -= 1
+            self._submit(args[0])
+        elif kind == 'abort':
+            logger.debug("Execution aborted, dropping remaining tasks")
+            self._drain_ready()
+            return False
+        return True
+
+    def _submit(self, task):
+        instance = task['test']
+        pending = {app for app in instance.required_applications if app not in self._reported}
+        if not pending:
+            self._release(task)
+            return
+        self._blocked[instance.name] = (task, pending)
+        for app in pending:
+            self._dependents.setdefault(app, []).append(instance.name)
+
+    def _release(self, task):
+        task['queued'] = time.time()
+        self._released += 1
+        self._ready.put(task)
+
+    def _on_reported(self, name):
+        self._reported.add(name)
+        for dependent in self._dependents.pop(name, []):
+            entry = self._blocked.get(dependent)
+            if entry is None:
+                continue
+            task, pending = entry
+            pending.discard(name)
+            if not pending:
+                del self._blocked[dependent]
+                self._release(task)
+
+    def _release_stuck(self):
+        for task, pending in self._blocked.values():
+            instance = task['test']
+            instance.status = TwisterStatus.ERROR
+            instance.reason = f"Required applications not processed: {', '.join(sorted(pending))}"
+            instance.add_missing_case_status(TwisterStatus.BLOCK, instance.reason)
+            instance.required_applications = []
+            logger.error(f"{instance.name}: {instance.reason}")
+            self._release({'op': 'report', 'test': instance})
+        self._blocked = {}
+        self._dependents = {}
+
+    def _drain_ready(self):
+        try:
+            while True:
+                self._ready.get_nowait()
+        except queue.Empty:
+            pass
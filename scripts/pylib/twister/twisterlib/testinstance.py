@@ -93,8 +93,9 @@ class TestInstance:
         self.sysbuild = testsuite.sysbuild or platform.sysbuild
 
         self.run = False
-        self.testcases: list[TestCase] = []
-        self.init_cases()
+        # Created on first use, see the testcases property
+        self._testcases: list[TestCase] | None = None
+        self._missing_case_status = None
         self.filters = []
         self.filter_type = None
         self.required_applications = []
@@ -128,6 +129,9 @@ class TestInstance:
 
     @status.setter
     def status(self, value : TwisterStatus) -> None:
+        if isinstance(value, TwisterStatus):
+            self._status = value
+            return
         # Check for illegal assignments by value
         try:
             key = value.name if isinstance(value, Enum) else value
@@ -141,6 +145,22 @@ class TestInstance:
         self.reason = reason
         self.filter_type = filter_type
 
+    @property
+    def testcases(self) -> list[TestCase]:
+        # Most instances of a large test plan are filtered out and their test
+        # cases never looked at, so they are only created when needed.
+        if self._testcases is None:
+            self._testcases = []
+            self.init_cases()
+            if self._missing_case_status is not None:
+                self.add_missing_case_status(*self._missing_case_status)
+                self._missing_case_status = None
+        return self._testcases
+
+    @testcases.setter
+    def testcases(self, value: list[TestCase]):
+        self._testcases = value
+
     # Fix an issue with copying objects from testsuite, need better solution.
     def init_cases(self):
         for c in self.testsuite.testcases:
@@ -166,15 +186,19 @@ class TestInstance:
         return run_id
 
     def add_missing_case_status(self, status, reason=None):
+        if not reason:
+            reason = self.reason
+        if self._testcases is None and self._missing_case_status is None:
+            # All the test cases still have to be created with no status,
+            # give them this one when they are.
+            self._missing_case_status = (status, reason)
+            return
         for case in self.testcases:
             if case.status == TwisterStatus.STARTED:
                 case.status = TwisterStatus.FAIL
             elif case.status == TwisterStatus.NONE:
                 case.status = status
-                if reason:
-                    case.reason = reason
-                else:
-                    case.reason = self.reason
+                case.reason = reason
 
     def __getstate__(self):
         d = self.__dict__.copy()
@@ -8,6 +8,7 @@
 import collections
 import copy
 import glob
+import heapq
 import itertools
 import json
 import logging
@@ -34,9 +35,11 @@ from twisterlib.config_parser import TwisterConfigParser
 from twisterlib.error import TwisterRuntimeError
 from twisterlib.platform import Platform, generate_platforms
 from twisterlib.quarantine import Quarantine
+from twisterlib.reports import iter_report_suites
 from twisterlib.statuses import TwisterStatus
 from twisterlib.testinstance import TestInstance
-from twisterlib.testsuite import TestSuite, scan_testsuite_path
+from twisterlib.testsuite import TestSuite, scan_testsuite_paths
+from twisterlib.testsuite_index import TestsuiteIndex, default_index_path
 from zephyr_module import parse_modules
 
 logger = logging.getLogger('twister')
@@ -52,6 +55,13 @@ from devicetree import edtlib  # pylint: disable=unused-import
 
 sys.path.insert(0, os.path.join(ZEPHYR_BASE, "scripts/"))
 
+# Properties of the test suites of a report used to load a test plan from
+# it, without e.g. their logs
+LOADED_SUITE_KEYS = {
+    "name", "toolchain", "platform", "run_id", "execution_time", "used_ram", "used_rom",
+    "available_ram", "available_rom", "status", "reason", "testcases",
+}
+
 
 class Filters:
     # platform keys
@@ -191,6 +201,9 @@ class TestPlan:
         self.run_individual_testsuite = []
         self.levels = []
         self.test_config =  None
+        # predicted build + execution time of test instances, in seconds
+        self.durations: dict[str, float] = {}
+        self._default_duration = None
 
         self.name = "unnamed"
 
@@ -260,6 +273,9 @@ class TestPlan:
             )
         else:
             last_run = os.path.join(self.options.outdir, "twister.json")
+        if not os.path.exists(last_run) and os.path.exists(last_run + "l"):
+            # The journal of a run which stopped before saving the reports
+            last_run += "l"
 
         if self.options.only_failed or self.options.report_summary is not None:
             self.load_from_file(last_run)
@@ -310,6 +326,81 @@ class TestPlan:
 
             self.generate_subset(subset, int(sets))
 
+        if self.durations and not self.options.shuffle_tests:
+            # Longest processing time first, so that long builds do not
+            # start last and stretch the tail of the run.
+            self.instances = OrderedDict(
+                sorted(
+                    self.instances.items(),
+                    key=lambda x: (-self.predicted_duration(x[0]), x[0])
+                )
+            )
+
+    def load_durations(self, report_files):
+        """Load build and execution times of test instances from previous
+        runs reports, to predict the duration of the instances of this run.
+        """
+        samples = collections.defaultdict(list)
+        for report_file in report_files:
+            try:
+                with open(report_file) as fp:
+                    report = json.load(fp)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Cannot load durations from {report_file}: {e}")
+                continue
+            for ts in report.get("testsuites", []):
+                try:
+                    duration = (
+                        float(ts.get("build_time", 0))
+                        + float(ts.get("execution_time", 0))
+                    )
+                except ValueError:
+                    continue
+                if duration <= 0:
+                    continue
+                name = os.path.join(ts["platform"], ts.get("toolchain", ""), ts["name"])
+                samples[name].append(duration)
+
+        self.durations = {
+            name: sum(values) / len(values) for name, values in samples.items()
+        }
+        self._default_duration = None
+        logger.info(
+            f"Loaded durations of {len(self.durations)} test configurations"
+            f" from {len(report_files)} report(s)"
+        )
+
+    def predicted_duration(self, name):
+        """Predicted duration of a test instance, in seconds.
+
+        Instances without any recorded duration are assumed to take
+        the average duration of the known ones.
+        """
+        if name in self.durations:
+            return self.durations[name]
+        if not self.durations:
+            return 0
+        if self._default_duration is None:
+            self._default_duration = sum(self.durations.values()) / len(self.durations)
+        return self._default_duration
+
+    def _split_by_duration(self, instances, sets):
+        """Split instances into sets of similar predicted duration.
+
+        Greedy longest-processing-time-first partitioning: every instance,
+        from the longest to the shortest, goes to the least loaded set.
+        The result only depends on the instances, so that all the subsets
+        of a run are computed consistently.
+        """
+        shards = [[] for _ in range(sets)]
+        loads = [(0.0, i) for i in range(sets)]
+        ordered = sorted(instances.items(), key=lambda x: (-self.predicted_duration(x[0]), x[0]))
+        for name, instance in ordered:
+            load, i = heapq.heappop(loads)
+            shards[i].append((name, instance))
+            heapq.heappush(loads, (load + self.predicted_duration(name), i))
+        return shards
+
     def generate_subset(self, subset, sets):
         # Test instances are sorted depending on the context. For CI runs
         # the execution order is: "plat1-testA, plat1-testB, ...,
@@ -339,22 +430,28 @@ class TestPlan:
         # This fixes an issue where some sets would get majority of skips and
         # basically run nothing beside filtering.
         to_run = {k : v for k,v in self.instances.items() if v.status == TwisterStatus.NONE}
-        total = len(to_run)
-        per_set = int(total / sets)
-        num_extra_sets = total - (per_set * sets)
-
-        # Try and be more fair for rounding error with integer division
-        # so the last subset doesn't get overloaded, we add 1 extra to
-        # subsets 1..num_extra_sets.
-        if subset <= num_extra_sets:
-            start = (subset - 1) * (per_set + 1)
-            end = start + per_set + 1
+        if self.durations:
+            # Balance the sets by predicted duration rather than by count
+            sliced_instances = self._split_by_duration(to_run, sets)[subset - 1]
+            predicted = sum(self.predicted_duration(name) for name, _ in sliced_instances)
+            logger.info(f"Predicted duration of subset {subset}/{sets}: {predicted:.0f}s")
         else:
-            base = num_extra_sets * (per_set + 1)
-            start = ((subset - num_extra_sets - 1) * per_set) + base
-            end = start + per_set
+            total = len(to_run)
+            per_set = int(total / sets)
+            num_extra_sets = total - (per_set * sets)
+
+            # Try and be more fair for rounding error with integer division
+            # so the last subset doesn't get overloaded, we add 1 extra to
+            # subsets 1..num_extra_sets.
+            if subset <= num_extra_sets:
+                start = (subset - 1) * (per_set + 1)
+                end = start + per_set + 1
+            else:
+                base = num_extra_sets * (per_set + 1)
+                start = ((subset - num_extra_sets - 1) * per_set) + base
+                end = start + per_set
 
-        sliced_instances = islice(to_run.items(), start, end)
+            sliced_instances = islice(to_run.items(), start, end)
         skipped = {k : v for k,v in self.instances.items() if v.status == TwisterStatus.SKIP}
         errors = {k : v for k,v in self.instances.items() if v.status == TwisterStatus.ERROR}
         self.instances = OrderedDict(sliced_instances)
@@ -544,6 +641,15 @@ class TestPlan:
             for pattern in testsuite_pattern:
                 testsuite_patterns_r.append(re.compile(pattern))
 
+        index = None
+        if not self.options.no_testsuite_index:
+            index = TestsuiteIndex(
+                self.options.testsuite_index or default_index_path(), self.suite_schema
+            )
+
+        # (test suite path, [(selected test suite, scenario data), ...])
+        loaded = []
+
         for root in self.env.test_roots:
             root = os.path.abspath(root)
 
@@ -573,14 +679,19 @@ class TestPlan:
                         suite_yaml_path = alt_config
                         break
 
+                suites = []
                 try:
-                    parsed_data = TwisterConfigParser(suite_yaml_path, self.suite_schema)
-                    parsed_data.load()
-                    subcases = None
-                    ztest_suite_names = None
-
-                    for name in parsed_data.scenarios:
-                        suite_dict = parsed_data.get_scenario(name)
+                    if index is not None:
+                        scenarios = index.get_scenarios(suite_yaml_path)
+                    else:
+                        parsed_data = TwisterConfigParser(suite_yaml_path, self.suite_schema)
+                        parsed_data.load()
+                        scenarios = {
+                            name: parsed_data.get_scenario(name)
+                            for name in parsed_data.scenarios
+                        }
+
+                    for name, suite_dict in scenarios.items():
                         suite = TestSuite(
                             root,
                             suite_path,
@@ -605,31 +716,55 @@ class TestPlan:
                                 suite.platform_allow,
                                 f"platform_allow in {suite.name}")
 
-                        if suite.harness in ['ztest', 'test']:
-                            if subcases is None:
-                                # scan it only once per testsuite
-                                subcases, ztest_suite_names = scan_testsuite_path(suite_path)
-                            suite.add_subcases(suite_dict, subcases, ztest_suite_names)
-                        else:
-                            suite.add_subcases(suite_dict)
-
-                        if suite.name in self.testsuites:
-                            msg = (
-                                f"test suite '{suite.name}' in '{suite.yamlfile}' is already added"
-                            )
-                            if suite.yamlfile == self.testsuites[suite.name].yamlfile:
-                                logger.debug(f"Skip - {msg}")
-                            else:
-                                msg = (
-                                    f"Duplicate {msg} from '{self.testsuites[suite.name].yamlfile}'"
-                                )
-                                raise TwisterRuntimeError(msg)
-                        else:
-                            self.testsuites[suite.name] = suite
+                        suites.append((suite, suite_dict))
 
                 except Exception as e:
                     logger.error(f"{suite_path}: can't load (skipping): {e!r}")
                     self.load_errors += 1
+                loaded.append((suite_path, suites))
+
+        # The sources of all selected ztest suites are scanned at once, so
+        # that it can be done in parallel, by as many jobs as the builds.
+        scan_paths = list(dict.fromkeys(
+            suite_path for suite_path, suites in loaded
+            if any(suite.harness in ['ztest', 'test'] for suite, _ in suites)
+        ))
+        if index is not None:
+            scans = index.scan_testsuite_paths(scan_paths, jobs=self.options.jobs)
+        else:
+            scans = scan_testsuite_paths(scan_paths, jobs=self.options.jobs)
+
+        for suite_path, suites in loaded:
+            try:
+                for suite, suite_dict in suites:
+                    if suite.harness in ['ztest', 'test']:
+                        if isinstance(scans[suite_path], Exception):
+                            raise scans[suite_path]
+                        subcases, ztest_suite_names = scans[suite_path]
+                        suite.add_subcases(suite_dict, subcases, ztest_suite_names)
+                    else:
+                        suite.add_subcases(suite_dict)
+
+                    if suite.name in self.testsuites:
+                        msg = (
+                            f"test suite '{suite.name}' in '{suite.yamlfile}' is already added"
+                        )
+                        if suite.yamlfile == self.testsuites[suite.name].yamlfile:
+                            logger.debug(f"Skip - {msg}")
+                        else:
+                            msg = (
+                                f"Duplicate {msg} from '{self.testsuites[suite.name].yamlfile}'"
+                            )
+                            raise TwisterRuntimeError(msg)
+                    else:
+                        self.testsuites[suite.name] = suite
+
+            except Exception as e:
+                logger.error(f"{suite_path}: can't load (skipping): {e!r}")
+                self.load_errors += 1
+
+        if index is not None:
+            index.save()
         return len(self.testsuites)
 
     def __str__(self):
@@ -665,85 +800,83 @@ class TestPlan:
         if filter_platform is None:
             filter_platform = []
         try:
-            with open(file) as json_test_plan:
-                jtp = json.load(json_test_plan)
-                instance_list = []
-                for ts in jtp.get("testsuites", []):
-                    logger.debug(f"loading {ts['name']}...")
-                    testsuite = ts["name"]
-                    toolchain = ts["toolchain"]
-
-                    platform = self.get_platform(ts["platform"])
-                    if filter_platform and platform.name not in filter_platform:
-                        continue
-                    instance = TestInstance(
-                        self.testsuites[testsuite], platform, toolchain, self.env.outdir
-                    )
-                    if ts.get("run_id"):
-                        instance.run_id = ts.get("run_id")
+            instance_list = []
+            for ts in iter_report_suites(file, keys=LOADED_SUITE_KEYS):
+                logger.debug(f"loading {ts['name']}...")
+                testsuite = ts["name"]
+                toolchain = ts["toolchain"]
 
-                    instance.run = instance.check_runnable(
-                        self.options,
-                        self.hwm
-                    )
+                platform = self.get_platform(ts["platform"])
+                if filter_platform and platform.name not in filter_platform:
+                    continue
+                instance = TestInstance(
+                    self.testsuites[testsuite], platform, toolchain, self.env.outdir
+                )
+                if ts.get("run_id"):
+                    instance.run_id = ts.get("run_id")
 
-                    if self.options.test_only and not instance.run:
-                        continue
+                instance.run = instance.check_runnable(
+                    self.options,
+                    self.hwm
+                )
 
-                    instance.metrics['handler_time'] = ts.get('execution_time', 0)
-                    instance.metrics['used_ram'] = ts.get("used_ram", 0)
-                    instance.metrics['used_rom']  = ts.get("used_rom",0)
-                    instance.metrics['available_ram'] = ts.get('available_ram', 0)
-                    instance.metrics['available_rom'] = ts.get('available_rom', 0)
-
-                    status = TwisterStatus(ts.get('status'))
-                    reason = ts.get("reason", "Unknown")
-                    if status in [TwisterStatus.ERROR, TwisterStatus.FAIL]:
-                        if self.options.report_summary is not None:
-                            instance.status = status
-                            instance.reason = reason
-                            self.instance_fail_count += 1
-                        else:
-                            instance.status = TwisterStatus.NONE
-                            instance.reason = None
-                            instance.retries += 1
-                    # test marked as built only can run when --test-only is used.
-                    # Reset status to capture new results.
-                    elif status == TwisterStatus.NOTRUN and instance.run and self.options.test_only:
-                        instance.status = TwisterStatus.NONE
-                        instance.reason = None
-                    else:
+                if self.options.test_only and not instance.run:
+                    continue
+
+                instance.metrics['handler_time'] = ts.get('execution_time', 0)
+                instance.metrics['used_ram'] = ts.get("used_ram", 0)
+                instance.metrics['used_rom']  = ts.get("used_rom",0)
+                instance.metrics['available_ram'] = ts.get('available_ram', 0)
+                instance.metrics['available_rom'] = ts.get('available_rom', 0)
+
+                status = TwisterStatus(ts.get('status'))
+                reason = ts.get("reason", "Unknown")
+                if status in [TwisterStatus.ERROR, TwisterStatus.FAIL]:
+                    if self.options.report_summary is not None:
                         instance.status = status
                         instance.reason = reason
-
-                    self.handle_quarantined_tests(instance, platform)
-
-                    for tc in ts.get('testcases', []):
-                        identifier = tc['identifier']
-                        tc_status = TwisterStatus(tc.get('status'))
-                        tc_reason = None
-                        # we set reason only if status is valid, it might have been
-                        # reset above...
-                        if instance.status != TwisterStatus.NONE:
-                            tc_reason = tc.get('reason')
-                        if tc_status != TwisterStatus.NONE:
-                            case = instance.set_case_status_by_name(
-                                identifier,
-                                tc_status,
-                                tc_reason
-                            )
-                            case.duration = tc.get('execution_time', 0)
-                            if tc.get('log'):
-                                case.output = tc.get('log')
-
-                    instance.create_overlay(platform,
-                                            self.options.enable_asan,
-                                            self.options.enable_ubsan,
-                                            self.options.enable_coverage,
-                                            self.options.coverage_platform
-                                            )
-                    instance_list.append(instance)
-                self.add_instances(instance_list)
+                        self.instance_fail_count += 1
+                    else:
+                        instance.status = TwisterStatus.NONE
+                        instance.reason = None
+                        instance.retries += 1
+                # test marked as built only can run when --test-only is used.
+                # Reset status to capture new results.
+                elif status == TwisterStatus.NOTRUN and instance.run and self.options.test_only:
+                    instance.status = TwisterStatus.NONE
+                    instance.reason = None
+                else:
+                    instance.status = status
+                    instance.reason = reason
+
+                self.handle_quarantined_tests(instance, platform)
+
+                for tc in ts.get('testcases', []):
+                    identifier = tc['identifier']
+                    tc_status = TwisterStatus(tc.get('status'))
+                    tc_reason = None
+                    # we set reason only if status is valid, it might have been
+                    # reset above...
+                    if instance.status != TwisterStatus.NONE:
+                        tc_reason = tc.get('reason')
+                    if tc_status != TwisterStatus.NONE:
+                        case = instance.set_case_status_by_name(
+                            identifier,
+                            tc_status,
+                            tc_reason
+                        )
+                        case.duration = tc.get('execution_time', 0)
+                        if tc.get('log'):
+                            case.output = tc.get('log')
+
+                instance.create_overlay(platform,
+                                        self.options.enable_asan,
+                                        self.options.enable_ubsan,
+                                        self.options.enable_coverage,
+                                        self.options.coverage_platform
+                                        )
+                instance_list.append(instance)
+            self.add_instances(instance_list)
         except FileNotFoundError as e:
             logger.error(f"{e}")
             return 1
@@ -752,6 +885,37 @@ class TestPlan:
     def check_platform(self, platform, platform_list):
         return any(p in platform.aliases for p in platform_list)
 
+    def _get_platform_filters(self, exclude_platform):
+        """Precompute the platform attributes checked by apply_filters()."""
+        platform_filters = {}
+        for plat in self.platforms:
+            sim = plat.simulator_by_name(self.options.sim_name)
+            platform_filters[plat] = Namespace(
+                cmd_line_excluded=self.check_platform(plat, exclude_platform or []),
+                native_unsupported=plat.type == 'native' and sys.platform != 'linux',
+                supported_toolchains=set(plat.supported_toolchains),
+                renode=bool(sim and sim.name == 'renode'),
+                ignore_tags=set(plat.ignore_tags),
+                only_tags=set(plat.only_tags),
+            )
+        return platform_filters
+
+    def _get_selected_platforms(self, ts, default_platforms, integration):
+        """Return the names of the platforms whose configurations of the
+        testsuite are kept by apply_filters(), or None to keep all of them."""
+        # if twister was launched with no platform options at all, we
+        # take all default platforms
+        if default_platforms and not ts.build_on_all and not integration:
+            if ts.platform_allow:
+                intersection = set(self.default_platforms).intersection(ts.platform_allow)
+                return intersection or None
+            # add integration platforms to the list of default
+            # platforms, even if we are not in integration mode
+            return set(self.default_platforms).union(ts.integration_platforms)
+        if integration:
+            return set(ts.integration_platforms)
+        return None
+
     def apply_filters(self, **kwargs):
 
         platform_filter = self.options.platform
@@ -834,12 +998,23 @@ class TestPlan:
         logger.info("Building initial testsuite list...")
         build_list_start = time.time()
 
+        # Whatever only depends on the platform or on the testsuite is
+        # computed once, not for every configuration.
+        platform_filters = self._get_platform_filters(exclude_platform)
+        testsuite_names = {os.path.basename(_ts) for _ts in testsuite_filter or []}
+        modules = set(self.modules)
+        level = self.get_level(self.options.level) if self.options.level else None
+        filter_duration = 0
+        configurations = 0
+
         keyed_tests = {}
         for _, ts in self.testsuites.items():
+            filter_start = time.time()
+            integration_platforms = set(ts.integration_platforms)
             if ts.integration_platforms:
-                _integration_platforms = list(
-                    filter(lambda item: item.name in ts.integration_platforms, self.platforms)
-                )
+                _integration_platforms = [
+                    p for p in self.platforms if p.name in integration_platforms
+                ]
             else:
                 _integration_platforms = []
 
@@ -861,6 +1036,7 @@ class TestPlan:
                 platform_scope = platforms
 
             integration = self.options.integration and ts.integration_platforms
+            platform_allow = set(ts.platform_allow or [])
 
             # If there isn't any overlap between the platform_allow list and the platform_scope
             # we set the scope to the platform_allow list
@@ -869,19 +1045,51 @@ class TestPlan:
                 and not platform_filter
                 and not integration
                 and self.test_config.increased_platform_scope
+                and not any(p.name in platform_allow for p in platform_scope)
             ):
-                a = set(platform_scope)
-                b = set(filter(lambda item: item.name in ts.platform_allow, self.platforms))
-                c = a.intersection(b)
-                if not c:
-                    platform_scope = list(
-                        filter(lambda item: item.name in ts.platform_allow, self.platforms)
-                    )
+                platform_scope = [p for p in self.platforms if p.name in platform_allow]
+
+            # testsuite filters, independent of the platform
+            missing_modules = bool(ts.modules and modules and not modules.issuperset(ts.modules))
+            not_in_level = level is not None and (
+                ts.id not in level.scenarios and not set(ts.levels).intersection(level.levels)
+            )
+            not_tagged = bool(tag_filter and not ts.tags.intersection(tag_filter))
+            not_slow = bool(slow_only and not ts.slow)
+            excluded_tag = bool(exclude_tag and ts.tags.intersection(exclude_tag))
+            not_selected = bool(testsuite_filter and ts.id not in testsuite_names)
+            platform_exclude = set(ts.platform_exclude or [])
+            platform_type = set(ts.platform_type or [])
+            depends_on = set(ts.depends_on or [])
+            ts_tags = set(ts.tags or [])
+
+            # Configurations on the other platforms are dropped without being
+            # reported, so no instance is made for them, unless they take
+            # part in selecting the platforms by key.
+            selected_platforms = self._get_selected_platforms(ts, default_platforms, integration)
+            keyed = bool(
+                not ignore_platform_key
+                and hasattr(ts, 'platform_key')
+                and len(ts.platform_key) > 0
+            )
+
             # list of instances per testsuite, aka configurations.
             instance_list = []
             for itoolchain, plat in itertools.product(
                 ts.integration_toolchains or [None], platform_scope
             ):
+                if (plat.arch == "unit") != (ts.type == "unit"):
+                    # Discard silently, before creating an instance for nothing
+                    continue
+
+                if (
+                    selected_platforms is not None
+                    and plat.name not in selected_platforms
+                    and not keyed
+                ):
+                    continue
+
+                pf = platform_filters[plat]
                 if itoolchain:
                     toolchain = itoolchain
                 elif plat.arch in ['posix', 'unit']:
@@ -893,39 +1101,30 @@ class TestPlan:
                 else:
                     toolchain = "zephyr" if not self.env.toolchain else self.env.toolchain
 
+                configurations += 1
                 instance = TestInstance(ts, plat, toolchain, self.env.outdir)
                 instance.run = instance.check_runnable(
                     self.options,
                     self.hwm
                 )
 
-                if not force_platform and self.check_platform(plat,exclude_platform):
+                if not force_platform and pf.cmd_line_excluded:
                     instance.add_filter("Platform is excluded on command line.", Filters.CMD_LINE)
 
-                if (plat.arch == "unit") != (ts.type == "unit"):
-                    # Discard silently
-                    continue
-
-                if ts.modules and self.modules and not set(ts.modules).issubset(set(self.modules)):
+                if missing_modules:
                     instance.add_filter(
                         f"one or more required modules not available: {','.join(ts.modules)}",
                         Filters.MODULE
                     )
 
                 if self.options.level:
-                    tl = self.get_level(self.options.level)
-                    if tl is None:
+                    if level is None:
                         instance.add_filter(
                             f"Unknown test level '{self.options.level}'",
                             Filters.TESTPLAN
                         )
-                    else:
-                        planned_scenarios = tl.scenarios
-                        if (
-                            ts.id not in planned_scenarios
-                            and not set(ts.levels).intersection(set(tl.levels))
-                        ):
-                            instance.add_filter("Not part of requested test plan", Filters.TESTPLAN)
+                    elif not_in_level:
+                        instance.add_filter("Not part of requested test plan", Filters.TESTPLAN)
 
                 if runnable and not instance.run:
                     instance.add_filter("Not runnable on device", Filters.CMD_LINE)
@@ -933,26 +1132,24 @@ class TestPlan:
                 if (
                     self.options.integration
                     and ts.integration_platforms
-                    and plat.name not in ts.integration_platforms
+                    and plat.name not in integration_platforms
                 ):
                     instance.add_filter("Not part of integration platforms", Filters.TESTSUITE)
 
                 if ts.skip:
                     instance.add_filter("Skip filter", Filters.SKIP)
 
-                if tag_filter and not ts.tags.intersection(tag_filter):
+                if not_tagged:
                     instance.add_filter("Command line testsuite tag filter", Filters.CMD_LINE)
 
-                if slow_only and not ts.slow:
+                if not_slow:
                     instance.add_filter("Not a slow test", Filters.CMD_LINE)
 
-                if exclude_tag and ts.tags.intersection(exclude_tag):
+                if excluded_tag:
                     instance.add_filter("Command line testsuite exclude filter", Filters.CMD_LINE)
 
-                if testsuite_filter:
-                    normalized_f = [os.path.basename(_ts) for _ts in testsuite_filter]
-                    if ts.id not in normalized_f:
-                        instance.add_filter("Testsuite name filter", Filters.CMD_LINE)
+                if not_selected:
+                    instance.add_filter("Testsuite name filter", Filters.CMD_LINE)
 
                 if arch_filter and plat.arch not in arch_filter:
                     instance.add_filter("Command line testsuite arch filter", Filters.CMD_LINE)
@@ -974,7 +1171,7 @@ class TestPlan:
                     if ts.vendor_exclude and plat.vendor in ts.vendor_exclude:
                         instance.add_filter("In testsuite vendor exclude", Filters.TESTSUITE)
 
-                    if ts.platform_exclude and plat.name in ts.platform_exclude:
+                    if plat.name in platform_exclude:
                         instance.add_filter("In testsuite platform exclude", Filters.TESTSUITE)
 
                 if ts.toolchain_exclude and toolchain in ts.toolchain_exclude:
@@ -983,12 +1180,12 @@ class TestPlan:
                 if platform_filter and plat.name not in platform_filter:
                     instance.add_filter("Command line platform filter", Filters.CMD_LINE)
 
-                if ts.platform_allow \
-                        and plat.name not in ts.platform_allow \
+                if platform_allow \
+                        and plat.name not in platform_allow \
                         and not (platform_filter and force_platform):
                     instance.add_filter("Not in testsuite platform allow list", Filters.TESTSUITE)
 
-                if ts.platform_type and plat.type not in ts.platform_type:
+                if platform_type and plat.type not in platform_type:
                     instance.add_filter("Not in testsuite platform type list", Filters.TESTSUITE)
 
                 if ts.toolchain_allow and toolchain not in ts.toolchain_allow:
@@ -999,11 +1196,11 @@ class TestPlan:
                         "Environment ({}) not satisfied".format(", ".join(plat.env)),
                         Filters.ENVIRONMENT
                     )
-                if plat.type == 'native' and sys.platform != 'linux':
+                if pf.native_unsupported:
                     instance.add_filter("Native platform requires Linux", Filters.ENVIRONMENT)
 
                 if not force_toolchain \
-                        and toolchain and (toolchain not in plat.supported_toolchains):
+                        and toolchain and (toolchain not in pf.supported_toolchains):
                     instance.add_filter(
                         f"Not supported by the toolchain: {toolchain}",
                         Filters.PLATFORM
@@ -1012,32 +1209,28 @@ class TestPlan:
                 if plat.ram < ts.min_ram:
                     instance.add_filter("Not enough RAM", Filters.PLATFORM)
 
-                if ts.harness:
-                    sim = plat.simulator_by_name(self.options.sim_name)
-                    if ts.harness == 'robot' and not (sim and sim.name == 'renode'):
-                        instance.add_filter(
-                            "No robot support for the selected platform",
-                            Filters.SKIP
-                        )
+                if ts.harness == 'robot' and not pf.renode:
+                    instance.add_filter(
+                        "No robot support for the selected platform",
+                        Filters.SKIP
+                    )
 
-                if ts.depends_on:
-                    dep_intersection = ts.depends_on.intersection(set(plat.supported))
-                    if dep_intersection != set(ts.depends_on):
-                        instance.add_filter(
-                            f"No hardware support for {set(ts.depends_on)-dep_intersection}",
-                            Filters.PLATFORM
-                        )
+                if depends_on and not depends_on.issubset(plat.supported):
+                    instance.add_filter(
+                        f"No hardware support for {depends_on.difference(plat.supported)}",
+                        Filters.PLATFORM
+                    )
 
                 if plat.flash < ts.min_flash:
                     instance.add_filter("Not enough FLASH", Filters.PLATFORM)
 
-                if set(plat.ignore_tags) & ts.tags:
+                if pf.ignore_tags & ts_tags:
                     instance.add_filter(
                         "Excluded tags per platform (exclude_tags)",
                         Filters.PLATFORM
                     )
 
-                if plat.only_tags and not set(plat.only_tags) & ts.tags:
+                if pf.only_tags and not pf.only_tags & ts_tags:
                     instance.add_filter("Excluded tags per platform (only_tags)", Filters.PLATFORM)
 
                 if ts.required_snippets:
@@ -1138,44 +1331,20 @@ class TestPlan:
                 # needs to be added.
                 instance_list.append(instance)
 
+            filter_duration += time.time() - filter_start
+
             # no configurations, so jump to next testsuite
             if not instance_list:
                 continue
 
-            # if twister was launched with no platform options at all, we
-            # take all default platforms
-            if default_platforms and not ts.build_on_all and not integration:
-                if ts.platform_allow:
-                    _default_p = set(self.default_platforms)
-                    _platform_allow = set(ts.platform_allow)
-                    _intersection = _default_p.intersection(_platform_allow)
-                    if _intersection:
-                        aa = list(
-                            filter(
-                                lambda _scenario: _scenario.platform.name in _intersection,
-                                instance_list
-                            )
-                        )
-                        self.add_instances(aa)
-                    else:
-                        self.add_instances(instance_list)
-                else:
-                    # add integration platforms to the list of default
-                    # platforms, even if we are not in integration mode
-                    _platforms = self.default_platforms + ts.integration_platforms
-                    instances = list(
-                        filter(lambda ts: ts.platform.name in _platforms, instance_list)
-                    )
-                    self.add_instances(instances)
-            elif integration:
-                instances = list(
-                    filter(
-                        lambda item:  item.platform.name in ts.integration_platforms,
-                        instance_list
-                    )
-                )
-                self.add_instances(instances)
-
+            if selected_platforms is not None:
+                # Instances on the other platforms were only made for the
+                # platform key selection
+                instance_list = [
+                    instance for instance in instance_list
+                    if instance.platform.name in selected_platforms
+                ]
+                self.add_instances(instance_list)
             elif emulation_platforms:
                 self.add_instances(instance_list)
                 for instance in list(
@@ -1224,6 +1393,9 @@ class TestPlan:
             inst.add_missing_case_status(inst.status)
 
         build_list_duration = time.time() - build_list_start
+        logger.info(
+            f"Applied filters to {configurations} configurations in {filter_duration:.2f} seconds"
+        )
         logger.info(f"Built testsuite list in {build_list_duration:.2f} seconds")
 
     def _should_instance_be_processed(self, instance: TestInstance) -> bool:
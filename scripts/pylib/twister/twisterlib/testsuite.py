@@ -7,6 +7,7 @@ import contextlib
 import glob
 import logging
 import mmap
+import multiprocessing
 import os
 import re
 from enum import Enum
@@ -302,7 +303,74 @@ def find_c_files_in(path: str, extensions: list = None) -> list:
 
     return filenames
 
-def scan_testsuite_path(testsuite_path):
+def _scan_file_safe(filename):
+    try:
+        return scan_file(filename)
+    except Exception as e:
+        # Given back to scan_testsuite_path(), which handles it
+        return e
+
+# Below this number of files, starting a pool of processes takes longer
+# than scanning them
+SCAN_POOL_THRESHOLD = 32
+
+def scan_files(filenames, jobs=None):
+    """Run scan_file() on many files, in parallel with 'jobs' processes
+    (by default, one per CPU).
+
+    Returns a dictionary mapping each file name to its ScanPathResult or to
+    the exception raised while scanning it."""
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs == 1 or len(filenames) < SCAN_POOL_THRESHOLD:
+        return {filename: _scan_file_safe(filename) for filename in filenames}
+
+    with multiprocessing.Pool(jobs) as pool:
+        results = pool.map(_scan_file_safe, filenames, chunksize=16)
+    return dict(zip(filenames, results, strict=True))
+
+def get_testsuite_sources(testsuite_path):
+    """Return the sorted list of the files scanned by scan_testsuite_path()."""
+    return sorted(
+        set(find_c_files_in(_find_src_dir_path(testsuite_path)))
+        | set(find_c_files_in(testsuite_path))
+    )
+
+def scan_testsuite_paths(testsuite_paths, jobs=None, scan_results=None):
+    """Scan the sources of many test suites, see scan_testsuite_path().
+
+    All the files are scanned in parallel, except the ones already found in
+    scan_results, a dictionary as returned by scan_files(). It is updated
+    with the results of the new scans.
+
+    Returns a dictionary mapping each test suite path to the result of
+    scan_testsuite_path() or to the exception it raised."""
+    if scan_results is None:
+        scan_results = {}
+    filenames = set()
+    for testsuite_path in testsuite_paths:
+        filenames.update(get_testsuite_sources(testsuite_path))
+    scan_results.update(
+        scan_files(sorted(filenames.difference(scan_results)), jobs)
+    )
+
+    results = {}
+    for testsuite_path in testsuite_paths:
+        try:
+            results[testsuite_path] = scan_testsuite_path(testsuite_path, scan_results)
+        except Exception as e:
+            results[testsuite_path] = e
+    return results
+
+def _get_scan_result(filename, scan_results):
+    result = scan_results.get(filename) if scan_results else None
+    if result is None:
+        return scan_file(filename)
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+def scan_testsuite_path(testsuite_path, scan_results=None):
     subcases = []
     has_registered_test_suites = False
     has_run_registered_test_suites = False
@@ -314,7 +382,7 @@ def scan_testsuite_path(testsuite_path):
         if os.stat(filename).st_size == 0:
             continue
         try:
-            result: ScanPathResult = scan_file(filename)
+            result: ScanPathResult = _get_scan_result(filename, scan_results)
             if result.warnings:
                 logger.error(f"{filename}: {result.warnings}")
                 raise TwisterRuntimeError(f"{filename}: {result.warnings}")
@@ -340,7 +408,7 @@ def scan_testsuite_path(testsuite_path):
             continue
 
         try:
-            result: ScanPathResult = scan_file(filename)
+            result: ScanPathResult = _get_scan_result(filename, scan_results)
             if result.warnings:
                 logger.error(f"{filename}: {result.warnings}")
             if result.matches:
@@ -395,6 +463,9 @@ class TestCase(DisablePyTestCollectionMixin):
 
     @status.setter
     def status(self, value : TwisterStatus) -> None:
+        if isinstance(value, TwisterStatus):
+            self._status = value
+            return
         # Check for illegal assignments by value
         try:
             key = value.name if isinstance(value, Enum) else value
@@ -463,6 +534,9 @@ class TestSuite(DisablePyTestCollectionMixin):
 
     @status.setter
     def status(self, value : TwisterStatus) -> None:
+        if isinstance(value, TwisterStatus):
+            self._status = value
+            return
         # Check for illegal assignments by value
         try:
             key = value.name if isinstance(value, Enum) else value
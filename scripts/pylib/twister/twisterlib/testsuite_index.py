@@ -0,0 +1,219 @@
+# Copyright The Zephyr Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+"""Persistent index of the discovered test suites.
+
+Discovering the test suites means loading and validating every testcase.yaml
+and sample.yaml found under the test roots, and scanning the C sources of all
+ztest suites for their test cases. The results of both steps only depend on
+the content of these files, so they are saved in an index and reused by the
+next twister invocations for the files which did not change. The results of
+the scans are also kept for each source file, so that only the files which
+changed in a test suite are scanned again.
+
+A file is considered unchanged while its modification time and size are the
+same as when it was indexed. When they differ, its content hash is compared
+too, so that touching a file or checking it out again does not invalidate
+its entry. The whole index is discarded when the schema or the code parsing
+the files changes.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import tempfile
+
+import scl
+from twisterlib import config_parser, testsuite
+from twisterlib.environment import canonical_zephyr_base
+
+logger = logging.getLogger('twister')
+
+INDEX_VERSION = 1
+
+
+def default_index_path():
+    """Return the location of the index in the Zephyr user cache directory."""
+    if sys.platform == 'darwin':
+        dirs = [(os.environ.get('HOME'), os.path.join('Library', 'Caches'))]
+    elif sys.platform == 'win32':
+        dirs = [(os.environ.get('LOCALAPPDATA'), '.cache')]
+    else:
+        dirs = [(os.environ.get('XDG_CACHE_HOME'), ''), (os.environ.get('HOME'), '.cache')]
+
+    cache_dir = os.path.join(canonical_zephyr_base, '.cache')
+    for env_dir, suffix in dirs:
+        if env_dir:
+            cache_dir = os.path.join(env_dir, suffix, 'zephyr')
+            break
+
+    # One index per Zephyr tree, as all paths in it are absolute
+    tree_id = hashlib.sha256(canonical_zephyr_base.encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, 'twister', f'testsuite_index_{tree_id}.pickle')
+
+
+def _hash_file(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _file_record(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size, _hash_file(path)]
+
+
+class TestsuiteIndex:
+    """Index of parsed test suite configurations and scanned test cases,
+    see the module documentation."""
+
+    __test__ = False  # for pytest to skip this class when collects tests
+
+    def __init__(self, path, schema):
+        self.path = path
+        self.schema = schema
+        self.hits = 0
+        self.misses = 0
+        self._signature = self._get_signature(schema)
+        self._dirty = False
+        self._entries = {}
+        self._load()
+
+    def get_scenarios(self, yaml_path):
+        """Return the scenarios of a test suite configuration file, as
+        returned by TwisterConfigParser.get_scenario() for each of them."""
+        entry = self._get_entry(('yaml', yaml_path), [yaml_path])
+        if entry is not None:
+            return pickle.loads(entry)
+
+        records = self._get_records([yaml_path])
+        parsed_data = config_parser.TwisterConfigParser(yaml_path, self.schema)
+        parsed_data.load()
+        scenarios = {name: parsed_data.get_scenario(name) for name in parsed_data.scenarios}
+        # Stored pickled, the callers are free to modify what they get
+        self._set_entry(('yaml', yaml_path), records, pickle.dumps(scenarios))
+        return scenarios
+
+    def scan_testsuite_paths(self, testsuite_paths, jobs=None):
+        """Return the test cases and ztest suite names found in the sources
+        of many test suites, as returned by scan_testsuite_paths(). The files
+        to scan again are scanned by 'jobs' processes."""
+        results = {}
+        missing = {}
+        for testsuite_path in testsuite_paths:
+            # The set of scanned files is part of the entry: files added or
+            # removed make it stale.
+            sources = testsuite.get_testsuite_sources(testsuite_path)
+            entry = self._get_entry(('scan', testsuite_path), sources)
+            if entry is not None:
+                results[testsuite_path] = pickle.loads(entry)
+            else:
+                missing[testsuite_path] = self._get_records(sources)
+        if not missing:
+            return results
+
+        # Only the files which changed in these test suites are scanned again
+        scan_results = {}
+        file_records = {}
+        for filename in sorted({f for records in missing.values() for f in records or []}):
+            entry = self._get_entry(('file', filename), [filename])
+            if entry is not None:
+                scan_results[filename] = pickle.loads(entry)
+            else:
+                file_records[filename] = self._get_records([filename])
+
+        scans = testsuite.scan_testsuite_paths(list(missing), jobs=jobs, scan_results=scan_results)
+
+        for filename, records in file_records.items():
+            if isinstance(scan_results.get(filename), testsuite.ScanPathResult):
+                self._set_entry(('file', filename), records, pickle.dumps(scan_results[filename]))
+        for testsuite_path, records in missing.items():
+            result = scans[testsuite_path]
+            if not isinstance(result, Exception):
+                self._set_entry(('scan', testsuite_path), records, pickle.dumps(result))
+        results.update(scans)
+        return results
+
+    def save(self):
+        """Write the index back if it changed."""
+        if not self._dirty:
+            return
+        logger.debug(
+            f"Saving testsuite index to {self.path} ({self.hits} hits, {self.misses} misses)"
+        )
+        # Forget about the files which were removed from the tree
+        self._entries = {
+            key: entry
+            for key, entry in self._entries.items()
+            if all(os.path.exists(path) for path in entry[0])
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path))
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((INDEX_VERSION, self._signature, self._entries), f)
+            # Atomic, concurrent twister invocations never see a partial index
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Cannot save testsuite index to {self.path}: {e}")
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                version, signature, entries = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable testsuite index {self.path}: {e!r}")
+            return
+        if version == INDEX_VERSION and signature == self._signature:
+            self._entries = entries
+        else:
+            logger.debug(f"Ignoring outdated testsuite index {self.path}")
+
+    def _get_entry(self, key, paths):
+        entry = self._entries.get(key)
+        if entry is None or list(entry[0]) != paths:
+            self.misses += 1
+            return None
+
+        for path in paths:
+            record = entry[0][path]
+            try:
+                st = os.stat(path)
+                if [st.st_mtime_ns, st.st_size] == record[:2]:
+                    continue
+                if st.st_size == record[1] and _hash_file(path) == record[2]:
+                    # Same content, only remember the new time stamp
+                    record[0] = st.st_mtime_ns
+                    self._dirty = True
+                    continue
+            except OSError:
+                pass
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry[1]
+
+    def _get_records(self, paths):
+        # Taken before reading the files: a file modified in the meantime
+        # only makes the new entry stale.
+        try:
+            return {path: _file_record(path) for path in paths}
+        except OSError:
+            return None
+
+    def _set_entry(self, key, records, value):
+        if records is not None:
+            self._entries[key] = (records, value)
+            self._dirty = True
+
+    @staticmethod
+    def _get_signature(schema):
+        hasher = hashlib.sha256(pickle.dumps(schema))
+        for module in [config_parser, testsuite, scl]:
+            hasher.update(_hash_file(module.__file__).encode())
+        return hasher.hexdigest()
@@ -102,6 +102,10 @@ def twister(options: argparse.Namespace, default_options: argparse.Namespace) ->
     setup_logging(options.outdir, options.log_file, options.log_level, options.timestamps)
     logger = logging.getLogger("twister")
 
+    if options.configure_server:
+        # Inherited by all CMake invocations
+        os.environ["ZEPHYR_CONFIGURE_SERVER"] = "1"
+
     env = TwisterEnv(options, default_options)
     env.discover()
 
@@ -122,6 +126,9 @@ def twister(options: argparse.Namespace, default_options: argparse.Namespace) ->
     if tplan.report() == 0:
         return 0
 
+    if options.durations_from:
+        tplan.load_durations(options.durations_from)
+
     try:
         tplan.load()
     except RuntimeError as e:
@@ -190,6 +197,10 @@ def twister(options: argparse.Namespace, default_options: argparse.Namespace) ->
 
     runner = TwisterRunner(tplan.instances, tplan.testsuites, env)
     runner.duts = hwm.duts
+    if not options.no_update:
+        runner.journal = report.start_journal(
+            options.report_name, options.report_suffix, options.report_dir
+        )
     runner.run()
 
     # figure out which report to use for size comparison
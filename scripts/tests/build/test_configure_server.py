@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# Copyright The Zephyr Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""tests for configure_server.py"""
+
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.environ["ZEPHYR_BASE"], "scripts", "build"))
+import configure_server as iut  # Implementation Under Test
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX") or not hasattr(socket, "send_fds"),
+    reason="needs Unix sockets passing file descriptors",
+)
+
+# Exits with the status given as argument, after recording its process
+SCRIPT = """\
+import os
+import sys
+
+with open(os.path.join(os.path.dirname(sys.argv[0]), "pid"), "w") as f:
+    f.write(str(os.getpid()))
+sys.exit(int(sys.argv[1]))
+"""
+
+
+@pytest.fixture
+def sock_dir():
+    """A private directory for the socket, with a path short enough for it"""
+    path = tempfile.mkdtemp(prefix="zcs")
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def script(sock_dir):
+    path = os.path.join(sock_dir, "script.py")
+    with open(path, "w") as f:
+        f.write(SCRIPT)
+    return path
+
+
+@pytest.fixture
+def servers():
+    """Server processes started by the tests or the clients, stopped at the end"""
+    procs = []
+    popen = subprocess.Popen
+
+    def start(*args, **kwargs):
+        procs.append(popen(*args, **kwargs))
+        return procs[-1]
+
+    with mock.patch.object(iut.subprocess, "Popen", side_effect=start):
+        yield procs
+    for proc in procs:
+        proc.kill()
+        proc.wait()
+
+
+def run(script, status):
+    # The script changes sys.argv and sys.path[0] when run in this process
+    with (
+        mock.patch.object(sys, "argv", list(sys.argv)),
+        mock.patch.object(sys, "path", list(sys.path)),
+    ):
+        return iut.run(script, [str(status)])
+
+
+def script_pid(script):
+    with open(os.path.join(os.path.dirname(script), "pid")) as f:
+        return int(f.read())
+
+
+def test_run_without_server(sock_dir, script):
+    """Test the script is run by the client when no server can be started"""
+    path = os.path.join(sock_dir, "run", "s.sock")
+    with (
+        mock.patch.object(iut, "socket_path", return_value=path),
+        mock.patch.object(iut, "_start_server", return_value=None) as start_mock,
+    ):
+        assert run(script, 3) == 3
+
+    start_mock.assert_called_once_with(path)
+    assert script_pid(script) == os.getpid()
+
+
+def test_run_stale_socket(sock_dir, script, servers):
+    """Test a server is started in place of one which did not exit cleanly"""
+    path = os.path.join(sock_dir, "run", "s.sock")
+    os.mkdir(os.path.dirname(path), 0o700)
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+
+    with mock.patch.object(iut, "socket_path", return_value=path):
+        # The exit status of the script is the one of the client
+        assert run(script, 0) == 0
+        assert script_pid(script) != os.getpid()
+        assert run(script, 5) == 5
+
+    # The requests were served by the same server
+    assert len(servers) == 1
+    assert servers[0].poll() is None
+
+
+def test_run_restart(sock_dir, script):
+    """Test the client starts a new server when asked to"""
+    path = os.path.join(sock_dir, "run", "s.sock")
+    with (
+        mock.patch.object(iut, "socket_path", return_value=path),
+        mock.patch.object(iut, "_request", side_effect=[iut._RESTART, 4]) as request_mock,
+        mock.patch.object(iut, "_connect", return_value=None),
+        mock.patch.object(iut, "_start_server", return_value=socket.socket()),
+    ):
+        assert run(script, 4) == 4
+    assert request_mock.call_count == 2
+
+
+@pytest.mark.parametrize("mode", [0o755, 0o701])
+def test_unsafe_socket_dir(sock_dir, script, mode):
+    """Test a socket directory others can use is not trusted"""
+    path = os.path.join(sock_dir, "run", "s.sock")
+    os.mkdir(os.path.dirname(path))
+    os.chmod(os.path.dirname(path), mode)
+
+    with (
+        mock.patch.object(iut, "socket_path", return_value=path),
+        mock.patch.object(iut, "_connect") as connect_mock,
+    ):
+        assert run(script, 2) == 2
+    connect_mock.assert_not_called()
+    assert script_pid(script) == os.getpid()
+
+    iut.serve(path, idle_timeout=0.1)
+    assert not os.path.exists(path)
+
+
+def test_unsafe_socket_dir_symlink(sock_dir):
+    """Test a symbolic link to a private directory is not trusted"""
+    os.mkdir(os.path.join(sock_dir, "target"), 0o700)
+    os.symlink(os.path.join(sock_dir, "target"), os.path.join(sock_dir, "run"))
+
+    assert iut._private_dir(os.path.join(sock_dir, "target"))
+    assert not iut._private_dir(os.path.join(sock_dir, "run"))
+
+
+def test_unsafe_socket_dir_owner(sock_dir):
+    """Test a private directory of another user is not trusted"""
+    path = os.path.join(sock_dir, "run")
+    assert iut._private_dir(path)
+    with mock.patch.object(iut.os, "getuid", return_value=os.getuid() + 1):
+        assert not iut._private_dir(path)
+
+
+def test_socket_dir(sock_dir):
+    """Test the socket is in the runtime directory of the user if any"""
+    with mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": sock_dir}):
+        assert os.path.dirname(iut.socket_path()) == os.path.join(sock_dir, "zephyr-configure")
+
+    with mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": ""}):
+        assert os.path.dirname(iut.socket_path()) == os.path.join(
+            tempfile.gettempdir(), f"zephyr-configure-{os.getuid()}"
+        )
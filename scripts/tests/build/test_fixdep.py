@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# Copyright The Zephyr Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""tests for fixdep.py"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.environ["ZEPHYR_BASE"], "scripts", "build"))
+import fixdep as iut  # Implementation Under Test
+
+
+def test_parse_depfile():
+    """Test the first rule of a dependency file is parsed"""
+    text = "obj/a.c.obj: a.c /inc/my\\ hdr.h \\\n /inc/b\\#.h C:\\inc\\c.h\n/inc/b#.h:\n"
+
+    assert iut.parse_depfile(text) == (
+        ["obj/a.c.obj"],
+        ["a.c", "/inc/my hdr.h", "/inc/b#.h", "C:\\inc\\c.h"],
+    )
+    assert iut.parse_depfile(iut.format_depfile(*iut.parse_depfile(text))) == iut.parse_depfile(
+        text
+    )
+
+
+def test_fix_depfile(tmpdir):
+    """Test autoconf.h is replaced by the stamp files of the used symbols"""
+    tmpdir.chdir()
+    deps_dir = str(tmpdir / "deps")
+    os.mkdir(deps_dir)
+    with open("autoconf.h", "w") as f:
+        f.write("#define CONFIG_A 1\n#define CONFIG_B 1\n")
+    with open("a.c", "w") as f:
+        f.write('#include "a.h"\nint x = CONFIG_FOO_BAR;\n')
+    with open("a.h", "w") as f:
+        f.write("#if IS_ENABLED(CONFIG_A) /* MY_CONFIG_B */\n#endif\n")
+    with open("a.o.d", "w") as f:
+        f.write("a.o: a.c autoconf.h a.h\n")
+
+    iut.fix_depfile("a.o.d", "autoconf.h", deps_dir, "CONFIG_")
+
+    stamps = [iut.stamp_path(deps_dir, "A"), iut.stamp_path(deps_dir, "FOO_BAR")]
+    with open("a.o.d") as f:
+        assert iut.parse_depfile(f.read()) == (["a.o"], ["a.c", "a.h"] + stamps)
+    assert stamps[1] == os.path.join(deps_dir, "foo", "bar.h")
+    # Missing stamp files are created, older than any object
+    for stamp in stamps:
+        assert os.stat(stamp).st_mtime == 0
+
+
+def test_find_depfile():
+    """Test the dependency file is found in compiler command lines"""
+    assert iut.find_depfile(["gcc", "-MD", "-MF", "a.d", "-c", "a.c"]) == "a.d"
+    assert iut.find_depfile(["gcc", "-MFa.d", "-c", "a.c"]) == "a.d"
+    assert iut.find_depfile(["gcc", "-c", "a.c"]) is None
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# Copyright The Zephyr Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""tests for the Zephyr additions to kconfiglib.py"""
+
+import os
+import random
+import sys
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.environ["ZEPHYR_BASE"], "scripts", "kconfig"))
+import kconfiglib
+
+KCONFIG = """\
+config A
+	bool "A"
+
+config B
+	bool "B"
+	default y if A
+
+config M
+	bool "M"
+	default y
+	option modules
+
+config T
+	tristate "T"
+	depends on B
+	default y
+
+config U
+	tristate "U"
+	default T
+	select V if A
+
+config V
+	bool
+
+config W
+	bool "W"
+	imply B
+
+choice C
+	prompt "C"
+	default C1
+
+config C1
+	bool "C1"
+
+config C2
+	bool "C2"
+	depends on A
+
+config C3
+	bool "C3"
+	depends on !W
+
+endchoice
+
+config I
+	int "I"
+	range 0 10
+	default 5 if C2
+	default 3
+
+config S
+	string "S"
+	default "x" if B
+"""
+
+# Values tried for the symbols in the random tests, other than n/m/y
+VALUES = {"I": ["0", "7", "11", "x"], "S": ["a", ""]}
+
+
+@pytest.fixture
+def new_kconfig(tmp_path, monkeypatch):
+    """Returns a function parsing KCONFIG again"""
+    monkeypatch.delenv("KCONFIG_CACHE", raising=False)
+    monkeypatch.delenv("srctree", raising=False)
+    (tmp_path / "Kconfig").write_text(KCONFIG)
+    return lambda: kconfiglib.Kconfig(str(tmp_path / "Kconfig"), warn=False)
+
+
+def config_state(kconf):
+    """Values, choice selections and user values of a configuration"""
+    return (
+        {sym.name: sym.str_value for sym in kconf.unique_defined_syms},
+        {
+            choice.name: choice.selection and choice.selection.name
+            for choice in kconf.unique_choices
+        },
+        {sym.name: sym.user_value for sym in kconf.unique_defined_syms},
+        {choice.name: choice.user_value for choice in kconf.unique_choices},
+    )
+
+
+def assign(kconf, op):
+    """Applies a ('set', <symbol>, <value>), ('unset', <symbol>) or
+    ('choice', <mode>) assignment"""
+    if op[0] == "choice":
+        kconf.named_choices["C"].set_value(op[1])
+    elif op[0] == "unset":
+        kconf.syms[op[1]].unset_value()
+    else:
+        kconf.syms[op[1]].set_value(op[2])
+
+
+def fresh_state(new_kconfig, ops):
+    """State of a new configuration with the assignments 'ops'"""
+    kconf = new_kconfig()
+    for op in ops:
+        assign(kconf, op)
+    return config_state(kconf)
+
+
+def test_rollback(new_kconfig):
+    """Test values calculated after a checkpoint are not restored"""
+    kconf = new_kconfig()
+    expected = fresh_state(new_kconfig, [])
+
+    cp = kconf.checkpoint()
+    kconf.syms["A"].set_value(2)
+    assert kconf.syms["U"].str_value == "y"
+    kconf.syms["A"].unset_value()
+    kconf.rollback(cp)
+    assert config_state(kconf) == expected
+
+    cp = kconf.checkpoint()
+    for _ in range(2):
+        kconf.syms["C2"].set_value(2)
+        assert kconf.syms["C1"].str_value == "y"
+    kconf.rollback(cp)
+    assert config_state(kconf) == expected
+    assert kconf.syms["C1"].str_value == "y"
+
+
+def test_rollback_user_values(new_kconfig):
+    """Test the user values set before a checkpoint are restored"""
+    ops = [("set", "A", 2), ("set", "C2", 2), ("set", "I", "7"), ("set", "W", 2)]
+    kconf = new_kconfig()
+    for op in ops:
+        assign(kconf, op)
+    assert kconf.syms["A"].str_value == "y"
+
+    cp = kconf.checkpoint()
+    kconf.unset_values()
+    kconf.syms["I"].set_value("2")
+    kconf.syms["C3"].set_value(2)
+    assert kconf.syms["C2"].str_value == "n"
+    kconf.rollback(cp)
+
+    assert config_state(kconf) == fresh_state(new_kconfig, ops)
+    assert kconf.syms["I"].user_loc is None
+    assert kconf.named_choices["C"].user_selection is kconf.syms["C2"]
+
+
+def test_commit_nested(new_kconfig):
+    """Test committed changes are undone by rolling back an older checkpoint"""
+    kconf = new_kconfig()
+
+    outer = kconf.checkpoint()
+    kconf.syms["A"].set_value(2)
+    inner = kconf.checkpoint()
+    kconf.syms["C2"].set_value(2)
+    innermost = kconf.checkpoint()
+    kconf.syms["I"].set_value("9")
+    kconf.rollback(innermost)
+    assert config_state(kconf) == fresh_state(new_kconfig, [("set", "A", 2), ("set", "C2", 2)])
+
+    kconf.commit(inner)
+    assert config_state(kconf) == fresh_state(new_kconfig, [("set", "A", 2), ("set", "C2", 2)])
+
+    kconf.rollback(outer)
+    assert config_state(kconf) == fresh_state(new_kconfig, [])
+    assert kconf._journal is None
+
+
+def test_what_if(new_kconfig):
+    """Test the changes made in a what_if() block are undone"""
+    kconf = new_kconfig()
+    kconf.syms["W"].set_value(2)
+
+    with kconf.what_if():
+        kconf.syms["W"].set_value(0)
+        kconf.syms["C3"].set_value(2)
+        assert kconf.named_choices["C"].selection is kconf.syms["C3"]
+
+    assert config_state(kconf) == fresh_state(new_kconfig, [("set", "W", 2)])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_checkpoint_random(new_kconfig, seed):
+    """Test random assignments, reads, checkpoints, rollbacks and commits
+    give the same configuration as a fresh parse with the assignments kept"""
+    rng = random.Random(seed)
+
+    for _ in range(30):
+        kconf = new_kconfig()
+        syms = list(kconf.unique_defined_syms)
+        # Assignments kept at each level of checkpoint, and the checkpoints
+        levels = [[]]
+        checkpoints = []
+
+        for _ in range(40):
+            r = rng.random()
+            if r < 0.15:
+                checkpoints.append(kconf.checkpoint())
+                levels.append([])
+            elif r < 0.25 and checkpoints:
+                i = rng.randrange(len(checkpoints))
+                if rng.random() < 0.5:
+                    kconf.rollback(checkpoints[i])
+                else:
+                    kconf.commit(checkpoints[i])
+                    levels[i].extend(op for level in levels[i + 1 :] for op in level)
+                del levels[i + 1 :]
+                del checkpoints[i:]
+            elif r < 0.5:
+                # Calculates and caches the values
+                for sym in rng.sample(syms, 3):
+                    assert sym.str_value is not None
+            else:
+                sym = rng.choice(syms)
+                if rng.random() < 0.1:
+                    op = ("choice", rng.choice([0, 1, 2]))
+                elif rng.random() < 0.2:
+                    op = ("unset", sym.name)
+                else:
+                    op = ("set", sym.name, rng.choice(VALUES.get(sym.name, [0, 1, 2])))
+                assign(kconf, op)
+                levels[-1].append(op)
+
+        ops = [op for level in levels for op in level]
+        assert config_state(kconf) == fresh_state(new_kconfig, ops), ops
+
+
+@pytest.fixture
+def cache_tree(tmp_path, monkeypatch):
+    """Kconfig tree using the environment, a sourced file, a glob and
+    $(shell), parsed with KCONFIG_CACHE set"""
+    monkeypatch.setenv("srctree", str(tmp_path))
+    monkeypatch.setenv("KCONFIG_CACHE", str(tmp_path / "cache.pickle"))
+    monkeypatch.setenv("FOO_DEFAULT", "foo")
+    (tmp_path / "Kconfig").write_text(
+        """\
+config FOO
+	string "FOO"
+	default "$(FOO_DEFAULT)"
+
+config SHELL
+	string "SHELL"
+	default "$(shell,cat shell.txt)"
+
+source "Kconfig.sourced"
+osource "modules/*/Kconfig"
+osource "Kconfig.optional"
+"""
+    )
+    (tmp_path / "Kconfig.sourced").write_text('config SOURCED\n\tbool "SOURCED"\n')
+    (tmp_path / "shell.txt").write_text("a")
+    (tmp_path / "modules" / "one").mkdir(parents=True)
+    (tmp_path / "modules" / "one" / "Kconfig").write_text('config ONE\n\tbool "ONE"\n')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def parse_cached(path):
+    """Returns the Kconfig parsed from 'path', and whether it was restored
+    from the cache"""
+    results = []
+    load_cache = kconfiglib.Kconfig._load_cache
+
+    def spy_load_cache(self, *args):
+        results.append(load_cache(self, *args))
+        return results[-1]
+
+    with mock.patch.object(kconfiglib.Kconfig, "_load_cache", spy_load_cache):
+        kconf = kconfiglib.Kconfig(str(path / "Kconfig"), warn=False)
+    return kconf, results == [True]
+
+
+def test_cache_hit(cache_tree):
+    """Test an unchanged tree is restored from the cache"""
+    kconf, cached = parse_cached(cache_tree)
+    assert not cached
+    assert (cache_tree / "cache.pickle").exists()
+
+    kconf, cached = parse_cached(cache_tree)
+    assert cached
+    assert kconf.syms["FOO"].str_value == "foo"
+    assert kconf.syms["SHELL"].str_value == "a"
+    assert "ONE" in kconf.syms
+
+    # Files with new timestamps but the same contents are still up to date
+    os.utime(cache_tree / "Kconfig.sourced", (0, 0))
+    kconf, cached = parse_cached(cache_tree)
+    assert cached
+
+
+def test_cache_stale_env(cache_tree, monkeypatch):
+    """Test a change to an environment variable used by Kconfig is detected"""
+    parse_cached(cache_tree)
+
+    monkeypatch.setenv("FOO_DEFAULT", "bar")
+    kconf, cached = parse_cached(cache_tree)
+    assert not cached
+    assert kconf.syms["FOO"].str_value == "bar"
+
+    monkeypatch.delenv("FOO_DEFAULT")
+    kconf, cached = parse_cached(cache_tree)
+    assert not cached
+    assert kconf.syms["FOO"].str_value == ""
+
+
+def test_cache_stale_sourced_file(cache_tree):
+    """Test an edited sourced file is detected"""
+    parse_cached(cache_tree)
+
+    (cache_tree / "Kconfig.sourced").write_text('config EDITED\n\tbool "EDITED"\n')
+    kconf, cached = parse_cached(cache_tree)
+    assert not cached
+    assert "EDITED" in kconf.syms
+    assert "SOURCED" not in kconf.syms
+
+
+@pytest.mark.parametrize(
+    "new_file", ["modules/two/Kconfig", "Kconfig.optional"], ids=["glob", "optional"]
+)
+def test_cache_stale_osource(cache_tree, new_file):
+    """Test a new file matching an osource is detected"""
+    parse_cached(cache_tree)
+
+    (cache_tree / new_file).parent.mkdir(exist_ok=True)
+    (cache_tree / new_file).write_text('config NEW\n\tbool "NEW"\n')
+    kconf, cached = parse_cached(cache_tree)
+    assert not cached
+    assert "NEW" in kconf.syms
+    assert "ONE" in kconf.syms
+
+    # Removing it is detected too
+    (cache_tree / new_file).unlink()
+    kconf, cached = parse_cached(cache_tree)
+    assert not cached
+    assert "NEW" not in kconf.syms
+
+
+def test_cache_stale_shell(cache_tree):
+    """Test a $(shell) call giving a new result is detected"""
+    parse_cached(cache_tree)
+
+    (cache_tree / "shell.txt").write_text("b")
+    kconf, cached = parse_cached(cache_tree)
+    assert not cached
+    assert kconf.syms["SHELL"].str_value == "b"
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# Copyright The Zephyr Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""tests for the sinks of the dictionary-based logging parser"""
+
+import io
+import json
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.environ["ZEPHYR_BASE"], "scripts", "logging", "dictionary"))
+from dictionary_parser.log_parser import LogRecord
+from dictionary_parser.log_sinks import (
+    COLUMNAR_MAGIC,
+    ColumnarSink,
+    JsonLinesSink,
+    get_sink,
+    read_columnar_records,
+)
+
+RECORDS = [
+    LogRecord(
+        timestamp=1000,
+        domain_id=0,
+        level=3,
+        source_id=0x20001000,
+        source="main",
+        fmt_str_ptr=0x8000100,
+        fmt_str="value %d is %s",
+        args=(42, "ok"),
+    ),
+    LogRecord(num_dropped=5),
+    LogRecord(
+        timestamp=(1 << 64) - 1,
+        domain_id=1,
+        level=1,
+        source_id=0x20001040,
+        source="sensor",
+        fmt_str_ptr=0x8000200,
+        fmt_str="reading %f",
+        args=(1.5,),
+        hexdump=bytes(range(20)),
+    ),
+    LogRecord(
+        timestamp=2000,
+        domain_id=0,
+        level=4,
+        source_id=0x20001000,
+        source="main",
+        fmt_str_ptr=0x8000100,
+        fmt_str="value %d is %s",
+        args=(-1, ""),
+        hexdump=b"\x00",
+    ),
+    LogRecord(num_dropped=0),
+]
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 4096], ids=["one", "blocks", "single"])
+def test_columnar_round_trip(batch_size):
+    """Test records written in the columnar format are read back the same"""
+    stream = io.BytesIO()
+    with mock.patch.object(ColumnarSink, "BATCH_SIZE", batch_size):
+        sink = ColumnarSink(stream)
+        for record in RECORDS:
+            sink.write(record)
+        sink.flush()
+
+    data = stream.getvalue()
+    assert data.startswith(COLUMNAR_MAGIC)
+    assert list(read_columnar_records(io.BytesIO(data))) == RECORDS
+
+
+def test_columnar_empty():
+    """Test a columnar file without records, and one in another format"""
+    stream = io.BytesIO()
+    get_sink("columnar", None, stream).flush()
+    assert list(read_columnar_records(io.BytesIO(stream.getvalue()))) == []
+
+    with pytest.raises(ValueError):
+        list(read_columnar_records(io.BytesIO(b'{"timestamp": 0}\n')))
+
+
+@pytest.mark.parametrize("batch_size", [2, 256], ids=["blocks", "single"])
+def test_jsonl_round_trip(batch_size):
+    """Test records written as JSON Lines are read back the same"""
+    stream = io.StringIO()
+    with mock.patch.object(JsonLinesSink, "BATCH_SIZE", batch_size):
+        sink = get_sink("jsonl", None, stream)
+        for record in RECORDS:
+            sink.write(record)
+        sink.flush()
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == len(RECORDS)
+
+    records = []
+    for line in lines:
+        obj = json.loads(line)
+        if "dropped" in obj:
+            records.append(LogRecord(num_dropped=obj["dropped"]))
+            continue
+        records.append(
+            LogRecord(
+                timestamp=obj["timestamp"],
+                domain_id=obj["domain"],
+                level=obj["level"],
+                source_id=obj["source_id"],
+                source=obj["source"],
+                fmt_str_ptr=obj["fmt_id"],
+                fmt_str=obj["fmt"],
+                args=tuple(obj["args"]),
+                hexdump=bytes.fromhex(obj["hexdump"]),
+            )
+        )
+    assert records == RECORDS
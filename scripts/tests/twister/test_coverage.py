@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# Copyright The Zephyr Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+"""
+Tests for coverage.py classes' methods
+"""
+
+import struct
+from unittest import mock
+
+import pytest
+from twisterlib.coverage import CoverageTool, GcdaError, GcdaFile
+
+TAG_FUNCTION = 0x01000000
+TAG_ARCS = 0x01A10000
+
+
+def make_gcda(counters, version=b'B22*', byteorder='<', tag=TAG_ARCS):
+    """Return a gcda file as dumped by the Zephyr gcov support, with one
+    function for each list of counters"""
+    gcov_12 = version >= b'B2'
+    unit = 1 if gcov_12 else 4
+    # The version is written as a word
+    data = b'gcda'[::-1] if byteorder == '<' else b'gcda'
+    data += version[::-1] if byteorder == '<' else version
+    data += struct.pack(f'{byteorder}I', 0x12345678)
+    if gcov_12:
+        data += struct.pack(f'{byteorder}I', 0xCAFE)
+    for ident, values in enumerate(counters):
+        data += struct.pack(f'{byteorder}5I', TAG_FUNCTION, 12 // unit, ident, 1, 2)
+        data += struct.pack(f'{byteorder}II', tag, 8 * len(values) // unit)
+        data += struct.pack(f'{byteorder}{len(values)}Q', *values)
+    return data
+
+
+def arcs(gcda):
+    return [list(payload) for tag, _, payload in gcda.records if tag == TAG_ARCS]
+
+
+@pytest.mark.parametrize('version', [b'B22*', b'A94*'], ids=['gcc12', 'gcc9'])
+@pytest.mark.parametrize('byteorder', ['<', '>'], ids=['little', 'big'])
+def test_gcdafile_merge(version, byteorder):
+    dumps = [
+        make_gcda([[1, 2], [3, 0, 5]], version, byteorder),
+        make_gcda([[0, 2], [1, 1, (1 << 64) - 1]], version, byteorder),
+        make_gcda([[4, 0], [0, 0, 7]], version, byteorder),
+    ]
+
+    gcda = GcdaFile(dumps[0])
+    assert gcda.to_bytes() == dumps[0]
+    for dump in dumps[1:]:
+        gcda.merge(GcdaFile(dump))
+
+    assert arcs(gcda) == [[5, 4], [4, 1, 11]]
+    assert gcda.to_bytes() == make_gcda([[5, 4], [4, 1, 11]], version, byteorder)
+
+
+@pytest.mark.parametrize(
+    'first, second, error',
+    [
+        (make_gcda([[1]]), make_gcda([[1, 2]]), 'different objects'),
+        (make_gcda([[1]]), make_gcda([[1], [2]]), 'different objects'),
+        (make_gcda([[1]]), make_gcda([[1]], byteorder='>'), 'different objects'),
+        (make_gcda([[1]]), make_gcda([[1]], tag=TAG_ARCS + (6 << 17)), 'unsupported'),
+        (make_gcda([[1]]), make_gcda([[1]])[:-4], 'truncated'),
+        (make_gcda([[1]]), b'not a gcda file', 'not a gcda file'),
+    ],
+    ids=['counters', 'functions', 'byteorder', 'ior', 'truncated', 'magic'],
+)
+def test_gcdafile_merge_error(first, second, error):
+    with pytest.raises(GcdaError, match=error):
+        GcdaFile(first).merge(GcdaFile(second))
+
+
+def test_merge_hexdumps_gcov_tool():
+    tool = CoverageTool()
+    tool.gcov_tool = 'gcov'
+    dumps = [make_gcda([[1]]), make_gcda([[1]], tag=TAG_ARCS + (6 << 17))]
+
+    def mock_merge(cmd):
+        assert cmd[:2] == ['gcov-tool', 'merge']
+        with open(f'{cmd[-1]}/tmp.gcda', 'wb') as fp:
+            fp.write(b'merged')
+
+    with mock.patch('subprocess.call', side_effect=mock_merge) as mock_call:
+        assert tool.merge_hexdumps(dumps) == b'merged'
+        assert tool.merge_hexdumps(dumps[:1]) == dumps[0]
+
+    mock_call.assert_called_once()
+
+
+def test_capture_data(tmp_path):
+    gcda_file = tmp_path / 'obj.gcda'
+    dumps = [make_gcda([[1, 2]]), make_gcda([[3, 4]])]
+    log = ['booting', 'GCOV_COVERAGE_DUMP_START']
+    log += [f'*{gcda_file}<{dump.hex()}' for dump in dumps]
+    log += ['GCOV_COVERAGE_DUMP_END', '']
+    (tmp_path / 'handler.log').write_text('\n'.join(log))
+
+    tool = CoverageTool()
+    tool.gcov_tool = 'gcov'
+    assert tool.capture_data(str(tmp_path))
+    assert arcs(GcdaFile(gcda_file.read_bytes())) == [[4, 6]]
+
+    # The gcda files are only created again when they changed
+    with mock.patch.object(tool, 'create_gcda_files') as mock_create:
+        assert tool.capture_data(str(tmp_path))
+        mock_create.assert_not_called()
+
+        gcda_file.write_bytes(b'')
+        assert tool.capture_data(str(tmp_path))
+        mock_create.assert_called_once()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# Copyright The Zephyr Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+"""
+Tests for expr_parser.py functions
+"""
+
+from unittest import mock
+
+import expr_parser
+import pytest
+
+TESTDATA_1 = [
+    ('ARCH == "arm"', True),
+    ('ARCH != "arm"', False),
+    ('CONFIG_NUM > 10', True),
+    ('CONFIG_NUM <= 0x10', False),
+    ('ARCH in ["x86", "arm"]', True),
+    ('CONFIG_MISSING', False),
+    ('PLATFORM : "qemu_.*"', True),
+    ('not (ARCH == "x86" or CONFIG_NUM < 5) and CONFIG_NUM', True),
+]
+
+
+@pytest.mark.parametrize('expr, expected', TESTDATA_1)
+def test_parse(expr, expected):
+    env = {'ARCH': 'arm', 'PLATFORM': 'qemu_cortex_m3', 'CONFIG_NUM': '20'}
+
+    assert expr_parser.parse(expr, env, None) == expected
+    # The compiled expression is reused
+    assert expr_parser.compile_expr(expr) is expr_parser.compile_expr(expr)
+
+
+def test_parse_compiles_once():
+    expr = 'CONFIG_ONCE == "y"'
+
+    with mock.patch.object(
+        expr_parser.parser, 'parse', wraps=expr_parser.parser.parse
+    ) as parse_mock:
+        for value in ['y', 'n', 'y']:
+            expr_parser.parse(expr, {'CONFIG_ONCE': value}, None)
+
+    parse_mock.assert_called_once_with(expr)
+
+
+def test_parse_many():
+    envs = [{'ARCH': 'arm'}, {'ARCH': 'x86'}, {}]
+    expr = 'ARCH == "arm" or ARCH == "x86"'
+
+    with mock.patch.object(
+        expr_parser, 'compile_expr', wraps=expr_parser.compile_expr
+    ) as compile_mock:
+        results = expr_parser.parse_many(expr, [(env, None) for env in envs])
+
+    assert results == [True, True, False]
+    # Compiled once for all the environments
+    compile_mock.assert_called_once_with(expr)
+    assert expr_parser.parse_many(expr, []) == []
+
+
+def test_parse_syntax_error():
+    with pytest.raises(SyntaxError):
+        expr_parser.parse('ARCH ==', {}, None)
+
+
+def test_parse_dt_compat_enabled():
+    # Only membership is checked, which an EDTSnapshot answers without
+    # unpickling the EDT
+    edt = mock.Mock(compat2okay=mock.MagicMock())
+    edt.compat2okay.__contains__.side_effect = lambda compat: compat == 'vnd,okay'
+
+    assert expr_parser.parse('dt_compat_enabled("vnd,okay")', {}, edt)
+    assert not expr_parser.parse('dt_compat_enabled("vnd,other")', {}, edt)
+    edt.compat2okay.get.assert_not_called()
+    edt.compat2okay.__getitem__.assert_not_called()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# Copyright The Zephyr Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+"""
+Tests for filter_cache.py classes' methods
+"""
+
+import os
+import pickle
+import types
+
+import pytest
+from twisterlib.filter_cache import FilterCache
+
+
+@pytest.fixture
+def app(tmp_path):
+    app_dir = tmp_path / 'app'
+    (app_dir / 'boards').mkdir(parents=True)
+    (app_dir / 'prj.conf').write_text('CONFIG_FOO=y\n')
+    (app_dir / 'boards' / 'board1.overlay').write_text('/ { };\n')
+    (app_dir / 'main.c').write_text('int main(void) { return 0; }\n')
+    return app_dir
+
+
+def _cmd(build_dir, extra_conf):
+    return [
+        'cmake',
+        f'-B{build_dir}',
+        '-DTC_RUNID=123',
+        '-DTC_NAME=ts',
+        '-DBOARD=board1',
+        f'-DOVERLAY_CONFIG="{extra_conf}"',
+        '-DMODULES=dts,kconfig',
+        '-Pzephyr_base/cmake/package_helper.cmake',
+    ]
+
+
+def _make_build_dir(tmp_path, name, dep, bindings_dir):
+    build_dir = tmp_path / name
+    (build_dir / 'zephyr' / 'kconfig').mkdir(parents=True)
+    (build_dir / 'twister').mkdir()
+    (build_dir / 'twister' / 'testsuite_extra.conf').write_text('CONFIG_BAR=y\n')
+    (build_dir / 'zephyr' / '.config').write_text('CONFIG_FOO=y\n')
+    (build_dir / 'zephyr' / 'zephyr.dts.d').write_text(f'zephyr.dts.pre: \\\n {dep}\n')
+    (build_dir / 'zephyr' / 'kconfig' / 'sources.txt').write_text(f'{dep}\n')
+    edt = types.SimpleNamespace(bindings_dirs=[str(bindings_dir)])
+    (build_dir / 'zephyr' / 'edt.pickle').write_bytes(pickle.dumps(edt))
+    return build_dir
+
+
+def test_filtercache_key(tmp_path, app):
+    cache = FilterCache(str(tmp_path / 'cache'))
+    b1 = _make_build_dir(tmp_path, 'b1', 'dep', tmp_path)
+    b2 = _make_build_dir(tmp_path, 'b2', 'dep', tmp_path)
+    extra1 = b1 / 'twister' / 'testsuite_extra.conf'
+    extra2 = b2 / 'twister' / 'testsuite_extra.conf'
+
+    key1 = cache.key(_cmd(b1, extra1), str(app), str(b1))
+    key2 = cache.key(_cmd(b2, extra2), str(app), str(b2))
+    assert key1 == key2
+
+    # Changing a file given on the command line changes the key
+    extra2.write_text('CONFIG_BAR=n\n')
+    assert cache.key(_cmd(b2, extra2), str(app), str(b2)) != key1
+
+    # Changing a configuration file of the application changes the key
+    (app / 'prj.conf').write_text('CONFIG_FOO=n\n')
+    assert cache.key(_cmd(b1, extra1), str(app), str(b1)) != key1
+
+
+def test_filtercache_key_ignores_sources(tmp_path, app):
+    cache = FilterCache(str(tmp_path / 'cache'))
+    b1 = _make_build_dir(tmp_path, 'b1', 'dep', tmp_path)
+    key = cache.key(_cmd(b1, 'extra.conf'), str(app), str(b1))
+
+    (app / 'main.c').write_text('int main(void) { return 1; }\n')
+
+    assert cache.key(_cmd(b1, 'extra.conf'), str(app), str(b1)) == key
+
+
+def test_filtercache_store_restore(tmp_path):
+    dep = tmp_path / 'board.dts'
+    dep.write_text('/dts-v1/;\n')
+    bindings = tmp_path / 'bindings'
+    bindings.mkdir()
+    (bindings / 'vnd,dev.yaml').write_text('compatible: "vnd,dev"\n')
+    build_dir = _make_build_dir(tmp_path, 'b1', dep, bindings)
+    new_build_dir = tmp_path / 'b2'
+
+    cache = FilterCache(str(tmp_path / 'cache'))
+    assert not cache.restore('0123', str(new_build_dir))
+
+    cache.store('0123', str(build_dir))
+
+    assert cache.restore('0123', str(new_build_dir))
+    assert (new_build_dir / 'zephyr' / '.config').read_text() == 'CONFIG_FOO=y\n'
+    assert os.path.exists(new_build_dir / 'zephyr' / 'edt.pickle')
+
+    # A new process sees an entry made stale by a new binding
+    (bindings / 'vnd,other.yaml').write_text('compatible: "vnd,other"\n')
+    assert not FilterCache(str(tmp_path / 'cache')).restore('0123', str(new_build_dir))
+
+    # A changed dependency makes the entry stale too
+    cache.store('0123', str(build_dir))
+    dep.write_text('/dts-v1/;\n/ { };\n')
+    assert not cache.restore('0123', str(new_build_dir))
+
+
+def test_filtercache_stale_board_defconfig(tmp_path, app):
+    # Configuration files merged from outside the application are checked
+    defconfig = tmp_path / 'boards' / 'board1_defconfig'
+    defconfig.parent.mkdir()
+    defconfig.write_text('CONFIG_SERIAL=y\n')
+    build_dir = _make_build_dir(tmp_path, 'b1', tmp_path / 'board.dts', tmp_path / 'bindings')
+    (build_dir / 'zephyr' / 'kconfig' / 'inputs.txt').write_text(
+        f'{defconfig}\n{app / "prj.conf"}\n'
+    )
+    new_build_dir = tmp_path / 'b2'
+
+    cache = FilterCache(str(tmp_path / 'cache'))
+    cache.store('0123', str(build_dir))
+    assert cache.restore('0123', str(new_build_dir))
+
+    defconfig.write_text('CONFIG_SERIAL=n\nCONFIG_CONSOLE=n\n')
+    assert not cache.restore('0123', str(new_build_dir))
@@ -24,6 +24,7 @@ from serial import SerialException
 from twisterlib.error import TwisterException
 from twisterlib.handlers import (
     BinaryHandler,
+    ConsoleReader,
     DeviceHandler,
     Handler,
     QEMUHandler,
@@ -202,6 +203,45 @@ def test_handler_missing_suite_name(mocked_instance):
     )
 
 
+def test_consolereader():
+    console = ConsoleReader()
+
+    # 'é' is split between chunks
+    assert console.feed(b'') == []
+    assert console.feed(b'caf\xc3') == []
+    assert console.feed(b'\xa9\r\n\nsecond') == ['caf\u00e9\r\n', '\n']
+    assert console.feed(b' line\nlast') == ['second line\n']
+    assert console.finish() == ['last']
+    assert console.finish() == []
+
+    assert console.bytes_read == 24
+    assert console.lines_read == 4
+
+    with pytest.raises(UnicodeDecodeError):
+        console.feed(b'\x81\n')
+
+    console = ConsoleReader(errors='replace')
+    assert console.feed(b'\x81\n') == ['\ufffd\n']
+
+
+def test_handler_update_console_metrics(mocked_instance):
+    mocked_instance.metrics = {}
+    handler = Handler(mocked_instance, 'build', mock.Mock())
+
+    handler.execution_time = 2
+    handler._update_console_metrics()
+    assert mocked_instance.metrics == {}
+
+    handler.console = ConsoleReader()
+    handler.console.feed(b'1\n2\n3\n' * 100)
+    handler._update_console_metrics()
+
+    assert mocked_instance.metrics == {
+        'console_bytes_per_sec': 300,
+        'console_lines_per_sec': 150.0,
+    }
+
+
 def test_handler_terminate(mocked_instance):
     def mock_kill_function(pid, sig):
         if pid < 0:
@@ -290,15 +330,13 @@ TESTDATA_3 = [
         mock.Mock(status=TwisterStatus.NONE, capture_coverage=False),
         [
             mock.call('This\\r\\n\n'),
-            mock.call('is\r'),
-            mock.call('some ANSI in\n'),
+            mock.call('is\rsome ANSI in\n'),
             mock.call('a short\n'),
             mock.call('file.')
         ],
         [
             mock.call('This'),
-            mock.call('is'),
-            mock.call('some \x1B[31mANSI\x1B[39m in'),
+            mock.call('is\rsome \x1B[31mANSI\x1B[39m in'),
             mock.call('a short'),
             mock.call('file.')
         ],
@@ -306,7 +344,7 @@ TESTDATA_3 = [
         False
     ),
     (
-        [b'Too much.'] * 120,  # Should be more than the timeout
+        [b'Too much.\n'] * 120,  # Should be more than the timeout
         mock.Mock(status=TwisterStatus.PASS, capture_coverage=False),
         None,
         None,
@@ -314,7 +352,7 @@ TESTDATA_3 = [
         False
     ),
     (
-        [b'Too much.'] * 120,  # Should be more than the timeout
+        [b'Too much.\n'] * 120,  # Should be more than the timeout
         mock.Mock(status=TwisterStatus.PASS, capture_coverage=False),
         None,
         None,
@@ -322,7 +360,7 @@ TESTDATA_3 = [
         False
     ),
     (
-        [b'Too much.'] * 120,  # Should be more than the timeout
+        [b'Too much.\n'] * 120,  # Should be more than the timeout
         mock.Mock(status=TwisterStatus.PASS, capture_coverage=True),
         None,
         None,
@@ -358,7 +396,7 @@ def test_binaryhandler_output_handler(
             self.text = text
             self.line_index = 0
 
-        def readline(self):
+        def read1(self, size):
             if self.line_index == len(self.text):
                 self.line_index = 0
                 return b''
@@ -645,7 +683,7 @@ TESTDATA_9 = [
 ]
 
 @pytest.mark.parametrize(
-    'success_count, in_waiting_count, oserror_count, readline_error_count,'
+    'success_count, in_waiting_count, oserror_count, read_error_count,'
     ' haltless_count, statusless_count, end_by_halt, end_by_close,'
     ' end_by_status, expected_line_count',
     TESTDATA_9,
@@ -660,7 +698,7 @@ def test_devicehandler_monitor_serial(
     success_count,
     in_waiting_count,
     oserror_count,
-    readline_error_count,
+    read_error_count,
     haltless_count,
     statusless_count,
     end_by_halt,
@@ -672,16 +710,16 @@ def test_devicehandler_monitor_serial(
     line_iter = [
         TypeError('dummy TypeError') if x % 2 else \
         SerialException('dummy SerialException') for x in range(
-            readline_error_count
+            read_error_count
         )
     ] + [
-        f'line no {idx}'.encode('utf-8') for idx in range(success_count)
+        f'line no {idx}\n'.encode('utf-8') for idx in range(success_count)
     ]
     in_waiting_iter = [False] * in_waiting_count + [
         TypeError('dummy TypeError')
     ] if end_by_close else (
         [OSError('dummy OSError')] * oserror_count + [False] * in_waiting_count
-    ) + [True] * (success_count + readline_error_count)
+    ) + [True] * (success_count + read_error_count)
 
     is_set_iter = [False] * haltless_count + [True] \
         if end_by_halt else iter(lambda: False, True)
@@ -692,7 +730,7 @@ def test_devicehandler_monitor_serial(
     halt_event = mock.Mock(is_set=mock.Mock(side_effect=is_set_iter))
     ser = mock.Mock(
         isOpen=mock.Mock(side_effect=is_open_iter),
-        readline=mock.Mock(side_effect=line_iter)
+        read=mock.Mock(side_effect=line_iter)
     )
     type(ser).in_waiting = mock.PropertyMock(
         side_effect=in_waiting_iter,
@@ -720,8 +758,8 @@ def test_devicehandler_monitor_serial_splitlines(mocked_instance):
     halt_event = mock.Mock(is_set=mock.Mock(return_value=False))
     ser = mock.Mock(
         isOpen=mock.Mock(side_effect=[True, True, False]),
-        in_waiting=mock.Mock(return_value=False),
-        readline=mock.Mock(return_value='\nline1\nline2\n'.encode('utf-8'))
+        in_waiting=13,
+        read=mock.Mock(return_value='\nline1\nline2\n'.encode('utf-8'))
     )
     harness = mock.Mock(status=TwisterStatus.PASS)
 
@@ -1920,6 +1958,12 @@ def test_qemuhandler_thread(
 
         file_object = mock.mock_open(read_data=contents).return_value
         file_object.__iter__.return_value = contents.splitlines(True)
+        if filename == handler.fifo_fn + '.out':
+            # The output of QEMU may come one byte at a time
+            file_object.read.side_effect = itertools.chain(
+                (contents[i:i + 1] for i in range(len(contents))),
+                itertools.repeat(b'')
+            )
         if file_object not in file_objs:
             file_objs[filename] = file_object
 
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# Copyright The Zephyr Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+"""
+Micro-benchmark of the console line matching of the twister harnesses
+
+The LineMatcher of the Test and Gtest harnesses is compared with trying the
+regular expressions one after the other on each line, as the harnesses did
+before. Under pytest, it is checked that both give the same results on a
+synthetic console output. Run it directly to print the timings:
+
+    ./test_harness_benchmark.py [<number of test cases>]
+"""
+
+import os
+import re
+import sys
+import time
+
+import pytest
+
+if __name__ == "__main__":
+    _scripts = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+    os.environ.setdefault("ZEPHYR_BASE", os.path.abspath(os.path.join(_scripts, "..")))
+    sys.path.insert(0, os.path.join(_scripts, "pylib", "twister"))
+    sys.path.insert(0, _scripts)
+
+from twisterlib.harness import Gtest, LineMatcher, Test  # noqa: E402
+from twisterlib.statuses import TwisterStatus  # noqa: E402
+
+PREFIX = "[00:00:01.234,567] <inf> test: "
+
+
+def ztest_output(num_cases):
+    """Return the console lines of a ztest run of num_cases test cases,
+    with log messages between the ztest ones"""
+    lines = ["*** Booting Zephyr OS build v4.3.0 ***", "Running TESTSUITE bench"]
+    lines.append("=" * 65)
+    for i in range(num_cases):
+        lines.append(f"START - test_case_{i}")
+        for j in range(8):
+            lines.append(f"{PREFIX}step {j} of case {i}: value = 0x{i * j:08x}")
+        status = ("PASS", "FAIL", "SKIP")[i % 3]
+        lines.append(f" {status} - test_case_{i} in 0.00{i % 10} seconds")
+        lines.append("=" * 65)
+    lines.append("TESTSUITE bench succeeded")
+    lines.append("")
+    lines.append("------ TESTSUITE SUMMARY START ------")
+    lines.append("")
+    lines.append(
+        f"SUITE PASS - 100.00% [bench]: pass = {num_cases}, fail = 0, skip = 0,"
+        f" total = {num_cases} duration = 0.123 seconds"
+    )
+    for i in range(num_cases):
+        lines.append(f" - PASS - [bench.test_case_{i}] duration = 0.001 seconds")
+    lines.append("------ TESTSUITE SUMMARY END ------")
+    lines.append("PROJECT EXECUTION SUCCESSFUL")
+    return lines
+
+
+def gtest_output(num_cases):
+    """Return the console lines of a gTest run of num_cases test cases,
+    with colored log messages between the gTest ones"""
+    fmt = "[00:00:00.000,000] \x1b[0m<inf> label:  [{}] {}\x1b[0m"
+    lines = [fmt.format("==========", "Running all tests.")]
+    for i in range(num_cases):
+        lines.append(fmt.format(" RUN      ", f"bench.test_{i}"))
+        for j in range(8):
+            lines.append(f"{PREFIX}step {j} of test {i}")
+        status = ("       OK ", " DISABLED ", "  FAILED  ")[i % 3]
+        lines.append(fmt.format(status, f"bench.test_{i} (0 ms)"))
+    lines.append(fmt.format("==========", "Done running all tests."))
+    return lines
+
+
+def ztest_sequential(line):
+    """Match a line with the Test patterns one after the other"""
+    for key, regex, method in (
+        ("suite_start", Test.test_suite_start_pattern, "search"),
+        ("suite_end", Test.test_suite_end_pattern, "search"),
+        ("case_start", Test.test_case_start_pattern, "search"),
+        ("case_end", Test.test_case_end_pattern, "match"),
+        ("suite_summary", Test.test_suite_summary_pattern, "match"),
+        ("case_summary", Test.test_case_summary_pattern, "match"),
+    ):
+        if match := getattr(regex, method)(line):
+            return key, match.groups()
+    return None, None
+
+
+def ztest_matcher(line):
+    """Match a line with the LineMatcher of the Test harness"""
+    key, match = Test.line_matcher.first(line)
+    return key, match.groups() if match else None
+
+
+def gtest_sequential(line):
+    """Match a line with the Gtest patterns one after the other"""
+    line = Gtest.ANSI_ESCAPE.sub("", line)
+    results = []
+    for key, pattern in (
+        ("start", Gtest.TEST_START_PATTERN),
+        ("finished", Gtest.FINISHED_PATTERN),
+        (TwisterStatus.PASS, Gtest.TEST_PASS_PATTERN),
+        (TwisterStatus.SKIP, Gtest.TEST_SKIP_PATTERN),
+        (TwisterStatus.FAIL, Gtest.TEST_FAIL_PATTERN),
+    ):
+        if match := re.search(pattern, line):
+            results.append((key, match.groups()))
+    return results
+
+
+def gtest_matcher(line):
+    """Match a line with the LineMatchers of the Gtest harness"""
+    if "\x1b" in line:
+        line = Gtest.ANSI_ESCAPE.sub("", line)
+    results = []
+    for matcher in (Gtest.start_matcher, Gtest.finished_matcher, Gtest.result_matcher):
+        results.extend((key, match.groups()) for key, match in matcher.all(line))
+    return results
+
+
+def run_benchmark(match_fn, lines, repeat=3):
+    """Return the results of match_fn on the lines, and the best time
+    taken to match them all"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [match_fn(line) for line in lines]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return results, best
+
+
+BENCHMARKS = [
+    ("ztest", ztest_output, ztest_sequential, ztest_matcher),
+    ("gtest", gtest_output, gtest_sequential, gtest_matcher),
+]
+
+
+@pytest.mark.parametrize(
+    "output_fn, sequential_fn, matcher_fn",
+    [b[1:] for b in BENCHMARKS],
+    ids=[b[0] for b in BENCHMARKS],
+)
+def test_line_matcher_benchmark(output_fn, sequential_fn, matcher_fn):
+    lines = output_fn(30)
+
+    expected, _ = run_benchmark(sequential_fn, lines, repeat=1)
+    results, _ = run_benchmark(matcher_fn, lines, repeat=1)
+
+    assert results == expected
+    assert any(results)
+
+
+def test_line_matcher_unordered():
+    patterns = [re.compile(r) for r in ("step 1", "step [0-9]", "case 2:")]
+    matcher = LineMatcher((p.pattern, p.search, None) for p in patterns)
+    lines = ztest_output(5)
+
+    found = {}
+    for line in lines:
+        for key, _ in matcher.all(line):
+            found[key] = line
+            matcher.remove(key)
+
+    assert not matcher.patterns
+    assert found == {
+        "step [0-9]": f"{PREFIX}step 0 of case 0: value = 0x00000000",
+        "step 1": f"{PREFIX}step 1 of case 0: value = 0x00000000",
+        "case 2:": f"{PREFIX}step 0 of case 2: value = 0x00000000",
+    }
+
+
+def main():
+    num_cases = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for name, output_fn, sequential_fn, matcher_fn in BENCHMARKS:
+        lines = output_fn(num_cases)
+        expected, sequential_time = run_benchmark(sequential_fn, lines)
+        results, matcher_time = run_benchmark(matcher_fn, lines)
+        assert results == expected
+        print(
+            f"{name}: {len(lines)} lines, sequential {sequential_time * 1000:.1f} ms,"
+            f" matcher {matcher_time * 1000:.1f} ms"
+            f" ({sequential_time / matcher_time:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
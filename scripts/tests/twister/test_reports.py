@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# Copyright The Zephyr Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+"""
+Tests for reports.py classes' methods
+"""
+
+import json
+from unittest import mock
+
+import pytest
+from twisterlib import reports
+from twisterlib.reports import ReportJournal, iter_report_suites
+
+SUITES = [
+    {
+        "name": f"tests/suite{i}",
+        "platform": "qemu_x86",
+        "used_ram": 1024 * i,
+        "log": "x" * 1000 * i,
+        "testcases": [{"identifier": f"suite{i}.case", "status": "passed"}],
+    }
+    for i in range(10)
+]
+
+
+@pytest.mark.parametrize('read_size', [1, 100, 64 * 1024])
+@pytest.mark.parametrize('indent', [4, None], ids=['indent', 'compact'])
+def test_iter_report_suites_json(tmp_path, read_size, indent):
+    report = tmp_path / 'twister.json'
+    data = {"environment": {"options": ["]"]}, "testsuites": SUITES, "n": 12}
+    report.write_text(json.dumps(data, indent=indent))
+
+    with mock.patch.object(reports, 'JSON_READ_SIZE', read_size):
+        assert list(iter_report_suites(str(report))) == SUITES
+        assert list(iter_report_suites(str(report), keys={'name'})) == [
+            {"name": s["name"]} for s in SUITES
+        ]
+
+    report.write_text('{"testsuites": []}')
+    assert list(iter_report_suites(str(report))) == []
+
+
+@pytest.mark.parametrize('indent', [4, None], ids=['indent', 'compact'])
+def test_iter_report_suites_numbers(tmp_path, indent):
+    # Numbers split at any point by the reads are decoded whole
+    report = tmp_path / 'twister.json'
+    suites = [{"execution_time": -1.25e-3, "used_ram": 12345}, {"execution_time": 1e10}]
+    data = {"environment": 1.5, "testsuites": suites, "n": 3.14159}
+    report.write_text(json.dumps(data, indent=indent))
+
+    for read_size in range(1, 40):
+        with mock.patch.object(reports, 'JSON_READ_SIZE', read_size):
+            assert list(iter_report_suites(str(report))) == suites, read_size
+
+
+def test_report_journal(tmp_path):
+    journal = ReportJournal(mock.Mock(), str(tmp_path / 'twister.jsonl'))
+    instances = [mock.Mock() for _ in SUITES]
+    for instance, suite in zip(instances, SUITES, strict=True):
+        instance.name = suite["name"]
+
+    with mock.patch.object(reports.Reporting, 'json_suite') as mock_suite:
+        mock_suite.side_effect = lambda env, instance, *args: dict(
+            SUITES[instances.index(instance)], status=instance.status
+        )
+        journal.start({"os": "Linux"})
+        for instance in instances:
+            instance.status = 'failed'
+            journal.add(instance)
+        # Retried, the last result of an instance is kept
+        instances[3].status = 'passed'
+        journal.add(instances[3])
+        journal.finish({"done": 10})
+
+    expected = [dict(s, status='failed') for s in SUITES]
+    expected[3]['status'] = 'passed'
+    assert sorted(iter_report_suites(journal.filename), key=lambda s: s["used_ram"]) == expected
+
+    # Lines of a run which stopped while writing are ignored
+    with open(journal.filename, 'a') as fp:
+        fp.write('{"instance": "tests/suite1", "testsuite": {"na')
+    assert len(list(iter_report_suites(journal.filename))) == len(SUITES)
+
+    # A new run starts a new journal
+    journal.start({"os": "Linux"})
+    assert list(iter_report_suites(journal.filename)) == []
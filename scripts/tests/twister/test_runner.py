@@ -7,6 +7,7 @@ Tests for runner.py classes
 """
 
 import errno
+import multiprocessing as mp
 import os
 import pathlib
 import re
@@ -233,6 +234,67 @@ def test_executioncounter(capfd):
     assert ec.failed == 1
 
 
+def _executioncounter_worker(ec):
+    for _ in range(10):
+        ec.passed_increment()
+    ec.cases_increment(5)
+    ec.flush()
+
+
+def test_executioncounter_deltas():
+    ec = ExecutionCounter(total=4, flush_interval=3600)
+
+    ec.passed_increment()
+    ec.failed_increment(2)
+
+    # Increments are seen by this process before being flushed
+    assert ec.passed == 1
+    assert ec._counters[ec.COUNTERS.index('passed')] == 0
+
+    ec.flush()
+
+    assert ec._counters[ec.COUNTERS.index('passed')] == 1
+
+    processes = [
+        mp.Process(target=_executioncounter_worker, args=(ec,)) for _ in range(3)
+    ]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+
+    snapshot = ec.snapshot()
+    assert snapshot['total'] == 4
+    assert snapshot['passed'] == 31
+    assert snapshot['failed'] == 2
+    assert snapshot['cases'] == 15
+
+
+def _executioncounter_report_worker(ec, queue):
+    for _ in range(10):
+        ec.done_increment()
+        queue.put(ec.flush()['done'])
+
+
+def test_executioncounter_done_order():
+    ec = ExecutionCounter(total=30, flush_interval=3600)
+    queue = mp.Queue()
+
+    processes = [
+        mp.Process(target=_executioncounter_report_worker, args=(ec, queue))
+        for _ in range(3)
+    ]
+    for p in processes:
+        p.start()
+    done = [queue.get(timeout=30) for _ in range(30)]
+    for p in processes:
+        p.join()
+
+    # Each report gets its own done count, none is stale or repeated
+    assert sorted(done) == list(range(1, 31))
+    assert ec.snapshot()['done'] == 30
+
+
 def test_cmake_parse_generated(mocked_jobserver):
     testsuite_mock = mock.Mock()
     platform_mock = mock.Mock()
@@ -504,6 +566,38 @@ def test_cmake_run_cmake(
         assert tc.status == cmake.instance.status
 
 
+def test_cmake_run_cmake_filter_cache_hit(mocked_jobserver):
+    testsuite_mock = mock.Mock(sysbuild=False)
+    platform_mock = mock.Mock()
+    platform_mock.name = '<platform name>'
+    cmake = CMake(testsuite_mock, platform_mock, os.path.join('source', 'dir'),
+                  os.path.join('build', 'dir'), mocked_jobserver)
+    cmake.instance = mock.Mock(sysbuild=False, toolchain='zephyr', build_time=0)
+    cmake.instance.testsuite.required_snippets = []
+    cmake.options = mock.Mock(disable_warnings_as_errors=False)
+    cmake.env = mock.Mock(generator='dummy_generator')
+    cmake.filter_cache = mock.Mock(
+        key=mock.Mock(return_value='dummy key'),
+        restore=mock.Mock(return_value=True)
+    )
+    cmake.parse_generated = mock.Mock(return_value={'dummy': False})
+    popen_mock = mock.Mock()
+
+    with mock.patch('shutil.which', return_value='cmake'), \
+         mock.patch('builtins.open', mock.mock_open()), \
+         mock.patch('subprocess.Popen', popen_mock):
+        result = cmake.run_cmake(args=[], filter_stages=['dts'])
+
+    assert result == {'returncode': 0, 'filter': {'dummy': False}}
+    cmake.filter_cache.restore.assert_called_once_with(
+        'dummy key', os.path.join('build', 'dir')
+    )
+    cmake.parse_generated.assert_called_once_with(['dts'])
+    popen_mock.assert_not_called()
+    mocked_jobserver.popen.assert_not_called()
+    cmake.filter_cache.store.assert_not_called()
+
+
 TESTDATA_3 = [
     ('unit_testing', [], False, True, None, True, None, True,
      None, None, {}, {}, None, None, [], {}),
@@ -687,8 +781,9 @@ def test_filterbuilder_parse_generated(
             raise parse_results
         return parse_results
 
-    def mock_pickle(datafile):
-        assert datafile.read() == expected_edt
+    def mock_snapshot(path):
+        with open(path, 'rb') as datafile:
+            assert datafile.read() == expected_edt
         return mock.Mock()
 
     testsuite_mock = mock.Mock()
@@ -719,7 +814,7 @@ def test_filterbuilder_parse_generated(
                     mock_cmakecache_from_file), \
          mock.patch('builtins.open', mock_open), \
          mock.patch('expr_parser.parse', mock_parser), \
-         mock.patch('pickle.load', mock_pickle), \
+         mock.patch('devicetree.edtlib.EDTSnapshot', mock_snapshot), \
          mock.patch('os.path.exists', return_value=edt_exists), \
          mock.patch('os.environ', environ_mock), \
          pytest.raises(expected_return) if \
@@ -2125,6 +2220,9 @@ def test_projectbuilder_report_out(
     def notrun_increment(value=1, decrement=False):
         results_mock.notrun += value * (-1 if decrement else 1)
     results_mock.notrun_increment = notrun_increment
+    results_mock.flush = lambda: {
+        name: getattr(results_mock, name) for name in ExecutionCounter.COUNTERS
+    }
 
     pb.report_out(results_mock)
 
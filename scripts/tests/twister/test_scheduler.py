@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# Copyright The Zephyr Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+"""
+Tests for scheduler.py classes' methods
+"""
+
+import multiprocessing as mp
+import time
+from unittest import mock
+
+import pytest
+from twisterlib.scheduler import PipelineScheduler
+from twisterlib.statuses import TwisterStatus
+
+
+class DummyInstance:
+    def __init__(self, name, required_applications=None):
+        self.name = name
+        self.required_applications = required_applications or []
+        self.status = TwisterStatus.NONE
+        self.reason = None
+
+    def add_missing_case_status(self, status, reason=None):
+        pass
+
+
+def _worker(scheduler, done):
+    next_ops = {'cmake': 'build', 'build': 'report'}
+    while True:
+        try:
+            task = scheduler.pop()
+        except IndexError:
+            break
+        instance = task['test']
+        done.put((instance.name, task['op'], time.time()))
+        if instance.required_applications and task['op'] == 'cmake':
+            # what the pipeline does once the required apps are processed
+            instance.required_applications = []
+        next_op = next_ops.get(task['op'])
+        if next_op:
+            scheduler.append({'op': next_op, 'test': instance})
+        scheduler.task_done(task)
+
+
+def test_pipelinescheduler_seal():
+    scheduler = PipelineScheduler()
+    scheduler.append({'op': 'cmake', 'test': DummyInstance('app', ['lib'])})
+    scheduler.append({'op': 'cmake', 'test': DummyInstance('lib')})
+    scheduler.append({'op': 'cmake', 'test': DummyInstance('old', ['prev'])})
+
+    scheduler.seal({'prev': mock.Mock()})
+
+    assert list(scheduler._blocked) == ['app']
+    assert scheduler._dependents == {'lib': ['app']}
+    assert scheduler._released == 2
+
+    tasks = sorted(scheduler._ready.get(timeout=5)['test'].name for _ in range(2))
+    assert tasks == ['lib', 'old']
+
+
+def test_pipelinescheduler_local_queue_first():
+    scheduler = PipelineScheduler()
+    scheduler.append({'op': 'cmake', 'test': DummyInstance('a')})
+    scheduler.seal({})
+
+    first = scheduler.pop()
+    scheduler.append({'op': 'build', 'test': first['test']})
+    second = scheduler.pop()
+
+    assert second['op'] == 'build'
+    assert 'queued' in second and 'started' in second
+
+
+@pytest.mark.parametrize(
+    'events, expected_released, expected_blocked',
+    [
+        ([('reported', 'lib1')], 1, ['app']),
+        ([('reported', 'lib1'), ('reported', 'lib2')], 2, []),
+        (
+            [('deferred', {'op': 'cmake', 'test': DummyInstance('late', ['lib1'])})],
+            0,
+            ['app', 'late'],
+        ),
+    ],
+    ids=['partially ready', 'ready', 'deferred'],
+)
+def test_pipelinescheduler_handle_event(events, expected_released, expected_blocked):
+    scheduler = PipelineScheduler()
+    scheduler.append({'op': 'cmake', 'test': DummyInstance('app', ['lib1', 'lib2'])})
+    scheduler.seal({})
+    scheduler._released = 1
+
+    for event in events:
+        assert scheduler._handle_event(event)
+
+    assert scheduler._released == expected_released
+    assert sorted(scheduler._blocked) == expected_blocked
+
+
+def test_pipelinescheduler_stage_times(caplog):
+    scheduler = PipelineScheduler()
+    scheduler._handle_event(('stage', 'build', 1.0, 10.0))
+    scheduler._handle_event(('stage', 'build', 0.5, 20.0))
+
+    assert scheduler.stage_times == {'build': [2, 1.5, 30.0]}
+
+    scheduler.log_stage_times()
+
+    assert 'build' in caplog.text
+    assert '30.00s' in caplog.text
+
+
+def test_pipelinescheduler_release_stuck():
+    instance = DummyInstance('app', ['missing'])
+    scheduler = PipelineScheduler()
+    scheduler.append({'op': 'cmake', 'test': instance})
+    scheduler.seal({})
+
+    scheduler._release_stuck()
+
+    assert scheduler._blocked == {}
+    task = scheduler._ready.get(timeout=5)
+    assert task['op'] == 'report'
+    assert task['test'].status == TwisterStatus.ERROR
+    assert 'missing' in task['test'].reason
+
+
+def test_pipelinescheduler_abort():
+    scheduler = PipelineScheduler()
+    scheduler.append({'op': 'cmake', 'test': DummyInstance('a')})
+
+    scheduler.abort()
+
+    assert scheduler._events.get(timeout=5) == ('abort', None)
+    with pytest.raises(IndexError):
+        scheduler.pop()
+
+
+def test_pipelinescheduler_dependencies_processed_first():
+    scheduler = PipelineScheduler()
+    done = mp.Queue()
+    scheduler.append({'op': 'cmake', 'test': DummyInstance('app', ['lib1', 'lib2'])})
+    scheduler.append({'op': 'cmake', 'test': DummyInstance('lib1', ['lib2'])})
+    scheduler.append({'op': 'cmake', 'test': DummyInstance('lib2')})
+    scheduler.append({'op': 'cmake', 'test': DummyInstance('other')})
+    scheduler.seal({})
+
+    processes = [mp.Process(target=_worker, args=(scheduler, done)) for _ in range(3)]
+    for p in processes:
+        p.start()
+    scheduler.schedule(processes)
+    for p in processes:
+        p.join(timeout=10)
+
+    events = {}
+    for _ in range(12):
+        name, op, timestamp = done.get(timeout=5)
+        events[(name, op)] = timestamp
+    assert events[('lib2', 'report')] <= events[('lib1', 'cmake')]
+    assert events[('lib1', 'report')] <= events[('app', 'cmake')]
+    assert all(p.exitcode == 0 for p in processes)
+    assert scheduler.stage_times['cmake'][0] == 4
+    assert scheduler.stage_times['report'][0] == 4
@@ -329,6 +329,28 @@ def test_testinstance_add_missing_case_status(testinstance, reason, expected_rea
     assert testinstance.testcases[-1].reason == expected_reason
 
 
+def test_testinstance_add_missing_case_status_lazy(tmp_path):
+    testsuite = mock.Mock(
+        detailed_test_id=True,
+        testcases=[mock.Mock(freeform=False) for _ in range(3)],
+    )
+    testsuite.name = 'dummy.suite'
+    platform = mock.Mock(normalized_name='dummy_board')
+    platform.name = 'dummy_board'
+    testinstance = TestInstance(testsuite, platform, 'zephyr', str(tmp_path))
+    testinstance.add_filter('dummy reason', 'dummy type')
+
+    testinstance.add_missing_case_status(TwisterStatus.FILTER)
+    # The test cases are only created once they are needed
+    assert testinstance._testcases is None
+
+    testinstance.reason = 'other reason'
+
+    assert len(testinstance.testcases) == 3
+    assert all(tc.status == TwisterStatus.FILTER for tc in testinstance.testcases)
+    assert all(tc.reason == 'dummy reason' for tc in testinstance.testcases)
+
+
 def test_testinstance_dunders(all_testsuites_dict, class_testplan, platforms_list):
     testsuite_path = 'scripts/tests/twister/test_data/testsuites/samples/test_app/sample_test.app'
     class_testplan.testsuites = all_testsuites_dict
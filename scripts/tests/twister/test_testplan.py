@@ -6,6 +6,7 @@
 '''
 This test file contains testsuites for testsuite.py module of twister
 '''
+import json
 import os
 import sys
 from contextlib import nullcontext
@@ -250,6 +251,40 @@ def test_apply_filters_part3(class_testplan, all_testsuites_dict, platforms_list
     assert not filtered_instances
 
 
+def test_apply_filters_default_platforms(class_testplan, all_testsuites_dict):
+    """ Testing apply_filters does not make instances for the configurations
+    it drops from the default platforms selection
+    """
+    platforms = []
+    for name in ['board_a', 'board_b', 'board_c']:
+        plat = Platform()
+        plat.name = plat.normalized_name = name
+        plat.aliases = [name]
+        plat.arch = 'arm'
+        plat.supported_toolchains = ['zephyr']
+        platforms.append(plat)
+
+    plan = class_testplan
+    plan.platforms = platforms
+    plan.platform_names = [p.name for p in platforms]
+    plan.testsuites = all_testsuites_dict
+    plan.default_platforms = ['board_a', 'board_b']
+    # Built on the default and integration platforms, and only kept on the
+    # default ones allowed
+    for ts in plan.testsuites.values():
+        ts.build_on_all = False
+        ts.platform_allow = ['board_b']
+        ts.integration_platforms = ['board_c']
+
+    with mock.patch('twisterlib.testplan.TestInstance', wraps=TestInstance) as instance_mock:
+        plan.apply_filters()
+
+    assert plan.instances
+    assert {i.platform.name for i in plan.instances.values()} == {'board_b'}
+    # No instance was made for the configurations on other platforms
+    assert instance_mock.call_count == len(plan.instances)
+
+
 def get_testsuite_for_given_test(plan: TestPlan, testname: str) -> TestSuite | None:
     """ Helper function to get testsuite object for a given testname"""
     for _, testsuite in plan.testsuites.items():
@@ -953,6 +988,76 @@ def test_testplan_generate_subset(
            expected_subset
 
 
+TESTDATA_5_1 = [
+    (1, ['plat1/testA', 'plat2/testA']),
+    (2, ['plat1/testB', 'plat2/testB', 'plat1/testC']),
+]
+
+@pytest.mark.parametrize(
+    'subset, expected_subset',
+    TESTDATA_5_1,
+    ids=['subset 1', 'subset 2']
+)
+def test_testplan_generate_subset_by_duration(subset, expected_subset):
+    testplan = TestPlan(env=mock.Mock())
+    testplan.options = mock.Mock(
+        device_testing=False,
+        shuffle_tests=False,
+    )
+    testplan.durations = {
+        'plat1/testA': 100,
+        'plat1/testB': 60,
+        'plat1/testC': 20,
+        'plat2/testA': 30,
+    }
+    testplan.instances = {
+        'plat1/testA': mock.Mock(status=TwisterStatus.NONE),
+        'plat1/testB': mock.Mock(status=TwisterStatus.NONE),
+        'plat1/testC': mock.Mock(status=TwisterStatus.NONE),
+        'plat2/testA': mock.Mock(status=TwisterStatus.NONE),
+        'plat2/testB': mock.Mock(status=TwisterStatus.NONE),
+    }
+
+    testplan.generate_subset(subset, 2)
+
+    # plat2/testB has no recorded duration and is predicted to take 52.5s
+    assert list(testplan.instances.keys()) == expected_subset
+
+
+def test_testplan_load_durations(tmp_path, caplog):
+    report1 = {
+        "testsuites": [
+            {"name": "ts1", "platform": "p1", "toolchain": "zephyr",
+             "build_time": "10.00", "execution_time": "5.00"},
+            {"name": "ts2", "platform": "p1", "toolchain": "zephyr",
+             "build_time": "0.00", "status": "filtered"},
+        ]
+    }
+    report2 = {
+        "testsuites": [
+            {"name": "ts1", "platform": "p1", "toolchain": "zephyr",
+             "build_time": "20.00", "execution_time": "5.00"},
+            {"name": "ts3", "platform": "p2", "toolchain": "zephyr",
+             "build_time": "30.00"},
+        ]
+    }
+    report1_file = tmp_path / 'twister1.json'
+    report1_file.write_text(json.dumps(report1))
+    report2_file = tmp_path / 'twister2.json'
+    report2_file.write_text(json.dumps(report2))
+
+    testplan = TestPlan(env=mock.Mock())
+    testplan.load_durations([report1_file, report2_file, tmp_path / 'missing.json'])
+
+    assert testplan.durations == {
+        os.path.join('p1', 'zephyr', 'ts1'): 20.0,
+        os.path.join('p2', 'zephyr', 'ts3'): 30.0,
+    }
+    assert testplan.predicted_duration(os.path.join('p1', 'zephyr', 'ts1')) == 20.0
+    assert testplan.predicted_duration(os.path.join('p1', 'zephyr', 'ts2')) == 25.0
+    assert 'Cannot load durations from' in caplog.text
+
+
 def test_testplan_handle_modules():
     testplan = TestPlan(env=mock.Mock())
 
@@ -1417,6 +1522,37 @@ tests:
     assert testplan.load_errors == expected_errors
 
 
+@pytest.mark.parametrize('use_index', [True, False], ids=['index', 'no index'])
+def test_testplan_add_testsuites_jobs(tmp_path, use_index):
+    suite_dir = tmp_path / 'tests' / 'ztest_suite'
+    suite_dir.mkdir(parents=True)
+    (suite_dir / 'testcase.yaml').write_text('tests:\n  dummy.ztest:\n    harness: ztest\n')
+
+    env = mock.Mock(
+        test_roots=[tmp_path / 'tests'],
+        options=mock.Mock(
+            detailed_test_id=False,
+            jobs=3,
+            no_testsuite_index=not use_index,
+            testsuite_index=str(tmp_path / 'index.pickle'),
+        ),
+        alt_config_root=[],
+    )
+    testplan = TestPlan(env=env)
+
+    scans = {str(suite_dir): ([], [])}
+    target = (
+        'twisterlib.testsuite.scan_testsuite_paths'
+        if use_index
+        else 'twisterlib.testplan.scan_testsuite_paths'
+    )
+    with mock.patch(target, return_value=scans) as scan_mock:
+        assert testplan.add_testsuites() == 1
+
+    # The sources are scanned by as many jobs as given with -j/--jobs
+    assert scan_mock.call_args.kwargs['jobs'] == 3
+
+
 def test_testplan_str():
     testplan = TestPlan(env=mock.Mock())
     testplan.name = 'my name'
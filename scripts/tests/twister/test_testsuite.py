@@ -23,6 +23,7 @@ from twisterlib.testsuite import (
     find_c_files_in,
     scan_file,
     scan_testsuite_path,
+    scan_testsuite_paths,
 )
 
 from . import ZEPHYR_BASE
@@ -678,6 +679,39 @@ def test_scan_testsuite_path(
     )
 
 
+@pytest.mark.parametrize('pool_threshold', [1000, 0], ids=['serial', 'pool'])
+def test_scan_testsuite_paths(tmp_path, pool_threshold):
+    paths = []
+    for i in range(3):
+        src_dir = tmp_path / f'suite{i}' / 'src'
+        src_dir.mkdir(parents=True)
+        (src_dir / 'main.c').write_text(
+            f'ZTEST_SUITE(suite{i}, NULL, NULL, NULL, NULL, NULL);\n'
+            f'ZTEST(suite{i}, test_a) {{}}\n'
+        )
+        paths.append(str(tmp_path / f'suite{i}'))
+    # A ztest_register_test_suite() call never run by test_main()
+    (tmp_path / 'suite2' / 'src' / 'register.c').write_text(
+        'ztest_register_test_suite(other, NULL, ztest_unit_test(test_b));\n'
+        'void test_main(void) {}\n'
+    )
+    scan_results = {}
+
+    with mock.patch('twisterlib.testsuite.SCAN_POOL_THRESHOLD', pool_threshold):
+        results = scan_testsuite_paths(paths, jobs=2, scan_results=scan_results)
+
+    assert results[paths[0]] == (['suite0.a'], ['suite0'])
+    assert results[paths[1]] == (['suite1.a'], ['suite1'])
+    assert isinstance(results[paths[2]], TwisterRuntimeError)
+    assert len(scan_results) == 4
+
+    # Files already scanned are not scanned again
+    with mock.patch('twisterlib.testsuite.scan_file') as scan_mock:
+        assert scan_testsuite_paths(paths[:1], scan_results=scan_results) == \
+            {paths[0]: (['suite0.a'], ['suite0'])}
+    scan_mock.assert_not_called()
+
+
 TESTDATA_9 = [
     ('dummy/path', 'dummy/path/src', 'dummy/path/src'),
     ('dummy/path', 'dummy/src', 'dummy/src'),
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# Copyright The Zephyr Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+"""
+Tests for testsuite_index.py classes' methods
+"""
+
+import os
+from unittest import mock
+
+import pytest
+from twisterlib import testsuite
+from twisterlib.testplan import TestPlan
+from twisterlib.testsuite_index import TestsuiteIndex
+
+TESTCASE_YAML = """\
+tests:
+  dummy.common:
+    tags: kernel
+  dummy.special:
+    build_only: true
+"""
+
+TEST_C = """\
+ZTEST_SUITE(dummy, NULL, NULL, NULL, NULL, NULL);
+ZTEST(dummy, test_a) {}
+"""
+
+
+@pytest.fixture
+def suite_schema():
+    return TestPlan.suite_schema
+
+
+@pytest.fixture
+def suite_dir(tmp_path):
+    path = tmp_path / 'tests' / 'dummy'
+    (path / 'src').mkdir(parents=True)
+    (path / 'testcase.yaml').write_text(TESTCASE_YAML)
+    (path / 'src' / 'main.c').write_text(TEST_C)
+    return path
+
+
+def test_testsuiteindex_get_scenarios(tmp_path, suite_dir, suite_schema):
+    index_path = str(tmp_path / 'index.pickle')
+    yaml_path = str(suite_dir / 'testcase.yaml')
+
+    index = TestsuiteIndex(index_path, suite_schema)
+    scenarios = index.get_scenarios(yaml_path)
+    index.save()
+
+    assert sorted(scenarios) == ['dummy.common', 'dummy.special']
+    assert scenarios['dummy.common']['tags'] == {'kernel'}
+    assert index.misses == 1
+
+    # A touched file with the same content is still indexed
+    st = os.stat(yaml_path)
+    os.utime(yaml_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    index = TestsuiteIndex(index_path, suite_schema)
+    with mock.patch('twisterlib.config_parser.TwisterConfigParser') as parser_mock:
+        assert index.get_scenarios(yaml_path) == scenarios
+    parser_mock.assert_not_called()
+    assert index.hits == 1
+
+    # A modified file is parsed again
+    (suite_dir / 'testcase.yaml').write_text(TESTCASE_YAML.replace('kernel', 'other'))
+    assert index.get_scenarios(yaml_path)['dummy.common']['tags'] == {'other'}
+    assert index.misses == 1
+
+
+def test_testsuiteindex_scan_testsuite_paths(tmp_path, suite_dir, suite_schema):
+    index_path = str(tmp_path / 'index.pickle')
+    path = str(suite_dir)
+
+    index = TestsuiteIndex(index_path, suite_schema)
+    subcases, suite_names = index.scan_testsuite_paths([path])[path]
+    index.save()
+
+    assert subcases == ['dummy.a']
+    assert suite_names == ['dummy']
+
+    index = TestsuiteIndex(index_path, suite_schema)
+    with mock.patch('twisterlib.testsuite.scan_file') as scan_mock:
+        assert index.scan_testsuite_paths([path])[path] == (subcases, suite_names)
+    scan_mock.assert_not_called()
+
+    # A new source file makes the entry stale, only this file is scanned
+    (suite_dir / 'src' / 'other.c').write_text('ZTEST(dummy, test_b) {}\n')
+    with mock.patch('twisterlib.testsuite.scan_file', wraps=testsuite.scan_file) as scan_mock:
+        subcases, _ = index.scan_testsuite_paths([path])[path]
+    assert sorted(subcases) == ['dummy.a', 'dummy.b']
+    scan_mock.assert_called_once_with(str(suite_dir / 'src' / 'other.c'))
+
+
+def test_testsuiteindex_outdated(tmp_path, suite_dir, suite_schema):
+    index_path = str(tmp_path / 'index.pickle')
+    yaml_path = str(suite_dir / 'testcase.yaml')
+
+    index = TestsuiteIndex(index_path, suite_schema)
+    index.get_scenarios(yaml_path)
+    index.save()
+
+    # Changes of the schema or of the parsing code discard the whole index
+    with mock.patch.object(TestsuiteIndex, '_get_signature', return_value='other'):
+        index = TestsuiteIndex(index_path, suite_schema)
+    index.get_scenarios(yaml_path)
+
+    assert index.misses == 1